@@ -0,0 +1,361 @@
+"""End-to-end latency benchmarks for the nuro CLI hot paths.
+
+Every scenario runs ``nuro.cli.main`` in a fresh interpreter against a
+throw-away HOME, so results include interpreter startup and imports. The
+environment is hermetic:
+
+- a local HTTP server stands in for raw.githubusercontent.com and the GitHub
+  contents API (``github_api_base`` in config.json points at it),
+- a ``local::`` bucket holds commands that exist on disk only,
+- a fake ``pwsh`` shim on PATH answers script runs and batch usage capture.
+
+Usage:
+    python benchmarks/bench_cli.py [--iterations N] [--out results.json] [scenario ...]
+
+Results are written as JSON (per scenario: samples, min, median, mean in
+milliseconds, plus HTTP requests per run) so runs can be compared across
+commits.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+PKG_ROOT = Path(__file__).resolve().parents[1]
+
+OWNER, REPO, REF = "bench", "bucket", "main"
+
+# Commands published by the stand-in GitHub bucket
+REMOTE_CMDS: Dict[str, bytes] = {
+    "hello.ps1": b"function NuroUsage_hello { 'nuro hello <name>' }\nfunction NuroCmd_hello { 'hello' }\n",
+    "pyhello.py": b"def main(argv):\n    return 0\n",
+    "shhello.sh": b"exit 0\n",
+    "fresh.sh": b"exit 0\n",
+}
+for _i in range(20):
+    REMOTE_CMDS[f"tool{_i:02d}.ps1"] = (
+        f"function NuroUsage_tool{_i:02d} {{ 'nuro tool{_i:02d} [-Flag]' }}\n".encode()
+    )
+
+FAKE_PWSH = r'''
+import json, re, sys
+args = sys.argv[1:]
+script = args[args.index("-Command") + 1] if "-Command" in args else ""
+if "@@NURO-PS@@" in script:
+    print("@@NURO-PS@@7")
+    for name in re.findall(r"n = '([^']+)'", script):
+        print("@@NURO@@" + json.dumps({"name": name, "ok": True, "text": "nuro " + name}))
+elif "PSVersion.Major" in script:
+    print("7")
+sys.exit(0)
+'''
+
+# Driver executed in the child interpreter: time cli.main from a cold start
+DRIVER = (
+    "import sys, time, json\n"
+    "t0 = time.perf_counter()\n"
+    "from nuro.cli import main\n"
+    "rc = main(json.loads(sys.argv[1]))\n"
+    "sys.stderr.write('\\n@@BENCH@@%f\\n' % (time.perf_counter() - t0))\n"
+    "sys.exit(rc)\n"
+)
+
+
+def _git_blob_sha(data: bytes) -> str:
+    import hashlib
+
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class StandIn:
+    """Local HTTP server serving both the contents API and raw files."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive like the real hosts, so connection reuse shows up in timings
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                owner.requests += 1
+                path = self.path.split("?", 1)[0]
+                if path == f"/repos/{OWNER}/{REPO}/contents/cmds":
+                    body = json.dumps(owner.listing()).encode()
+                elif path.startswith(f"/{OWNER}/{REPO}/{REF}/cmds/"):
+                    data = REMOTE_CMDS.get(path.rsplit("/", 1)[1])
+                    if data is None:
+                        self.send_response(404)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    body = data
+                else:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def listing(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": name,
+                "path": f"cmds/{name}",
+                "sha": _git_blob_sha(data),
+                "size": len(data),
+                "download_url": f"{self.base}/{OWNER}/{REPO}/{REF}/cmds/{name}",
+            }
+            for name, data in sorted(REMOTE_CMDS.items())
+        ]
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class Sandbox:
+    """Throw-away HOME with config, buckets, a local bucket and a fake pwsh."""
+
+    def __init__(self, standin: StandIn) -> None:
+        self.root = Path(tempfile.mkdtemp(prefix="nuro-bench-"))
+        self.home = self.root / "home"
+        self.nuro = self.home / ".nuro"
+        cfg_dir = self.nuro / "config"
+        cfg_dir.mkdir(parents=True)
+        (cfg_dir / "config.json").write_text(
+            json.dumps(
+                {
+                    "official_bucket_base": f"{standin.base}/{OWNER}/{REPO}/{REF}",
+                    "github_api_base": standin.base,
+                }
+            ),
+            encoding="utf-8",
+        )
+        local = self.root / "localbucket"
+        (local / "cmds").mkdir(parents=True)
+        (local / "cmds" / "localcmd.sh").write_text("exit 0\n", encoding="utf-8")
+        (cfg_dir / "buckets.json").write_text(
+            json.dumps(
+                {
+                    "buckets": [
+                        {"name": "official", "uri": f"github::{OWNER}/{REPO}@{REF}", "priority": 100},
+                        {"name": "local", "uri": f"local::{local}", "priority": 50},
+                    ],
+                    "pins": {},
+                }
+            ),
+            encoding="utf-8",
+        )
+        self.bin = self.root / "bin"
+        self.bin.mkdir()
+        shim = self.bin / "fake_pwsh.py"
+        shim.write_text(FAKE_PWSH, encoding="utf-8")
+        if os.name == "nt":
+            (self.bin / "pwsh.cmd").write_text(f'@"{sys.executable}" "{shim}" %*\r\n', encoding="utf-8")
+        else:
+            launcher = self.bin / "pwsh"
+            launcher.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{shim}" "$@"\n', encoding="utf-8")
+            launcher.chmod(0o755)
+
+    def env(self) -> Dict[str, str]:
+        env = dict(os.environ)
+        env.update(
+            {
+                "HOME": str(self.home),
+                "USERPROFILE": str(self.home),
+                "PATH": str(self.bin) + os.pathsep + env.get("PATH", ""),
+                "PYTHONPATH": str(PKG_ROOT) + os.pathsep + env.get("PYTHONPATH", ""),
+                "NO_PROXY": "127.0.0.1,localhost",
+                "no_proxy": "127.0.0.1,localhost",
+            }
+        )
+        for key in ("NURO_DEBUG", "NURO_LOG_LEVEL", "NURO_PS_POOL"):
+            env.pop(key, None)
+        return env
+
+    def cache(self) -> Path:
+        return self.nuro / "cache"
+
+    def drop(self, *parts: str) -> None:
+        p = self.cache().joinpath(*parts)
+        if p.is_dir():
+            shutil.rmtree(p, ignore_errors=True)
+        elif p.exists():
+            p.unlink()
+
+    def close(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def _run_cli(sandbox: Sandbox, argv: List[str]) -> Dict[str, float]:
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", DRIVER, json.dumps(argv)],
+        env=sandbox.env(),
+        cwd=str(sandbox.root),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(f"nuro {argv} exited with {proc.returncode}: {proc.stderr.strip()[-500:]}")
+    inproc = wall
+    for line in proc.stderr.splitlines():
+        if line.startswith("@@BENCH@@"):
+            inproc = float(line[len("@@BENCH@@"):])
+    return {"wall": wall, "main": inproc}
+
+
+class Scenario:
+    def __init__(self, name: str, argv: List[str], prepare: Optional[Callable[[Sandbox], None]] = None, needs: str = "") -> None:
+        self.name = name
+        self.argv = argv
+        self.prepare = prepare
+        self.needs = needs
+
+
+def _cold_usage(sb: Sandbox) -> None:
+    sb.drop("usage")
+
+
+def _drop_fresh(sb: Sandbox) -> None:
+    sb.drop("cmds", "official", "fresh.sh")
+    sb.drop("cmds", "official", "fresh.sh.meta.json")
+    sb.drop("resolve-index.json")
+
+
+def _cold_fetch(sb: Sandbox) -> None:
+    # Nothing cached at all: listing and download both go to the network
+    _drop_fresh(sb)
+    sb.drop("github")
+    sb.drop("objects")
+
+
+SCENARIOS = [
+    Scenario("version", ["--version"]),
+    Scenario("root_listing_warm", []),
+    Scenario("root_listing_cold_usage", [], prepare=_cold_usage),
+    Scenario("exec_ps1_cached", ["hello"]),
+    Scenario("exec_py_cached", ["pyhello"]),
+    Scenario("exec_sh_cached", ["shhello"], needs="bash"),
+    Scenario("exec_local_bucket", ["local:localcmd"], needs="bash"),
+    Scenario("fetch_on_demand", ["fresh"], prepare=_cold_fetch, needs="bash"),
+    Scenario("fetch_cached_listing", ["fresh"], prepare=_drop_fresh, needs="bash"),
+]
+
+
+def _warm_up(sb: Sandbox) -> None:
+    # Populate the script cache once so "cached" scenarios really are cached
+    for argv in (["hello"], ["pyhello"], ["shhello"], ["local:localcmd"], []):
+        if argv and argv[0] in ("shhello", "local:localcmd") and not shutil.which("bash"):
+            continue
+        _run_cli(sb, argv)
+
+
+def run_benchmarks(iterations: int = 10, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    standin = StandIn()
+    sandbox = Sandbox(standin)
+    results: Dict[str, Any] = {}
+    try:
+        _warm_up(sandbox)
+        for sc in SCENARIOS:
+            if only and sc.name not in only:
+                continue
+            if sc.needs and not shutil.which(sc.needs):
+                results[sc.name] = {"skipped": f"{sc.needs} not found"}
+                continue
+            walls: List[float] = []
+            mains: List[float] = []
+            requests = 0
+            for _ in range(iterations):
+                if sc.prepare:
+                    sc.prepare(sandbox)
+                before = standin.requests
+                sample = _run_cli(sandbox, sc.argv)
+                requests += standin.requests - before
+                walls.append(sample["wall"] * 1000)
+                mains.append(sample["main"] * 1000)
+            results[sc.name] = {
+                "argv": sc.argv,
+                "iterations": iterations,
+                "wall_ms": _summary(walls),
+                "main_ms": _summary(mains),
+                "http_requests_per_run": requests / iterations,
+            }
+    finally:
+        sandbox.close()
+        standin.close()
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "scenarios": results,
+    }
+
+
+def _summary(samples: List[float]) -> Dict[str, Any]:
+    return {
+        "min": round(min(samples), 3),
+        "median": round(statistics.median(samples), 3),
+        "mean": round(statistics.fmean(samples), 3),
+        "samples": [round(s, 3) for s in samples],
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=str(PKG_ROOT), capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--iterations", "-n", type=int, default=10)
+    ap.add_argument("--out", "-o", default="bench_results.json")
+    ap.add_argument("scenarios", nargs="*", help="subset of scenarios to run")
+    ns = ap.parse_args(argv)
+    report = run_benchmarks(iterations=max(1, ns.iterations), only=ns.scenarios or None)
+    Path(ns.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    for name, res in report["scenarios"].items():
+        if "skipped" in res:
+            print(f"{name:28s} skipped ({res['skipped']})")
+        else:
+            print(f"{name:28s} median {res['wall_ms']['median']:9.2f} ms  http/run {res['http_requests_per_run']:.1f}")
+    print(f"wrote {ns.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
+import http.client
 import json
-import urllib.request
+import os
+import re
+import shutil
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import urlparse, urlunparse
+from typing import Any, BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote, unquote, urljoin, urlparse, urlunparse
 from uuid import uuid4
 
-from .debuglog import debug
+from .debuglog import debug, info, warning
+from .fsutil import atomic_write_bytes, atomic_write_text
+from .paths import github_cache_dir, objects_dir
 
 
 @dataclass
@@ -23,6 +33,263 @@ class BucketSpec:
 _GITHUB_CONTENTS_CACHE: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
 
 
+# ---------------- shared HTTP session -----------------
+
+_USER_AGENT = "nuro"
+_MAX_REDIRECTS = 5
+_MAX_IDLE_PER_HOST = 8
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+# Errors that mean a reused keep-alive connection was closed by the server
+_STALE_CONN_ERRORS = (ConnectionError, http.client.BadStatusLine, http.client.CannotSendRequest)
+
+
+class HttpError(OSError):
+    """Non-success HTTP status (>= 400) returned by HttpSession.get."""
+
+    def __init__(self, url: str, code: int, reason: str) -> None:
+        super().__init__(f"HTTP {code} {reason}: {url}")
+        self.url = url
+        self.code = code
+        self.reason = reason
+
+
+class HttpResponse(NamedTuple):
+    url: str
+    status: int
+    headers: Dict[str, str]  # lower-cased names
+    body: bytes
+
+
+def _proxy_for(scheme: str, host: str) -> Optional[str]:
+    """Return the proxy URL from http(s)_proxy unless host matches no_proxy."""
+    proxy = os.environ.get(f"{scheme}_proxy") or os.environ.get(f"{scheme.upper()}_PROXY")
+    if not proxy:
+        return None
+    no_proxy = os.environ.get("no_proxy") or os.environ.get("NO_PROXY") or ""
+    host = host.lower()
+    for entry in no_proxy.split(","):
+        entry = entry.strip().lower().lstrip(".")
+        if not entry:
+            continue
+        if entry == "*" or host == entry or host.endswith("." + entry):
+            return None
+    return proxy if "://" in proxy else f"http://{proxy}"
+
+
+def _proxy_authorization(proxy: Optional[str]) -> Optional[str]:
+    """Basic Proxy-Authorization value for user:pass@ in a proxy URL."""
+    if not proxy:
+        return None
+    pp = urlparse(proxy)
+    if pp.username is None:
+        return None
+    import base64
+
+    creds = f"{unquote(pp.username)}:{unquote(pp.password or '')}".encode("utf-8")
+    return "Basic " + base64.b64encode(creds).decode("ascii")
+
+
+def _redact_proxy(proxy: str) -> str:
+    pp = urlparse(proxy)
+    return f"{pp.scheme}://{pp.hostname}:{pp.port or 80}" if pp.username is not None else proxy
+
+
+class HttpSession:
+    """Keep-alive GET/HEAD client shared by every bucket fetch.
+
+    Idle connections are pooled per (scheme, host, port, proxy) so a refresh
+    over many scripts pays for one TCP/TLS handshake per host. Responses are
+    requested with Accept-Encoding: gzip and decoded transparently. Redirects
+    are followed and a request that fails on a reused connection (closed by
+    the server while idle) is retried once on a fresh one.
+    """
+
+    def __init__(self, connect_timeout: float = 10.0, read_timeout: float = 30.0) -> None:
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._idle: Dict[Tuple[str, str, int, Optional[str]], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def _new_conn(self, key: Tuple[str, str, int, Optional[str]]) -> http.client.HTTPConnection:
+        scheme, host, port, proxy = key
+        if proxy:
+            pp = urlparse(proxy)
+            target_host, target_port = pp.hostname or "", pp.port or 80
+        else:
+            target_host, target_port = host, port
+        if scheme == "https":
+            conn: http.client.HTTPConnection = http.client.HTTPSConnection(
+                target_host, target_port, timeout=self.connect_timeout
+            )
+            if proxy:
+                auth = _proxy_authorization(proxy)
+                conn.set_tunnel(host, port, headers={"Proxy-Authorization": auth} if auth else None)
+        else:
+            conn = http.client.HTTPConnection(target_host, target_port, timeout=self.connect_timeout)
+        conn.connect()
+        debug(f"HTTP connect: {scheme}://{host}:{port}" + (f" via {_redact_proxy(proxy)}" if proxy else ""))
+        return conn
+
+    def _checkout(self, key: Tuple[str, str, int, Optional[str]]) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._new_conn(key), False
+
+    def _checkin(self, key: Tuple[str, str, int, Optional[str]], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < _MAX_IDLE_PER_HOST:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _send(
+        self, url: str, headers: Dict[str, str], timeout: float, method: str = "GET"
+    ) -> Tuple[Tuple[str, str, int, Optional[str]], http.client.HTTPConnection, http.client.HTTPResponse]:
+        parsed = urlparse(url)
+        scheme = parsed.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {url}")
+        host = parsed.hostname or ""
+        port = parsed.port or (443 if scheme == "https" else 80)
+        proxy = _proxy_for(scheme, host)
+        key = (scheme, host, port, proxy)
+        target = parsed.path or "/"
+        if parsed.query:
+            target += "?" + parsed.query
+        hdrs = {"User-Agent": _USER_AGENT, "Accept-Encoding": "gzip"}
+        if proxy and scheme == "http":
+            target = urlunparse((scheme, parsed.netloc, target, "", "", ""))
+            # https proxies get credentials on the CONNECT request instead (see _new_conn)
+            auth = _proxy_authorization(proxy)
+            if auth:
+                hdrs["Proxy-Authorization"] = auth
+        hdrs.update(headers)
+        while True:
+            conn, reused = self._checkout(key)
+            try:
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                conn.request(method, target, headers=hdrs)
+                return key, conn, conn.getresponse()
+            except _STALE_CONN_ERRORS as exc:
+                conn.close()
+                if reused:
+                    debug(f"Stale keep-alive connection to {host}:{port} ({exc!r}); reconnecting")
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+
+    def _release(
+        self,
+        key: Tuple[str, str, int, Optional[str]],
+        conn: http.client.HTTPConnection,
+        resp: http.client.HTTPResponse,
+    ) -> None:
+        # Only a fully read response leaves the connection reusable
+        if resp.will_close or not resp.isclosed():
+            conn.close()
+        else:
+            self._checkin(key, conn)
+
+    def _open(
+        self, url: str, headers: Optional[Dict[str, str]], timeout: Optional[float], method: str = "GET"
+    ) -> Tuple[str, Tuple[str, str, int, Optional[str]], http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send the request, following redirects; returns the final url and an unread 2xx/304 response."""
+        read_timeout = self.read_timeout if timeout is None else timeout
+        for _ in range(_MAX_REDIRECTS + 1):
+            key, conn, resp = self._send(url, dict(headers or {}), read_timeout, method)
+            location = resp.getheader("Location")
+            if resp.status in _REDIRECT_CODES and location:
+                try:
+                    resp.read()
+                finally:
+                    self._release(key, conn, resp)
+                url = urljoin(url, location)
+                debug(f"HTTP redirect {resp.status} -> {url}")
+                continue
+            if resp.status >= 400:
+                conn.close()
+                raise HttpError(url, resp.status, resp.reason)
+            return url, key, conn, resp
+        raise HttpError(url, 310, "Too many redirects")
+
+    def get(
+        self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None
+    ) -> HttpResponse:
+        """GET url; returns 2xx/304 responses and raises HttpError for >= 400."""
+        url, key, conn, resp = self._open(url, headers, timeout)
+        try:
+            body = resp.read()
+        except BaseException:
+            conn.close()
+            raise
+        self._release(key, conn, resp)
+        resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+        if resp_headers.get("content-encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        return HttpResponse(url, resp.status, resp_headers, body)
+
+    def head(
+        self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None
+    ) -> HttpResponse:
+        """HEAD url (redirects followed); raises HttpError for >= 400."""
+        url, key, conn, resp = self._open(url, headers, timeout, method="HEAD")
+        try:
+            resp.read()
+        except BaseException:
+            conn.close()
+            raise
+        self._release(key, conn, resp)
+        return HttpResponse(url, resp.status, {k.lower(): v for k, v in resp.getheaders()}, b"")
+
+    @contextmanager
+    def stream(
+        self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None
+    ) -> Iterator[BinaryIO]:
+        """GET url and yield the body as a file object instead of reading it into memory."""
+        url, key, conn, resp = self._open(url, headers, timeout)
+        try:
+            if (resp.getheader("Content-Encoding") or "").lower() == "gzip":
+                yield gzip.GzipFile(fileobj=resp)  # type: ignore[arg-type]
+            else:
+                yield resp  # type: ignore[misc]
+        except BaseException:
+            conn.close()
+            raise
+        self._release(key, conn, resp)
+
+    def close(self) -> None:
+        with self._lock:
+            conns = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for c in conns:
+            c.close()
+
+
+_SESSION: Optional[HttpSession] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def http_session() -> HttpSession:
+    """Return the process-wide session configured from config.json "http"."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            try:
+                from .config import http_settings
+
+                settings = http_settings()
+            except Exception:
+                settings = {"connect_timeout": 10.0, "read_timeout": 30.0}
+            _SESSION = HttpSession(settings["connect_timeout"], settings["read_timeout"])
+        return _SESSION
+
+
 def _parse_raw_github_components(base: str) -> Optional[Tuple[str, str, str]]:
     try:
         parsed = urlparse(base)
@@ -103,23 +370,113 @@ def _raw_base_with_ref(base: str, ref: str) -> str:
     return urlunparse(parsed._replace(path=new_path)).rstrip("/")
 
 
+_FULL_SHA_RE = re.compile(r"^[0-9a-fA-F]{40}$")
+_DEFAULT_LISTING_TTL = 300
+_DEFAULT_GITHUB_API_BASE = "https://api.github.com"
+
+
+def _listing_cache_path(owner: str, repo: str, ref: str) -> Path:
+    return github_cache_dir() / owner / repo / f"{quote(ref, safe='')}.json"
+
+
+def _listing_ttl() -> float:
+    try:
+        from .config import load_app_config
+
+        return float(load_app_config().get("github_listing_ttl", _DEFAULT_LISTING_TTL))
+    except Exception:
+        return float(_DEFAULT_LISTING_TTL)
+
+
+def _github_api_base() -> str:
+    try:
+        from .config import load_app_config
+
+        base = str(load_app_config().get("github_api_base") or _DEFAULT_GITHUB_API_BASE)
+    except Exception:
+        base = _DEFAULT_GITHUB_API_BASE
+    return base.rstrip("/")
+
+
+def is_commit_sha(ref: str) -> bool:
+    return bool(_FULL_SHA_RE.match(ref or ""))
+
+
+def _read_listing_cache(owner: str, repo: str, ref: str) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(_listing_cache_path(owner, repo, ref).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("items"), list):
+        return None
+    return data
+
+
+def _write_listing_cache(owner: str, repo: str, ref: str, items: List[Dict[str, Any]]) -> None:
+    p = _listing_cache_path(owner, repo, ref)
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(p, json.dumps({"fetched_at": time.time(), "items": items}))
+    except Exception as exc:
+        debug(f"Failed to persist GitHub listing {owner}/{repo}@{ref}: {exc}")
+
+
+def clear_listing_cache(keep_immutable: bool = True) -> None:
+    """Drop persisted listings; entries keyed by a commit sha survive by default."""
+    root = github_cache_dir()
+    if not root.exists():
+        return
+    for p in root.rglob("*.json"):
+        if keep_immutable and is_commit_sha(unquote(p.stem)):
+            continue
+        try:
+            p.unlink()
+        except OSError:
+            pass
+    _GITHUB_CONTENTS_CACHE.clear()
+
+
 def _list_github_cmds(owner: str, repo: str, ref: str) -> List[Dict[str, Any]]:
+    """Return the GitHub contents listing of cmds/ for owner/repo@ref.
+
+    Listings are persisted under ~/.nuro/cache/github. Entries for a full
+    commit sha never expire; branch/tag refs are reused for github_listing_ttl
+    seconds and served stale when the API cannot be reached.
+    """
     key = (owner, repo, ref)
     if key in _GITHUB_CONTENTS_CACHE:
         return _GITHUB_CONTENTS_CACHE[key]
-    api_url = f"https://api.github.com/repos/{owner}/{repo}/contents/cmds?ref={ref}"
-    debug(f"GitHub contents API: owner={owner} repo={repo} ref={ref} url={api_url}")
-    req = urllib.request.Request(api_url, headers={"User-Agent": "nuro"})
-    with urllib.request.urlopen(req, timeout=15) as resp:
-        body = resp.read().decode("utf-8", errors="replace")
+    cached = _read_listing_cache(owner, repo, ref)
+    if cached is not None:
+        age = time.time() - float(cached.get("fetched_at") or 0)
+        if is_commit_sha(ref) or age < _listing_ttl():
+            debug(f"GitHub listing cache hit: {owner}/{repo}@{ref} age={age:.0f}s")
+            _GITHUB_CONTENTS_CACHE[key] = cached["items"]
+            return cached["items"]
+    api_url = f"{_github_api_base()}/repos/{owner}/{repo}/contents/cmds?ref={ref}"
+    info(f"GitHub contents API: owner={owner} repo={repo} ref={ref} url={api_url}")
+    try:
+        body = http_session().get(api_url).body.decode("utf-8", errors="replace")
+    except Exception as exc:
+        if cached is None:
+            raise
+        warning(f"GitHub contents API failed ({exc}); using stale listing for {owner}/{repo}@{ref}")
+        _GITHUB_CONTENTS_CACHE[key] = cached["items"]
+        return cached["items"]
     data = json.loads(body)
     if not isinstance(data, list):
         debug(f"Unexpected contents payload type: {type(data)}")
         return []
     _GITHUB_CONTENTS_CACHE[key] = data
+    _write_listing_cache(owner, repo, ref, data)
     return data
 
 
+def list_github_cmds(owner: str, repo: str, ref: str) -> List[Dict[str, Any]]:
+    """Public entry point to the shared (persisted) GitHub listing cache."""
+    return _list_github_cmds(owner, repo, ref)
+
+
 def _find_github_item(owner: str, repo: str, ref: str, filename: str) -> Optional[Dict[str, Any]]:
     try:
         listing = _list_github_cmds(owner, repo, ref)
@@ -160,6 +517,26 @@ def _github_download_url(owner: str, repo: str, ref: str, filename: str) -> Opti
     return None
 
 
+def _cache_buster(bucket: Dict[str, object]) -> str:
+    """Return a random query suffix when the bucket opts in via 'cache-bust'."""
+    if bucket.get("cache-bust"):
+        return f"?cb={uuid4()}"
+    return ""
+
+
+def _github_remote_source(owner: str, repo: str, ref: str, filename: str) -> Optional[Dict[str, str]]:
+    """Remote source from the contents listing, carrying the file's git blob sha."""
+    url = _github_download_url(owner, repo, ref, filename)
+    if not url:
+        return None
+    src = {"kind": "remote", "url": url}
+    item = _find_github_item(owner, repo, ref, filename) or {}
+    blob_sha = str(item.get("sha") or "").strip()
+    if blob_sha:
+        src.update({"sha": blob_sha, "owner": owner, "repo": repo, "ref": ref, "filename": filename})
+    return src
+
+
 def resolve_cmd_source(bucket_uri: str, cmd: str) -> Dict[str, str]:
     """Resolve a command source from a bucket URI without extra metadata.
 
@@ -172,7 +549,7 @@ def resolve_cmd_source(bucket_uri: str, cmd: str) -> Dict[str, str]:
         if url:
             return {"kind": "remote", "url": url}
         base = p.base.rstrip("/")
-        url = f"{base}/cmds/{cmd}.ps1?cb={uuid4()}"
+        url = f"{base}/cmds/{cmd}.ps1"
         debug(
             f"GitHub contents fallback (no download_url): base={base} cmd={cmd} ext=ps1 uri={bucket_uri}"
         )
@@ -183,7 +560,7 @@ def resolve_cmd_source(bucket_uri: str, cmd: str) -> Dict[str, str]:
             if url:
                 return {"kind": "remote", "url": url}
         base = _normalize_raw_base(p.base.rstrip("/"))
-        url = f"{base}/cmds/{cmd}.ps1?cb={uuid4()}"
+        url = f"{base}/cmds/{cmd}.ps1"
         debug(f"Resolved raw source: base={base} cmd={cmd} ext=ps1 uri={bucket_uri} -> {url}")
         return {"kind": "remote", "url": url}
     if p.type == "local":
@@ -192,7 +569,7 @@ def resolve_cmd_source(bucket_uri: str, cmd: str) -> Dict[str, str]:
         return {"kind": "local", "path": path}
     # Default fallback uses base URL when metadata insufficient
     base = p.base.rstrip("/")
-    url = f"{base}/cmds/{cmd}.ps1?cb={uuid4()}"
+    url = f"{base}/cmds/{cmd}.ps1"
     debug(f"Resolved remote source (fallback): base={base} cmd={cmd} ext=ps1 uri={bucket_uri} -> {url}")
     return {"kind": "remote", "url": url}
 
@@ -210,14 +587,14 @@ def resolve_cmd_source_with_meta(bucket: Dict[str, object], cmd: str, ext: str =
     if p.type == "github" and p.owner and p.repo:
         sha = str(bucket.get("sha1-hash") or "").strip()
         ref_or_sha = sha if sha else (p.ref or "main")
-        url = _github_download_url(p.owner, p.repo, ref_or_sha, filename)
-        if url:
+        src = _github_remote_source(p.owner, p.repo, ref_or_sha, filename)
+        if src:
             debug(
-                f"Resolved GitHub source via contents: bucket={bucket.get('name')} cmd={cmd} ext={ext} ref={ref_or_sha} -> {url}"
+                f"Resolved GitHub source via contents: bucket={bucket.get('name')} cmd={cmd} ext={ext} ref={ref_or_sha} -> {src['url']}"
             )
-            return {"kind": "remote", "url": url}
+            return src
         base = f"https://raw.githubusercontent.com/{p.owner}/{p.repo}/{ref_or_sha}".rstrip("/")
-        url = f"{base}/cmds/{filename}?cb={uuid4()}"
+        url = f"{base}/cmds/{filename}{_cache_buster(bucket)}"
         debug(
             f"GitHub contents fallback: bucket={bucket.get('name')} cmd={cmd} ext={ext} ref={ref_or_sha} -> {url}"
         )
@@ -226,12 +603,12 @@ def resolve_cmd_source_with_meta(bucket: Dict[str, object], cmd: str, ext: str =
         sha = str(bucket.get("sha1-hash") or "").strip()
         ref = sha if sha else (p.ref or "main")
         if p.owner and p.repo:
-            url = _github_download_url(p.owner, p.repo, ref, filename)
-            if url:
+            src = _github_remote_source(p.owner, p.repo, ref, filename)
+            if src:
                 debug(
-                    f"Resolved raw GitHub source via contents: bucket={bucket.get('name')} cmd={cmd} ext={ext} ref={ref} -> {url}"
+                    f"Resolved raw GitHub source via contents: bucket={bucket.get('name')} cmd={cmd} ext={ext} ref={ref} -> {src['url']}"
                 )
-                return {"kind": "remote", "url": url}
+                return src
             base = _raw_base_with_ref(p.base, ref)
         else:
             base = _normalize_raw_base(p.base)
@@ -241,7 +618,7 @@ def resolve_cmd_source_with_meta(bucket: Dict[str, object], cmd: str, ext: str =
                     f"raw bucket missing GitHub context; using normalized base for {bucket.get('name')} with ref hint {ref}"
                 )
         base = base.rstrip("/")
-        url = f"{base}/cmds/{filename}?cb={uuid4()}"
+        url = f"{base}/cmds/{filename}{_cache_buster(bucket)}"
         debug(f"Resolved raw source: bucket={bucket.get('name')} cmd={cmd} ext={ext} base={base} -> {url}")
         return {"kind": "remote", "url": url}
     # local
@@ -250,13 +627,374 @@ def resolve_cmd_source_with_meta(bucket: Dict[str, object], cmd: str, ext: str =
     return {"kind": "local", "path": path}
 
 
-def fetch_to(path: Path, url: str, timeout: int = 60) -> None:
+def bucket_file_source(bucket: Dict[str, object], filename: str) -> Dict[str, str]:
+    """Source of cmds/<filename> built from the bucket URI alone.
+
+    Unlike resolve_cmd_source_with_meta this never consults the GitHub
+    contents listing, so resolving costs no request. GitHub-backed buckets
+    are addressed on raw.githubusercontent.com at 'sha1-hash' (or the ref).
+    """
+    p = parse_bucket_uri(str(bucket.get("uri", "")))
+    if p.type == "local":
+        return {"kind": "local", "path": str((Path(p.base) / "cmds" / filename).resolve())}
+    sha = str(bucket.get("sha1-hash") or "").strip()
+    ref = sha if sha else (p.ref or "main")
+    if p.type == "github" and p.owner and p.repo:
+        base = f"https://raw.githubusercontent.com/{p.owner}/{p.repo}/{ref}"
+    elif p.owner and p.repo:
+        base = _raw_base_with_ref(p.base, ref)
+    else:
+        base = _normalize_raw_base(p.base)
+    return {"kind": "remote", "url": f"{base.rstrip('/')}/cmds/{filename}{_cache_buster(bucket)}"}
+
+
+SCRIPT_EXTS = ("ps1", "py", "sh")
+
+
+def list_bucket_commands(bucket: Dict[str, object]) -> Optional[List[Tuple[str, str]]]:
+    """Enumerate (cmd, ext) for every script under a bucket's cmds/.
+
+    A published cmds/index.json (see nuro.manifest) is used for any bucket
+    type. Otherwise GitHub-backed buckets are listed through the contents API
+    (scoped to 'sha1-hash' when pinned) and local buckets from disk. Returns
+    None when the bucket cannot be enumerated (a plain raw:: host without a
+    manifest).
+    """
+    from .manifest import load_bucket_manifest
+
+    entries = load_bucket_manifest(bucket)
+    if entries is not None:
+        return sorted((e.name, e.ext) for e in entries)
+    p = parse_bucket_uri(str(bucket.get("uri", "")))
+    names: List[str] = []
+    if p.type in ("github", "raw") and p.owner and p.repo:
+        sha = str(bucket.get("sha1-hash") or "").strip()
+        ref = sha if sha else (p.ref or "main")
+        for item in _list_github_cmds(p.owner, p.repo, ref):
+            if isinstance(item, dict) and item.get("type", "file") == "file":
+                names.append(str(item.get("name") or ""))
+    elif p.type == "local":
+        cmds = Path(p.base) / "cmds"
+        if not cmds.is_dir():
+            return []
+        names = [c.name for c in cmds.iterdir() if c.is_file()]
+    else:
+        return None
+    found: List[Tuple[str, str]] = []
+    for name in sorted(names):
+        stem, _, ext = name.rpartition(".")
+        if stem and ext.lower() in SCRIPT_EXTS:
+            found.append((stem, ext.lower()))
+    return found
+
+
+def probe_source(src: Dict[str, str], timeout: Optional[float] = None) -> Optional[bool]:
+    """Whether a resolved source exists, without downloading it.
+
+    Local sources are stat'ed; a source from the GitHub listing (it carries a
+    blob sha) is known to exist; other remote sources get a HEAD request.
+    True/False are definite answers (False means 404). None means unknown:
+    the host answered HEAD with another error, or the source cannot be probed.
+    Connection errors propagate.
+    """
+    if src.get("kind") == "local":
+        return Path(src["path"]).exists()
+    if src.get("sha"):
+        return True
+    try:
+        http_session().head(src["url"], headers={"Cache-Control": "no-cache"}, timeout=timeout)
+        return True
+    except HttpError as e:
+        return False if e.code == 404 else None
+    except ValueError:
+        return None
+
+
+def _meta_path(path: Path) -> Path:
+    """Sidecar holding HTTP validators for a cached script (<file>.meta.json)."""
+    return path.with_name(path.name + ".meta.json")
+
+
+def _strip_cache_buster(url: str) -> str:
+    parsed = urlparse(url)
+    if not parsed.query:
+        return url
+    query = "&".join(q for q in parsed.query.split("&") if not q.startswith("cb="))
+    return urlunparse(parsed._replace(query=query))
+
+
+def read_fetch_meta(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(_meta_path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_fetch_meta(path: Path, meta: Dict[str, Any]) -> None:
+    try:
+        atomic_write_text(_meta_path(path), json.dumps(meta, indent=2, ensure_ascii=False))
+    except Exception as exc:
+        debug(f"Failed to write fetch metadata for {path}: {exc}")
+
+
+def fetch_to(path: Path, url: str, timeout: Optional[float] = None) -> bool:
+    """Download url into path, revalidating an existing copy when possible.
+
+    Validators (ETag / Last-Modified) from the previous download are kept in a
+    sidecar next to the file and sent as If-None-Match / If-Modified-Since.
+    Returns True when the body was (re)written, False on 304 Not Modified.
+    timeout overrides the configured http.read_timeout.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    debug(f"Fetching from URL: {url}")
-    req = urllib.request.Request(
-        url,
-        headers={"Cache-Control": "no-cache", "Pragma": "no-cache", "User-Agent": "nuro"},
+    key_url = _strip_cache_buster(url)
+    headers = {"Cache-Control": "no-cache", "Pragma": "no-cache"}
+    meta = read_fetch_meta(path) if path.exists() else None
+    if meta and meta.get("url") == key_url:
+        if meta.get("etag"):
+            headers["If-None-Match"] = str(meta["etag"])
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = str(meta["last_modified"])
+    else:
+        meta = None
+    info(f"Fetching from URL: {url} conditional={meta is not None}")
+    now = time.time()
+    resp = http_session().get(url, headers=headers, timeout=timeout)
+    if resp.status == 304:
+        if meta is None:
+            raise HttpError(url, 304, "Not Modified without a cached copy")
+        debug(f"Not modified: {url}")
+        meta["checked_at"] = now
+        _write_fetch_meta(path, meta)
+        return False
+    etag = resp.headers.get("etag")
+    last_modified = resp.headers.get("last-modified")
+    atomic_write_bytes(path, resp.body)
+    _write_fetch_meta(
+        path,
+        {
+            "url": key_url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": now,
+            "checked_at": now,
+        },
     )
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        data = resp.read()
-    path.write_bytes(data)
+    return True
+
+
+def revalidate_cached(path: Path, timeout: Optional[float] = None) -> Optional[bool]:
+    """Revalidate a cached script against the source recorded in its sidecar.
+
+    Returns None when the file has no sidecar (it was not fetched over HTTP),
+    otherwise whether the file changed. Objects resolved from a GitHub listing
+    are compared by blob sha; others use a conditional GET. A 404 removes the
+    stale copy.
+    """
+    meta = read_fetch_meta(path)
+    if not meta or not meta.get("url"):
+        return None
+    if meta.get("sha") and meta.get("owner") and meta.get("repo") and meta.get("filename"):
+        src = _github_remote_source(
+            str(meta["owner"]), str(meta["repo"]), str(meta.get("ref") or "main"), str(meta["filename"])
+        )
+        if src is None:
+            debug(f"Cached script missing from listing; dropping {path}")
+            for p in (path, _meta_path(path)):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+            return True
+        if src.get("sha") == meta.get("sha"):
+            meta["checked_at"] = time.time()
+            _write_fetch_meta(path, meta)
+            return False
+        return fetch_source(src, path, timeout=timeout)
+    try:
+        return fetch_to(path, str(meta["url"]), timeout=timeout)
+    except HttpError as e:
+        if e.code == 404:
+            debug(f"Cached script removed upstream; dropping {path}")
+            for p in (path, _meta_path(path)):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+        raise
+
+
+# ---------------- content-addressed script store -----------------
+
+
+def git_blob_sha(data: bytes) -> str:
+    """sha1 of a git blob object, as reported in the GitHub contents API."""
+    h = hashlib.sha1()
+    h.update(b"blob %d\0" % len(data))
+    h.update(data)
+    return h.hexdigest()
+
+
+def _object_path(blob_sha: str) -> Path:
+    return objects_dir() / blob_sha.lower()
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{uuid4().hex}.tmp")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dest)
+
+
+def fetch_source(src: Dict[str, str], dest: Path, timeout: Optional[float] = None) -> bool:
+    """Materialize a resolved command source at dest.
+
+    Local sources are copied. Remote sources carrying a git blob sha are served
+    from ~/.nuro/cache/objects/<sha> when present (no download); otherwise the
+    bytes are downloaded, verified against the sha and added to the store, and
+    dest is linked to the stored object. Sources from a bucket manifest carry
+    a sha256 the downloaded bytes must match. Returns True when dest changed.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if src.get("kind") == "local":
+        local_path = Path(src["path"])
+        atomic_write_bytes(dest, local_path.read_bytes())
+        debug(f"Copied local command from {local_path} -> {dest}")
+        return True
+    blob_sha = str(src.get("sha") or "").lower()
+    if not blob_sha:
+        changed = fetch_to(dest, src["url"], timeout=timeout)
+        want = str(src.get("sha256") or "").lower()
+        if want:
+            actual = hashlib.sha256(dest.read_bytes()).hexdigest()
+            if actual != want:
+                for p in (dest, _meta_path(dest)):
+                    try:
+                        p.unlink()
+                    except OSError:
+                        pass
+                raise ValueError(f"sha256 mismatch for {src['url']}: expected {want}, got {actual}")
+        return changed
+    meta = {k: src[k] for k in ("owner", "repo", "ref", "filename") if k in src}
+    meta.update({"url": _strip_cache_buster(src["url"]), "sha": blob_sha})
+    obj = _object_path(blob_sha)
+    if obj.exists():
+        debug(f"Object store hit: sha={blob_sha} -> {dest}")
+        _link_or_copy(obj, dest)
+    else:
+        fetch_to(dest, src["url"], timeout=timeout)
+        actual = git_blob_sha(dest.read_bytes())
+        if actual != blob_sha:
+            for p in (dest, _meta_path(dest)):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+            raise ValueError(f"blob sha mismatch for {src['url']}: expected {blob_sha}, got {actual}")
+        try:
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(dest, obj)
+        except OSError as exc:
+            debug(f"Failed to store object {blob_sha}: {exc}")
+        meta.update(read_fetch_meta(dest) or {})
+    now = time.time()
+    meta.setdefault("fetched_at", now)
+    meta["checked_at"] = now
+    _write_fetch_meta(dest, meta)
+    return True
+
+
+# ---------------- archive bulk fetch -----------------
+
+_DEFAULT_GITHUB_ARCHIVE_BASE = "https://codeload.github.com"
+_ARCHIVE_DRAIN_CHUNK = 64 * 1024
+
+
+def _github_archive_base() -> str:
+    try:
+        from .config import load_app_config
+
+        base = str(load_app_config().get("github_archive_base") or _DEFAULT_GITHUB_ARCHIVE_BASE)
+    except Exception:
+        base = _DEFAULT_GITHUB_ARCHIVE_BASE
+    return base.rstrip("/")
+
+
+def pinned_archive_source(bucket: Dict[str, object]) -> Optional[Tuple[str, str, str]]:
+    """Return (owner, repo, sha) for a GitHub-backed bucket pinned to a full commit sha."""
+    p = parse_bucket_uri(str(bucket.get("uri", "")))
+    if p.type not in ("github", "raw") or not (p.owner and p.repo):
+        return None
+    sha = str(bucket.get("sha1-hash") or "").strip()
+    if not is_commit_sha(sha):
+        return None
+    return p.owner, p.repo, sha.lower()
+
+
+def fetch_bucket_archive(
+    bucket: Dict[str, object], dest_dir: Path, timeout: Optional[float] = None
+) -> Optional[List[Tuple[str, str]]]:
+    """Populate dest_dir with cmds/* of a sha-pinned bucket from one tarball.
+
+    The <archive base>/<owner>/<repo>/tar.gz/<sha> response is streamed
+    through tarfile member by member, so only one script is held in memory at
+    a time. Scripts go through the object store and get the same sidecar as a
+    per-file fetch. Returns the extracted (cmd, ext) pairs, or None when the
+    bucket is not pinned to a commit.
+    """
+    import tarfile
+
+    pinned = pinned_archive_source(bucket)
+    if pinned is None:
+        return None
+    owner, repo, sha = pinned
+    url = f"{_github_archive_base()}/{owner}/{repo}/tar.gz/{sha}"
+    info(f"Fetching bucket archive: bucket={bucket.get('name')} url={url}")
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    found: List[Tuple[str, str]] = []
+    now = time.time()
+    with http_session().stream(url, timeout=timeout) as body:
+        with tarfile.open(fileobj=body, mode="r|gz") as tar:
+            for member in tar:
+                # <repo>-<sha>/cmds/<file>; nested folders are not commands
+                parts = member.name.split("/")
+                if not member.isfile() or len(parts) != 3 or parts[1] != "cmds":
+                    continue
+                stem, _, ext = parts[2].rpartition(".")
+                ext = ext.lower()
+                if not stem or ext not in SCRIPT_EXTS:
+                    continue
+                f = tar.extractfile(member)
+                if f is None:
+                    continue
+                data = f.read()
+                blob_sha = git_blob_sha(data)
+                obj = _object_path(blob_sha)
+                if not obj.exists():
+                    obj.parent.mkdir(parents=True, exist_ok=True)
+                    atomic_write_bytes(obj, data)
+                filename = f"{stem}.{ext}"
+                dest = dest_dir / filename
+                _link_or_copy(obj, dest)
+                _write_fetch_meta(
+                    dest,
+                    {
+                        "url": f"https://raw.githubusercontent.com/{owner}/{repo}/{sha}/cmds/{parts[2]}",
+                        "sha": blob_sha,
+                        "owner": owner,
+                        "repo": repo,
+                        "ref": sha,
+                        "filename": parts[2],
+                        "fetched_at": now,
+                        "checked_at": now,
+                    },
+                )
+                found.append((stem, ext))
+        # consume the end-of-archive padding so the connection can be reused
+        while body.read(_ARCHIVE_DRAIN_CHUNK):
+            pass
+    debug(f"Extracted {len(found)} commands from {url}")
+    return found
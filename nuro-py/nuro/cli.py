@@ -1,24 +1,57 @@
 from __future__ import annotations
 
-import os
 import sys
-from typing import List, Optional, Tuple
 
-from .runner import run_command, ensure_nuro_tree
-from .usage import print_root_usage
 from . import __version__
-from .debuglog import set_debug_enabled, is_debug_enabled
-from .registry import apply_unsafe_dev_mode_from_marker
 
+# Keep this module's imports minimal: `nuro --version` and cached command runs
+# must not pay for the fetch/usage machinery. Each path below imports only the
+# modules it needs; the thin wrappers keep the historical module attributes.
 
-def main(argv: Optional[List[str]] = None) -> int:
+
+def ensure_nuro_tree() -> None:
+    from .paths import ensure_tree
+
+    ensure_tree()
+
+
+def apply_unsafe_dev_mode_from_marker() -> bool:
+    from .paths import nuro_home
+
+    # Cheap stat first; the registry is only parsed when the marker exists
+    if not (nuro_home() / "nusafedevmode").exists():
+        return False
+    from .registry import apply_unsafe_dev_mode_from_marker as _apply
+
+    return _apply()
+
+
+def print_root_usage(refresh: bool = False) -> None:
+    from .usage import print_root_usage as _print_root_usage
+
+    _print_root_usage(refresh=refresh)
+
+
+def run_command(name: str, args: list[str]) -> int:
+    from .runner import run_command as _run_command
+
+    return _run_command(name, args)
+
+
+def sync(args: list[str]) -> int:
+    from .sync import main as _sync_main
+
+    return _sync_main(args)
+
+
+def main(argv: list[str] | None = None) -> int:
     if argv is None:
         argv = sys.argv[1:]
 
     # Parse global flags: --debug / --no-debug / --refresh (usage refresh)
     dbg = None
     refresh_usage = False
-    filtered: List[str] = []
+    filtered: list[str] = []
     it = iter(argv)
     for a in it:
         if a in ("--debug", "-d"):
@@ -33,30 +66,32 @@ def main(argv: Optional[List[str]] = None) -> int:
         filtered.append(a)
     argv = filtered
 
+    # version shortcut: nuro --version/-V (no filesystem or registry work)
+    if argv and argv[0] in ("--version", "-V"):
+        print(__version__)
+        return 0
+
     if dbg is not None:
-        set_debug_enabled(dbg)
+        from .debuglog import set_debug_enabled
 
-    # Ensure ~/.nuro tree exists
-    ensure_nuro_tree()
+        set_debug_enabled(dbg)
 
     apply_unsafe_dev_mode_from_marker()
 
-    if not argv:
+    # help shortcut: nuro -h/--help
+    if not argv or argv[0] in ("-h", "--help", "/?"):
+        # Ensure ~/.nuro tree exists
+        ensure_nuro_tree()
         print_root_usage(refresh=refresh_usage)
         return 0
 
     name = argv[0]
     args = argv[1:]
 
-    # help/version shortcut: nuro -h/--help, nuro --version/-V
-    if name in ("-h", "--help", "/?"):
-        print_root_usage(refresh=refresh_usage)
-        return 0
-    if name in ("--version", "-V"):
-        print(__version__)
-        return 0
-
     try:
+        # builtin: nuro sync [bucket...] (bucket commands stay reachable as bucket:sync)
+        if name == "sync":
+            return sync(args)
         code = run_command(name, args)
         return int(code or 0)
     except KeyboardInterrupt:
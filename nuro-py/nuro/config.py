@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 from typing import Any, Dict
 
+from .fsutil import atomic_write_text
 from .paths import config_dir, ensure_tree
 from . import DEFAULT_OFFICIAL_BUCKET_BASE
 
@@ -13,10 +14,63 @@ def _config_path() -> Path:
     return config_dir() / "config.json"
 
 
+_DEFAULT_LOGS = {
+    # Rotate nuro-debug.log once it reaches max_bytes, keeping `backups` old files
+    "max_bytes": 1024 * 1024,
+    "backups": 3,
+    # PowerShell transcripts are deleted after successful runs; failed-run
+    # transcripts are kept for keep_days, at most max_transcripts files
+    "transcript_keep_days": 7,
+    "max_transcripts": 20,
+}
+
+
+_DEFAULT_HTTP = {
+    # Seconds to establish a connection / to wait on a connected socket
+    "connect_timeout": 10.0,
+    "read_timeout": 30.0,
+}
+
+
+_DEFAULT_PY_ENVS = {
+    # Isolated environments per __requires__ set kept (least recently used go first)
+    "max_envs": 8,
+    # Environments unused for this many days are removed
+    "max_age_days": 30,
+}
+
+
+_DEFAULT_PS_POOL = {
+    # Opt-in pool of long-lived PowerShell hosts (see nuro.pshost)
+    "enabled": False,
+    "size": 2,
+    # A worker exits after max_runs requests or idle_seconds without one
+    "max_runs": 100,
+    "idle_seconds": 900,
+}
+
+
 def _default_app_config() -> Dict[str, Any]:
     return {
         # Official bucket base URL (commands live under "cmds/")
         "official_bucket_base": DEFAULT_OFFICIAL_BUCKET_BASE,
+        # GitHub REST API root used for cmds/ listings (GitHub Enterprise, test stand-ins)
+        "github_api_base": "https://api.github.com",
+        # Tarball host used by `nuro sync` for buckets pinned to a commit sha
+        "github_archive_base": "https://codeload.github.com",
+        # Seconds a GitHub contents listing for a branch/tag is reused
+        # (listings for a full commit sha never expire)
+        "github_listing_ttl": 300,
+        # Seconds a "command not found in bucket" answer is reused
+        # (answers for a bucket pinned to a commit never expire)
+        "negative_cache_ttl": 120,
+        # Parallel fetch/usage-capture workers used by `nuro --refresh`
+        "refresh_workers": 8,
+        # Timeouts for the shared keep-alive HTTP session (see nuro.buckets)
+        "http": dict(_DEFAULT_HTTP),
+        "logs": dict(_DEFAULT_LOGS),
+        "py_envs": dict(_DEFAULT_PY_ENVS),
+        "ps_pool": dict(_DEFAULT_PS_POOL),
     }
 
 
@@ -29,7 +83,7 @@ def load_app_config() -> Dict[str, Any]:
     p = _config_path()
     if not p.exists():
         obj = _default_app_config()
-        p.write_text(json.dumps(obj, indent=2, ensure_ascii=False), encoding="utf-8")
+        atomic_write_text(p, json.dumps(obj, indent=2, ensure_ascii=False))
         return obj
     try:
         raw = p.read_text(encoding="utf-8")
@@ -43,7 +97,7 @@ def load_app_config() -> Dict[str, Any]:
         return data
     except Exception:
         obj = _default_app_config()
-        p.write_text(json.dumps(obj, indent=2, ensure_ascii=False), encoding="utf-8")
+        atomic_write_text(p, json.dumps(obj, indent=2, ensure_ascii=False))
         return obj
 
 
@@ -55,3 +109,67 @@ def official_bucket_base(cfg: Dict[str, Any] | None = None) -> str:
     while base.endswith("/"):
         base = base[:-1]
     return base
+
+
+def log_settings(cfg: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Return the "logs" section merged over the retention defaults."""
+    if cfg is None:
+        cfg = load_app_config()
+    settings = dict(_DEFAULT_LOGS)
+    section = cfg.get("logs")
+    if isinstance(section, dict):
+        for k in settings:
+            try:
+                settings[k] = max(0, int(section.get(k, settings[k])))
+            except (TypeError, ValueError):
+                pass
+    return settings
+
+
+def http_settings(cfg: Dict[str, Any] | None = None) -> Dict[str, float]:
+    """Return the "http" section merged over the timeout defaults."""
+    if cfg is None:
+        cfg = load_app_config()
+    settings = dict(_DEFAULT_HTTP)
+    section = cfg.get("http")
+    if isinstance(section, dict):
+        for k in settings:
+            try:
+                value = float(section.get(k, settings[k]))
+            except (TypeError, ValueError):
+                continue
+            if value > 0:
+                settings[k] = value
+    return settings
+
+
+def py_env_settings(cfg: Dict[str, Any] | None = None) -> Dict[str, int]:
+    """Return the "py_envs" section merged over the retention defaults."""
+    if cfg is None:
+        cfg = load_app_config()
+    settings = dict(_DEFAULT_PY_ENVS)
+    section = cfg.get("py_envs")
+    if isinstance(section, dict):
+        for k in settings:
+            try:
+                settings[k] = max(0, int(section.get(k, settings[k])))
+            except (TypeError, ValueError):
+                pass
+    return settings
+
+
+def ps_pool_settings(cfg: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Return the "ps_pool" section merged over the pool defaults."""
+    if cfg is None:
+        cfg = load_app_config()
+    settings = dict(_DEFAULT_PS_POOL)
+    section = cfg.get("ps_pool")
+    if isinstance(section, dict):
+        for k in settings:
+            if k not in section:
+                continue
+            try:
+                settings[k] = bool(section[k]) if k == "enabled" else max(1, int(section[k]))
+            except (TypeError, ValueError):
+                pass
+    return settings
@@ -1,14 +1,31 @@
 from __future__ import annotations
 
-import datetime as _dt
+import atexit
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import IO, List, Optional
 
-from .paths import logs_dir, ensure_tree
+from .paths import logs_dir
 
 
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+_LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+# Buffered lines are written once this many are pending (errors flush at once)
+_BUFFER_LINES = 64
+
 _enabled: Optional[bool] = None  # None means uninitialized; default False when first checked
+_threshold: Optional[int] = None  # None means uninitialized; resolved on first log call
+_lock = threading.Lock()
+_buffer: List[str] = []
+_handle: Optional[IO[str]] = None
+_atexit_registered = False
 
 
 def _log_path() -> Path:
@@ -16,8 +33,9 @@ def _log_path() -> Path:
 
 
 def set_debug_enabled(flag: bool) -> None:
-    global _enabled
+    global _enabled, _threshold
     _enabled = bool(flag)
+    _threshold = None
 
 
 def is_debug_enabled() -> bool:
@@ -29,20 +47,137 @@ def is_debug_enabled() -> bool:
     return bool(_enabled)
 
 
-def debug(message: str) -> None:
-    """Write a debug line to ~/.nuro/logs regardless of flag; echo to console when enabled."""
+def _parse_level(value: str) -> Optional[int]:
+    value = value.strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return int(value)
+    for num, name in _LEVEL_NAMES.items():
+        if name == value.upper():
+            return num
+    return None
 
-    ensure_tree()
-    ts = _dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"[{ts}] {message}"
+
+def set_log_level(level: Optional[int]) -> None:
+    """Override the file threshold; None re-reads NURO_DEBUG / NURO_LOG_LEVEL."""
+    global _threshold
+    _threshold = level
+
+
+def _current_threshold() -> int:
+    global _threshold
+    if _threshold is None:
+        if is_debug_enabled():
+            _threshold = DEBUG
+        else:
+            _threshold = _parse_level(os.environ.get("NURO_LOG_LEVEL", "")) or INFO
+    return _threshold
+
+
+def flush() -> None:
+    """Write buffered lines to ~/.nuro/logs/nuro-debug.log."""
+    with _lock:
+        _flush_locked()
+
+
+def _rotate_if_needed(p: Path) -> None:
+    """Rotate nuro-debug.log -> .1 -> .2 ... once it exceeds logs.max_bytes."""
     try:
-        p = _log_path()
-        p.parent.mkdir(parents=True, exist_ok=True)
-        with p.open("a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        size = p.stat().st_size
+    except OSError:
+        return
+    try:
+        from .config import log_settings
+
+        settings = log_settings()
+    except Exception:
+        return
+    max_bytes = settings["max_bytes"]
+    if not max_bytes or size < max_bytes:
+        return
+    backups = settings["backups"]
+    try:
+        if backups <= 0:
+            p.unlink()
+            return
+        for i in range(backups - 1, 0, -1):
+            src = p.with_name(f"{p.name}.{i}")
+            if src.exists():
+                os.replace(src, p.with_name(f"{p.name}.{i + 1}"))
+        os.replace(p, p.with_name(f"{p.name}.1"))
+    except OSError:
+        pass
+
+
+def _flush_locked() -> None:
+    global _handle
+    if not _buffer:
+        return
+    try:
+        if _handle is None:
+            p = _log_path()
+            p.parent.mkdir(parents=True, exist_ok=True)
+            _rotate_if_needed(p)
+            _handle = p.open("a", encoding="utf-8")
+        _handle.write("".join(_buffer))
+        _handle.flush()
     except Exception:
         # Swallow logging errors silently
         pass
+    finally:
+        _buffer.clear()
+
+
+def _close() -> None:
+    global _handle
+    with _lock:
+        _flush_locked()
+        if _handle is not None:
+            try:
+                _handle.close()
+            except Exception:
+                pass
+            _handle = None
+
+
+def log(level: int, message: str) -> None:
+    """Log a line at level; lines below the threshold return immediately.
+
+    Lines are buffered behind one open file handle and flushed at exit, on
+    ERROR, or once the buffer fills. With --debug / NURO_DEBUG every line is
+    also echoed to the console.
+    """
+    global _atexit_registered
+    if level < (_threshold if _threshold is not None else _current_threshold()):
+        return
+    ts = time.strftime("%Y-%m-%d %H:%M:%S")
+    name = _LEVEL_NAMES.get(level, str(level))
+    with _lock:
+        _buffer.append(f"[{ts}] {name}: {message}\n")
+        if not _atexit_registered:
+            atexit.register(_close)
+            _atexit_registered = True
+        if level >= ERROR or len(_buffer) >= _BUFFER_LINES:
+            _flush_locked()
 
     if is_debug_enabled():
-        print(f"[DEBUG] {message}")
+        print(f"[{name}] {message}")
+
+
+def debug(message: str) -> None:
+    if DEBUG < (_threshold if _threshold is not None else _current_threshold()):
+        return
+    log(DEBUG, message)
+
+
+def info(message: str) -> None:
+    log(INFO, message)
+
+
+def warning(message: str) -> None:
+    log(WARNING, message)
+
+
+def error(message: str) -> None:
+    log(ERROR, message)
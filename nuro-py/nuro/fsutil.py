@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .paths import run_dir
+
+# Helpers shared by every cache writer: files are replaced atomically (readers
+# never see a partial file) and advisory locks serialize concurrent nuro
+# processes that would otherwise do the same work twice.
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write data to a temp file next to path and rename it into place.
+
+    Never writes through an existing file, which matters for cache entries
+    hardlinked into the object store.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+def try_lock(path: Path) -> Optional[int]:
+    """Take a non-blocking exclusive lock on a lock file; return its fd."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return fd
+    except OSError:
+        os.close(fd)
+        return None
+
+
+def unlock(fd: int) -> None:
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def lock_path(key: str) -> Path:
+    """Lock file for an arbitrary key (a cache path, a file name, ...)."""
+    import hashlib
+
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+    return run_dir() / "locks" / f"{digest}.lock"
+
+
+@contextmanager
+def file_lock(key: str, timeout: float = 120.0) -> Iterator[bool]:
+    """Hold the exclusive lock for key; yields whether it had to wait.
+
+    Waiting polls with a short back-off. After timeout the body runs without
+    the lock rather than failing the command (the lock only avoids duplicate
+    work, atomic writes keep the files consistent either way).
+    """
+    path = lock_path(key)
+    fd = try_lock(path)
+    waited = fd is None
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while fd is None and time.monotonic() < deadline:
+        time.sleep(delay)
+        delay = min(delay * 2, 0.2)
+        fd = try_lock(path)
+    try:
+        yield waited
+    finally:
+        if fd is not None:
+            unlock(fd)
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .debuglog import debug, info, warning
+from .fsutil import atomic_write_text
+from .paths import manifest_cache_dir
+from .psusage import static_usage_for_ps1
+
+# A bucket may publish cmds/index.json describing its commands:
+#
+#   {"version": 1, "commands": [
+#     {"name": "get", "ext": "ps1", "size": 2076, "sha256": "...", "usage": "nuro get ..."}]}
+#
+# With it, listing a bucket, picking a command's extension and showing usage
+# lines cost one small request for any bucket type (raw:: hosts have no
+# listing API at all). "usage" is null when it cannot be read statically.
+
+MANIFEST_NAME = "index.json"
+MANIFEST_VERSION = 1
+
+
+class ManifestEntry(NamedTuple):
+    name: str
+    ext: str
+    size: int
+    sha256: str
+    usage: Optional[str]
+
+    @property
+    def filename(self) -> str:
+        return f"{self.name}.{self.ext}"
+
+
+# ---------------- generator -----------------
+
+
+def build_manifest(cmds_dir: Path) -> Dict[str, Any]:
+    """Describe every cmds/*.ps1|py|sh in cmds_dir."""
+    from .buckets import SCRIPT_EXTS
+
+    commands: List[Dict[str, Any]] = []
+    for p in sorted(cmds_dir.iterdir(), key=lambda x: x.name.lower()):
+        stem, _, ext = p.name.rpartition(".")
+        if not p.is_file() or not stem or ext.lower() not in SCRIPT_EXTS:
+            continue
+        data = p.read_bytes()
+        usage = None
+        if ext.lower() == "ps1":
+            text = static_usage_for_ps1(p, stem)
+            usage = text.splitlines()[0].strip() if text else None
+        commands.append(
+            {
+                "name": stem,
+                "ext": ext.lower(),
+                "size": len(data),
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "usage": usage,
+            }
+        )
+    return {"version": MANIFEST_VERSION, "commands": commands}
+
+
+def render_manifest(manifest: Dict[str, Any]) -> str:
+    return json.dumps(manifest, indent=2, ensure_ascii=False) + "\n"
+
+
+def write_manifest(cmds_dir: Path) -> Path:
+    out = cmds_dir / MANIFEST_NAME
+    atomic_write_text(out, render_manifest(build_manifest(cmds_dir)))
+    return out
+
+
+# ---------------- reader -----------------
+
+_MEMO: Dict[str, Optional[List[ManifestEntry]]] = {}
+_MEMO_LOCK = threading.Lock()
+
+
+def parse_manifest(data: Any) -> Optional[List[ManifestEntry]]:
+    """Validated entries of a decoded index.json; None for an unknown format."""
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return None
+    items = data.get("commands")
+    if not isinstance(items, list):
+        return None
+    entries: List[ManifestEntry] = []
+    for item in items:
+        if not isinstance(item, dict) or not item.get("name") or not item.get("ext"):
+            continue
+        usage = item.get("usage")
+        entries.append(
+            ManifestEntry(
+                str(item["name"]),
+                str(item["ext"]).lower(),
+                int(item.get("size") or 0),
+                str(item.get("sha256") or "").lower(),
+                str(usage) if usage is not None else None,
+            )
+        )
+    return entries
+
+
+def _cache_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:20]
+
+
+def _manifest_ttl() -> float:
+    # same freshness as the GitHub listings it replaces
+    from .buckets import _listing_ttl
+
+    return _listing_ttl()
+
+
+def _fetch_remote_manifest(url: str, immutable: bool) -> Optional[List[ManifestEntry]]:
+    """Manifest at url via a persisted copy under ~/.nuro/cache/manifests.
+
+    A copy younger than the listing TTL (any age for a pinned commit) is used
+    as is, an older one is revalidated with a conditional request and served
+    stale when the host cannot be reached. A 404 is remembered the same way
+    so buckets without a manifest do not cost a request per run.
+    """
+    from .buckets import HttpError, _strip_cache_buster, fetch_to, read_fetch_meta
+
+    root = manifest_cache_dir()
+    # manifests of pinned commits survive --refresh (see clear_manifest_cache)
+    key = _cache_key(_strip_cache_buster(url)) + ("-pinned" if immutable else "")
+    path = root / f"{key}.json"
+    absent = root / f"{key}.absent"
+    ttl = _manifest_ttl()
+    now = time.time()
+    try:
+        checked = float(absent.read_text(encoding="utf-8"))
+        if immutable or now - checked < ttl:
+            return None
+    except (OSError, ValueError):
+        pass
+    meta = read_fetch_meta(path) if path.exists() else None
+    fresh = meta is not None and (immutable or now - float(meta.get("checked_at") or 0) < ttl)
+    if not fresh:
+        try:
+            fetch_to(path, url)
+        except OSError as exc:
+            if isinstance(exc, HttpError) and exc.code == 404:
+                debug(f"No manifest at {url}")
+                root.mkdir(parents=True, exist_ok=True)
+                atomic_write_text(absent, str(now))
+                return None
+            warning(f"Manifest fetch failed for {url}: {exc}")
+    try:
+        return parse_manifest(json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, ValueError) as exc:
+        debug(f"Unreadable manifest {path}: {exc}")
+        return None
+
+
+def clear_manifest_cache(keep_immutable: bool = True) -> None:
+    """Drop persisted manifests; those of pinned commits survive by default."""
+    root = manifest_cache_dir()
+    if root.exists():
+        for p in root.iterdir():
+            if keep_immutable and "-pinned" in p.name:
+                continue
+            try:
+                p.unlink()
+            except OSError:
+                pass
+    forget()
+
+
+def load_bucket_manifest(bucket: Dict[str, object]) -> Optional[List[ManifestEntry]]:
+    """Entries of the bucket's cmds/index.json, or None when it has none.
+
+    Read once per process; remote manifests are cached on disk (see
+    _fetch_remote_manifest), local buckets read the file directly.
+    """
+    from .buckets import bucket_file_source, is_commit_sha
+
+    if not bucket.get("uri"):
+        return None
+    src = bucket_file_source(bucket, MANIFEST_NAME)
+    memo_key = src.get("url") or src.get("path") or ""
+    with _MEMO_LOCK:
+        if memo_key in _MEMO:
+            return _MEMO[memo_key]
+    if src["kind"] == "local":
+        try:
+            entries = parse_manifest(json.loads(Path(src["path"]).read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            entries = None
+    else:
+        immutable = is_commit_sha(str(bucket.get("sha1-hash") or "").strip())
+        entries = _fetch_remote_manifest(src["url"], immutable)
+    if entries is not None:
+        info(f"Bucket manifest: bucket={bucket.get('name')} commands={len(entries)}")
+    with _MEMO_LOCK:
+        _MEMO[memo_key] = entries
+    return entries
+
+
+def manifest_entries(bucket: Dict[str, object], cmd: str) -> Optional[List[ManifestEntry]]:
+    """Manifest entries named cmd (one per extension); None without a manifest."""
+    entries = load_bucket_manifest(bucket)
+    if entries is None:
+        return None
+    return [e for e in entries if e.name.lower() == cmd.lower()]
+
+
+def entry_source(bucket: Dict[str, object], entry: ManifestEntry) -> Dict[str, str]:
+    """Fetch source for a manifest entry; remote bytes are checked against its sha256."""
+    from .buckets import bucket_file_source
+
+    src = bucket_file_source(bucket, entry.filename)
+    if src["kind"] == "remote" and entry.sha256:
+        src["sha256"] = entry.sha256
+    return src
+
+
+def forget() -> None:
+    with _MEMO_LOCK:
+        _MEMO.clear()
+
+
+def main(args: List[str]) -> int:
+    """python -m nuro.manifest <cmds dir>...: (re)write each dir's index.json."""
+    if not args or args[0] in ("-h", "--help"):
+        print("usage: python -m nuro.manifest <cmds dir>...")
+        return 0 if args else 2
+    for a in args:
+        d = Path(a)
+        if not d.is_dir():
+            sys.stderr.write(f"not a directory: {a}\n")
+            return 1
+        out = write_manifest(d)
+        print(f"wrote {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
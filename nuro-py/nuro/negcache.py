@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .debuglog import debug
+from .fsutil import atomic_write_text, file_lock
+from .paths import cache_dir
+
+# Persisted "not found" answers of _try_fetch_any, keyed by bucket, ref,
+# command and extension. A typo'd command or a .py-only command no longer
+# costs a 404 per bucket and extension on every run. Entries of mutable
+# buckets expire after negative_cache_ttl seconds; a bucket pinned to a
+# commit cannot gain files, so its entries never expire.
+
+_DEFAULT_TTL = 120
+
+
+def _path() -> Path:
+    return cache_dir() / "negative-cache.json"
+
+
+def _ttl() -> float:
+    try:
+        from .config import load_app_config
+
+        return max(0.0, float(load_app_config().get("negative_cache_ttl", _DEFAULT_TTL)))
+    except Exception:
+        return float(_DEFAULT_TTL)
+
+
+def _bucket_ref(bucket: Dict[str, Any]) -> str:
+    sha = str(bucket.get("sha1-hash") or "").strip().lower()
+    if sha:
+        return sha
+    uri = str(bucket.get("uri", ""))
+    return uri.rsplit("@", 1)[1] if uri.startswith("github::") and "@" in uri else ""
+
+
+def _key(bucket: Dict[str, Any], cmd: str, ext: str) -> str:
+    return "|".join((str(bucket.get("name", "")), str(bucket.get("uri", "")), _bucket_ref(bucket), cmd, ext))
+
+
+def _load() -> Dict[str, Dict[str, Any]]:
+    try:
+        data = json.loads(_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        data = None
+    if isinstance(data, dict) and isinstance(data.get("entries"), dict):
+        return data["entries"]
+    return {}
+
+
+def _write(entries: Dict[str, Dict[str, Any]]) -> None:
+    now = time.time()
+    live = {
+        k: v
+        for k, v in entries.items()
+        if isinstance(v, dict) and (v.get("expires") is None or now < float(v["expires"]))
+    }
+    p = _path()
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(p, json.dumps({"entries": live}))
+    except OSError as exc:
+        debug(f"Failed to write negative cache: {exc}")
+
+
+class NegativeCache:
+    """One load of the persisted entries; save() merges this process's changes back."""
+
+    def __init__(self) -> None:
+        self._entries = _load()
+        # key -> new entry, or None for a discarded one
+        self._changes: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def is_missing(self, bucket: Dict[str, Any], cmd: str, ext: str) -> bool:
+        entry = self._entries.get(_key(bucket, cmd, ext))
+        if not isinstance(entry, dict):
+            return False
+        expires = entry.get("expires")
+        return expires is None or time.time() < float(expires)
+
+    def add(self, bucket: Dict[str, Any], cmd: str, ext: str) -> None:
+        from .pincache import immutable_sha
+
+        now = time.time()
+        permanent = immutable_sha(bucket) is not None
+        key = _key(bucket, cmd, ext)
+        self._entries[key] = self._changes[key] = {"at": now, "expires": None if permanent else now + _ttl()}
+
+    def discard(self, bucket: Dict[str, Any], cmd: str, ext: str) -> None:
+        key = _key(bucket, cmd, ext)
+        if self._entries.pop(key, None) is not None:
+            self._changes[key] = None
+
+    def save(self) -> None:
+        if not self._changes:
+            return
+        # other nuro processes may have saved since we loaded: merge under the lock
+        with file_lock(str(_path())):
+            entries = _load()
+            for key, entry in self._changes.items():
+                if entry is None:
+                    entries.pop(key, None)
+                else:
+                    entries[key] = entry
+            _write(entries)
+        self._entries = entries
+        self._changes = {}
+
+
+def clear(keep_immutable: bool = True) -> None:
+    """Forget not-found answers; those of pinned commits survive by default."""
+    p = _path()
+    with file_lock(str(p)):
+        if not keep_immutable:
+            try:
+                p.unlink()
+            except OSError:
+                pass
+            return
+        entries = _load()
+        kept = {k: v for k, v in entries.items() if isinstance(v, dict) and v.get("expires") is None}
+        if len(kept) != len(entries):
+            _write(kept)
@@ -21,6 +21,18 @@ def cmds_cache_base() -> Path:
     return cache_dir() / "cmds"
 
 
+def github_cache_dir() -> Path:
+    return cache_dir() / "github"
+
+
+def manifest_cache_dir() -> Path:
+    return cache_dir() / "manifests"
+
+
+def objects_dir() -> Path:
+    return cache_dir() / "objects"
+
+
 def ps1_dir() -> Path:
     """Legacy alias for the unified command cache directory."""
     return cmds_cache_base()
@@ -34,6 +46,18 @@ def logs_dir() -> Path:
     return nuro_home() / "logs"
 
 
+def run_dir() -> Path:
+    return nuro_home() / "run"
+
+
+def envs_dir() -> Path:
+    return nuro_home() / "envs"
+
+
+def wheelhouse_dir() -> Path:
+    return nuro_home() / "wheels"
+
+
 def config_dir() -> Path:
     return nuro_home() / "config"
 
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+# Minimal PEP 440 / PEP 508 support for checking a script's __requires__
+# against installed distributions without depending on `packaging`.
+# Only what the requirement check needs: version ordering, the specifier
+# operators and splitting a requirement string into its parts.
+
+
+_VERSION_RE = re.compile(
+    r"""
+    ^\s*v?
+    (?:(?P<epoch>\d+)!)?
+    (?P<release>\d+(?:\.\d+)*)
+    (?:[-_.]?(?P<pre_l>alpha|a|beta|b|preview|pre|c|rc)[-_.]?(?P<pre_n>\d+)?)?
+    (?:-(?P<post_n1>\d+)|[-_.]?(?P<post_l>post|rev|r)[-_.]?(?P<post_n2>\d+)?)?
+    (?:[-_.]?(?P<dev_l>dev)[-_.]?(?P<dev_n>\d+)?)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    \s*$
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+
+_PRE_RANK = {"a": 0, "alpha": 0, "b": 1, "beta": 1, "c": 2, "rc": 2, "pre": 2, "preview": 2}
+
+
+class InvalidVersion(ValueError):
+    pass
+
+
+class Version:
+    """Parsed PEP 440 version; instances order and compare like pip does."""
+
+    __slots__ = ("epoch", "release", "pre", "post", "dev", "local", "_key")
+
+    def __init__(self, text: str) -> None:
+        m = _VERSION_RE.match(text)
+        if not m:
+            raise InvalidVersion(text)
+        self.epoch = int(m.group("epoch") or 0)
+        self.release: Tuple[int, ...] = tuple(int(x) for x in m.group("release").split("."))
+        self.pre: Optional[Tuple[int, int]] = None
+        if m.group("pre_l"):
+            self.pre = (_PRE_RANK[m.group("pre_l").lower()], int(m.group("pre_n") or 0))
+        self.post: Optional[int] = None
+        if m.group("post_n1") is not None:
+            self.post = int(m.group("post_n1"))
+        elif m.group("post_l"):
+            self.post = int(m.group("post_n2") or 0)
+        self.dev: Optional[int] = int(m.group("dev_n") or 0) if m.group("dev_l") else None
+        local = m.group("local")
+        self.local: Optional[Tuple[str, ...]] = tuple(re.split(r"[-_.]", local.lower())) if local else None
+        self._key = self._cmpkey()
+
+    def _cmpkey(self) -> tuple:
+        release = list(self.release)
+        while len(release) > 1 and release[-1] == 0:
+            release.pop()
+        # a bare .devN sorts before any pre-release of the same release
+        if self.pre is None and self.post is None and self.dev is not None:
+            pre: tuple = (0,)
+        elif self.pre is None:
+            pre = (2,)
+        else:
+            pre = (1,) + self.pre
+        post = (0,) if self.post is None else (1, self.post)
+        dev = (1,) if self.dev is None else (0, self.dev)
+        if self.local is None:
+            local: tuple = (0,)
+        else:
+            local = (1,) + tuple((1, int(p), "") if p.isdigit() else (0, 0, p) for p in self.local)
+        return (self.epoch, tuple(release), pre, post, dev, local)
+
+    @property
+    def is_prerelease(self) -> bool:
+        return self.pre is not None or self.dev is not None
+
+    @property
+    def public(self) -> "Version":
+        if self.local is None:
+            return self
+        return Version(str(self).split("+", 1)[0])
+
+    @property
+    def base(self) -> "Version":
+        epoch = f"{self.epoch}!" if self.epoch else ""
+        return Version(epoch + ".".join(str(x) for x in self.release))
+
+    def __str__(self) -> str:
+        parts = [f"{self.epoch}!" if self.epoch else "", ".".join(str(x) for x in self.release)]
+        if self.pre is not None:
+            parts.append(("a", "b", "rc")[self.pre[0]] + str(self.pre[1]))
+        if self.post is not None:
+            parts.append(f".post{self.post}")
+        if self.dev is not None:
+            parts.append(f".dev{self.dev}")
+        if self.local is not None:
+            parts.append("+" + ".".join(self.local))
+        return "".join(parts)
+
+    def __repr__(self) -> str:
+        return f"<Version {self}>"
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Version) and self._key == other._key
+
+    def __lt__(self, other: "Version") -> bool:
+        return self._key < other._key
+
+    def __le__(self, other: "Version") -> bool:
+        return self._key <= other._key
+
+    def __gt__(self, other: "Version") -> bool:
+        return self._key > other._key
+
+    def __ge__(self, other: "Version") -> bool:
+        return self._key >= other._key
+
+
+_SPEC_RE = re.compile(r"^\s*(===|~=|==|!=|<=|>=|<|>)\s*([^\s,;]+)\s*$")
+
+
+def _prefix_match(candidate: Version, prefix: str) -> bool:
+    want = Version(prefix)
+    if candidate.epoch != want.epoch:
+        return False
+    release = candidate.release + (0,) * max(0, len(want.release) - len(candidate.release))
+    return release[: len(want.release)] == want.release
+
+
+def _match_one(candidate: Version, op: str, value: str) -> bool:
+    if op == "===":
+        return str(candidate) == value
+    if op in ("==", "!=") and value.endswith(".*"):
+        hit = _prefix_match(candidate.public, value[:-2])
+        return hit if op == "==" else not hit
+    want = Version(value)
+    if op in ("==", "!="):
+        # a local label on the candidate is ignored unless the specifier has one
+        cand = candidate if want.local is not None else candidate.public
+        return (cand == want) if op == "==" else (cand != want)
+    if op == "~=":
+        if len(want.release) < 2:
+            raise ValueError(f"~= needs at least two release segments: {value}")
+        prefix = ".".join(str(x) for x in want.release[:-1])
+        if want.epoch:
+            prefix = f"{want.epoch}!{prefix}"
+        return candidate.public >= want and _prefix_match(candidate.public, prefix)
+    cand = candidate.public
+    if op == ">=":
+        return cand >= want
+    if op == "<=":
+        return cand <= want
+    if op == "<":
+        # <V excludes pre-releases of V itself unless V is a pre-release
+        if not cand < want:
+            return False
+        return want.is_prerelease or not (cand.is_prerelease and cand.base == want.base)
+    if op == ">":
+        # >V excludes post-releases of V unless V is a post-release
+        if not cand > want:
+            return False
+        return want.post is not None or not (cand.post is not None and cand.base == want.base)
+    raise ValueError(f"unknown operator: {op}")
+
+
+def specifier_contains(specifier: str, version: str) -> bool:
+    """True when version satisfies every clause of a comma-separated specifier.
+
+    Pre-releases are accepted: the check is about an already installed
+    distribution, which pip also accepts when it satisfies the clauses.
+    """
+    clauses = [c for c in specifier.split(",") if c.strip()]
+    if not clauses:
+        return True
+    try:
+        candidate = Version(version)
+    except InvalidVersion:
+        # legacy versions can only meet an arbitrary-equality clause
+        for clause in clauses:
+            m = _SPEC_RE.match(clause)
+            if not m or m.group(1) != "===" or m.group(2) != version:
+                return False
+        return True
+    for clause in clauses:
+        m = _SPEC_RE.match(clause)
+        if not m:
+            raise ValueError(f"invalid specifier: {clause!r}")
+        if not _match_one(candidate, m.group(1), m.group(2)):
+            return False
+    return True
+
+
+class Requirement(NamedTuple):
+    name: str
+    extras: List[str]
+    specifier: str
+    url: Optional[str]
+    marker: Optional[str]
+
+
+_REQ_RE = re.compile(
+    r"""
+    ^\s*(?P<name>[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)
+    \s*(?:\[(?P<extras>[^\]]*)\])?
+    \s*(?:
+        @\s*(?P<url>\S+)
+        |
+        \(?(?P<spec>[^;()]*)\)?
+    )
+    \s*(?:;\s*(?P<marker>.*))?$
+    """,
+    re.VERBOSE,
+)
+
+
+def parse_requirement(text: str) -> Requirement:
+    """Split a PEP 508 requirement into name, extras, specifier, url and marker."""
+    m = _REQ_RE.match(text)
+    if not m:
+        raise ValueError(f"invalid requirement: {text!r}")
+    extras = [e.strip() for e in (m.group("extras") or "").split(",") if e.strip()]
+    spec = (m.group("spec") or "").strip()
+    marker = (m.group("marker") or "").strip() or None
+    return Requirement(m.group("name"), extras, spec, m.group("url"), marker)
+
+
+def canonicalize_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
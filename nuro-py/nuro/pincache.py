@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .debuglog import debug, info
+from .fsutil import atomic_write_text, file_lock
+from .paths import cache_dir, cmds_cache_base
+
+# Caches of buckets pinned to a commit can never go stale. The first write of
+# each script is checked against the hashes recorded for that commit in
+# cmds/<bucket>/.pinned.json; afterwards the marker alone vouches for the
+# directory, so revalidation, --refresh and sync leave it alone. A marker for
+# another commit (the pin moved) makes the whole directory be dropped.
+
+MARKER_NAME = ".pinned.json"
+
+_SHA_RE = re.compile(r"^[0-9a-fA-F]{40}$")
+_MEMO: Dict[str, Optional[Dict[str, Any]]] = {}
+_MEMO_LOCK = threading.Lock()
+
+
+def immutable_sha(bucket: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Commit a GitHub-backed bucket is pinned to, when its content is immutable.
+
+    raw:: buckets on other hosts cannot address a commit, so a sha1-hash there
+    does not make them immutable.
+    """
+    if not isinstance(bucket, dict):
+        return None
+    sha = str(bucket.get("sha1-hash") or "").strip()
+    if not _SHA_RE.match(sha):
+        return None
+    uri = str(bucket.get("uri", ""))
+    if uri.startswith("github::") or uri.startswith("raw::https://raw.githubusercontent.com/"):
+        return sha.lower()
+    return None
+
+
+def marker_path(bucket_name: str) -> Path:
+    return cmds_cache_base() / bucket_name / MARKER_NAME
+
+
+def read_marker(bucket_name: str) -> Optional[Dict[str, Any]]:
+    p = marker_path(bucket_name)
+    with _MEMO_LOCK:
+        if str(p) in _MEMO:
+            return _MEMO[str(p)]
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        data = None
+    if not isinstance(data, dict) or not isinstance(data.get("files"), dict):
+        data = None
+    with _MEMO_LOCK:
+        _MEMO[str(p)] = data
+    return data
+
+
+def _write_marker(bucket_name: str, data: Dict[str, Any]) -> None:
+    p = marker_path(bucket_name)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(p, json.dumps(data, indent=2, sort_keys=True))
+    with _MEMO_LOCK:
+        _MEMO[str(p)] = data
+
+
+def forget() -> None:
+    with _MEMO_LOCK:
+        _MEMO.clear()
+
+
+def is_current(bucket: Optional[Dict[str, Any]]) -> bool:
+    """True when the bucket's cache was filled for the commit it is pinned to."""
+    sha = immutable_sha(bucket)
+    if sha is None:
+        return False
+    marker = read_marker(str(bucket.get("name", "")))  # type: ignore[union-attr]
+    return marker is not None and marker.get("sha") == sha
+
+
+def is_complete(bucket: Optional[Dict[str, Any]]) -> bool:
+    """True when every command of the pinned commit is already cached."""
+    if not is_current(bucket):
+        return False
+    marker = read_marker(str(bucket.get("name", ""))) or {}  # type: ignore[union-attr]
+    return bool(marker.get("complete"))
+
+
+def _purge(bucket_name: str) -> None:
+    for d in (cmds_cache_base() / bucket_name, cache_dir() / "usage" / bucket_name):
+        shutil.rmtree(d, ignore_errors=True)
+    with _MEMO_LOCK:
+        _MEMO.pop(str(marker_path(bucket_name)), None)
+
+
+def check_bucket(bucket: Optional[Dict[str, Any]]) -> None:
+    """Drop cached scripts that do not belong to the bucket's current pin.
+
+    Costs one stat (or one small read) per bucket; the common cases - an
+    unpinned bucket without marker, or a current marker - change nothing.
+    """
+    if not isinstance(bucket, dict):
+        return
+    name = str(bucket.get("name", ""))
+    if not name:
+        return
+    sha = immutable_sha(bucket)
+    marker = read_marker(name)
+    if marker is None:
+        if sha is None:
+            return
+        # files cached before the pin may come from any revision
+        d = cmds_cache_base() / name
+        if d.is_dir() and any(d.iterdir()):
+            info(f"Dropping cache of bucket {name}: filled before it was pinned to {sha}")
+            _purge(name)
+        _write_marker(name, {"sha": sha, "files": {}})
+        return
+    if sha is None:
+        # unpinned again: the cache becomes an ordinary, revalidated one
+        debug(f"Bucket {name} no longer pinned; removing {MARKER_NAME}")
+        try:
+            marker_path(name).unlink()
+        except OSError:
+            pass
+        with _MEMO_LOCK:
+            _MEMO[str(marker_path(name))] = None
+        return
+    if marker.get("sha") != sha:
+        info(f"Dropping cache of bucket {name}: pinned commit changed {marker.get('sha')} -> {sha}")
+        _purge(name)
+        _write_marker(name, {"sha": sha, "files": {}})
+
+
+def _hashes(data: bytes) -> Dict[str, str]:
+    blob = hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+    return {"sha256": hashlib.sha256(data).hexdigest(), "blob": blob}
+
+
+def record(bucket: Optional[Dict[str, Any]], paths: Iterable[Path], complete: bool = False) -> None:
+    """Check freshly written scripts of a pinned bucket and add them to its marker.
+
+    A script whose bytes differ from the hashes already recorded for the same
+    commit (or from the blob sha its fetch metadata names) is deleted and
+    ValueError is raised. complete marks the marker as covering every command
+    of the commit (set by sync). No-op for buckets that are not immutable.
+    """
+    sha = immutable_sha(bucket)
+    if sha is None:
+        return
+    name = str(bucket.get("name", ""))  # type: ignore[union-attr]
+    with file_lock(str(marker_path(name))):
+        with _MEMO_LOCK:
+            _MEMO.pop(str(marker_path(name)), None)
+        marker = read_marker(name)
+        if marker is None or marker.get("sha") != sha:
+            marker = {"sha": sha, "files": {}}
+        files: Dict[str, Any] = marker["files"]
+        bad = []
+        for p in paths:
+            hashes = _hashes(p.read_bytes())
+            want = files.get(p.name) or {}
+            try:
+                meta = json.loads(p.with_name(p.name + ".meta.json").read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                meta = {}
+            blob = str(meta.get("sha") or want.get("blob") or "").lower()
+            if (blob and blob != hashes["blob"]) or (want.get("sha256") and want["sha256"] != hashes["sha256"]):
+                bad.append(p)
+                continue
+            files[p.name] = hashes
+        if complete and not bad:
+            marker["complete"] = True
+        _write_marker(name, marker)
+    for p in bad:
+        for q in (p, p.with_name(p.name + ".meta.json")):
+            try:
+                q.unlink()
+            except OSError:
+                pass
+    if bad:
+        raise ValueError(f"{', '.join(p.name for p in bad)} does not match the hash recorded for {name}@{sha}")
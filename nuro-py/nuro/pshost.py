@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import json
 import os
 import platform
+import re
 import shutil
 import subprocess
+import sys
+import time
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, NamedTuple, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, NamedTuple, Tuple
 from uuid import uuid4
 
-from .debuglog import debug
-from .paths import logs_dir, ensure_tree
+from .debuglog import debug, error, warning
+from .fsutil import try_lock, unlock
+from .paths import logs_dir, ensure_tree, run_dir
+
+if TYPE_CHECKING:
+    # imported lazily at runtime: the warm path must not load socket
+    import socket
 
 
 def _resolve_venv_paths() -> Optional[Tuple[Path, Path]]:
@@ -86,14 +95,52 @@ def _read_transcript(path: Path) -> Optional[str]:
     return None
 
 
-def _log_ps_failure(context: str, rc: int, lines: List[str], transcript: Path) -> None:
+def _log_ps_failure(context: str, rc: int, lines: List[str], transcript: Optional[Path]) -> None:
     tail = lines[-20:] if lines else []
     preview = " || ".join(tail) if tail else "<no-output>"
-    debug(
+    warning(
         f"PowerShell failure: context={context} rc={rc} transcript={transcript} output_tail={preview}"
     )
 
 
+def _finish_transcript(ts_path: Path, rc: int) -> None:
+    """Delete the transcript of a successful run; keep failures within retention.
+
+    Retention is applied after every run so a backlog left by earlier
+    failures also shrinks while runs succeed.
+    """
+    if rc == 0:
+        try:
+            ts_path.unlink()
+        except OSError:
+            pass
+    _prune_transcripts()
+
+
+def _prune_transcripts() -> None:
+    try:
+        from .config import log_settings
+
+        settings = log_settings()
+    except Exception as exc:
+        debug(f"Transcript retention settings unavailable: {exc}")
+        return
+    cutoff = time.time() - settings["transcript_keep_days"] * 86400
+    try:
+        files = sorted(
+            ((p.stat().st_mtime, p) for p in logs_dir().glob("ps-transcript-*.log")),
+            reverse=True,
+        )
+    except OSError:
+        return
+    for i, (mtime, p) in enumerate(files):
+        if i >= settings["max_transcripts"] or mtime < cutoff:
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+
 def _detect_ps_major(shell: List[str]) -> Optional[int]:
     try:
         proc = subprocess.run(
@@ -113,6 +160,368 @@ def _detect_ps_major(shell: List[str]) -> Optional[int]:
         return None
 
 
+# ---------------- persistent PowerShell host pool -----------------
+#
+# Opt-in (config.json "ps_pool.enabled" or NURO_PS_POOL=1). Each pool slot is a
+# long-lived pwsh process listening on a loopback TCP port. Its port and auth
+# token are published in ~/.nuro/run/pshost-<slot>.json. A client holds
+# pshost-<slot>.lock for the duration of one request; the worker runs each
+# request in a fresh runspace and streams JSON lines back:
+#   {"s":"start"} once the request is accepted
+#   {"s":"out"|"err","d":"<text>"} for each output record
+#   {"exit":<code>} when the script has finished; like the subprocess path, a
+#   script that runs `exit N` reports N
+# Runspaces have no console, so scripts that read input (and runs whose stdin
+# is piped) always get a fresh PowerShell process instead.
+# Workers exit by themselves after max_runs requests or idle_seconds of idling.
+
+_POOL_STARTUP_TIMEOUT = 15.0
+
+_POOL_SERVER_PS = r"""
+$ErrorActionPreference = 'Stop'
+$statePath = __STATE_PATH__
+$maxRuns = __MAX_RUNS__
+$idleSeconds = __IDLE_SECONDS__
+$token = [guid]::NewGuid().ToString('N')
+$utf8 = New-Object System.Text.UTF8Encoding($false)
+
+function Send-NuroFrame($writer, $frame) {
+  $writer.WriteLine(($frame | ConvertTo-Json -Compress))
+}
+
+function Send-NuroPending($ps, $out, $writer) {
+  foreach ($o in $out.ReadAll()) { Send-NuroFrame $writer @{ s = 'out'; d = [string]$o } }
+  foreach ($i in $ps.Streams.Information.ReadAll()) { Send-NuroFrame $writer @{ s = 'out'; d = [string]$i.MessageData } }
+  foreach ($w in $ps.Streams.Warning.ReadAll()) { Send-NuroFrame $writer @{ s = 'err'; d = 'WARNING: ' + [string]$w.Message } }
+  foreach ($e in $ps.Streams.Error.ReadAll()) { Send-NuroFrame $writer @{ s = 'err'; d = ($e | Out-String).TrimEnd() } }
+}
+
+function Invoke-NuroRequest($req, $writer) {
+  $keep = @('PSModulePath')
+  $wanted = @{}
+  foreach ($p in $req.env.PSObject.Properties) { $wanted[$p.Name] = [string]$p.Value }
+  foreach ($k in @([Environment]::GetEnvironmentVariables().Keys)) {
+    if (-not $wanted.ContainsKey($k) -and $keep -notcontains $k) { [Environment]::SetEnvironmentVariable($k, $null) }
+  }
+  foreach ($k in $wanted.Keys) { [Environment]::SetEnvironmentVariable($k, $wanted[$k]) }
+  [Environment]::CurrentDirectory = $req.cwd
+
+  $iss = [System.Management.Automation.Runspaces.InitialSessionState]::CreateDefault2()
+  if ($req.bypass) { try { $iss.ExecutionPolicy = 'Bypass' } catch {} }
+  $rs = [runspacefactory]::CreateRunspace($iss)
+  $ps = [powershell]::Create()
+  $code = 1
+  # The request runs from a script file so that `exit N` ends only that file
+  # and leaves N in $LASTEXITCODE, as it would end a pwsh process with N
+  $file = Join-Path ([System.IO.Path]::GetTempPath()) ('nuro-pool-' + [guid]::NewGuid().ToString('N') + '.ps1')
+  try {
+    [System.IO.File]::WriteAllText($file, [string]$req.script, (New-Object System.Text.UTF8Encoding($true)))
+    $rs.Open()
+    $ps.Runspace = $rs
+    $null = $rs.SessionStateProxy.Path.SetLocation([System.Management.Automation.WildcardPattern]::Escape($req.cwd))
+    $null = $ps.AddScript('$global:LASTEXITCODE = 0; & $args[0]; $global:__nuro_exit = $LASTEXITCODE').AddArgument($file)
+    $null = $ps.AddCommand('Out-String').AddParameter('Stream')
+    $inp = New-Object 'System.Management.Automation.PSDataCollection[psobject]'
+    $inp.Complete()
+    $out = New-Object 'System.Management.Automation.PSDataCollection[psobject]'
+    $async = $ps.BeginInvoke($inp, $out)
+    while (-not $async.IsCompleted) {
+      Send-NuroPending $ps $out $writer
+      Start-Sleep -Milliseconds 10
+    }
+    try { $ps.EndInvoke($async) } catch { Send-NuroFrame $writer @{ s = 'err'; d = [string]$_ } }
+    Send-NuroPending $ps $out $writer
+    $rc = $rs.SessionStateProxy.GetVariable('__nuro_code')
+    $exitCode = $rs.SessionStateProxy.GetVariable('__nuro_exit')
+    if ($null -ne $rc) { $code = [int]$rc }
+    elseif ($null -ne $exitCode) { $code = [int]$exitCode }
+    elseif (-not $ps.HadErrors) { $code = 0 }
+  } catch {
+    Send-NuroFrame $writer @{ s = 'err'; d = [string]$_ }
+  } finally {
+    $ps.Dispose()
+    $rs.Dispose()
+    Remove-Item -LiteralPath $file -Force -ErrorAction SilentlyContinue
+  }
+  Send-NuroFrame $writer @{ exit = $code }
+}
+
+$listener = New-Object System.Net.Sockets.TcpListener([System.Net.IPAddress]::Loopback, 0)
+$listener.Start()
+$state = @{ pid = $PID; port = $listener.LocalEndpoint.Port; token = $token } | ConvertTo-Json -Compress
+[System.IO.File]::WriteAllText($statePath + '.tmp', $state, $utf8)
+Move-Item -LiteralPath ($statePath + '.tmp') -Destination $statePath -Force
+
+$runs = 0
+$idle = [System.Diagnostics.Stopwatch]::StartNew()
+try {
+  while ($runs -lt $maxRuns) {
+    if (-not $listener.Pending()) {
+      if ($idle.Elapsed.TotalSeconds -ge $idleSeconds) { break }
+      Start-Sleep -Milliseconds 25
+      continue
+    }
+    $client = $listener.AcceptTcpClient()
+    try {
+      $stream = $client.GetStream()
+      $reader = New-Object System.IO.StreamReader($stream, $utf8)
+      $writer = New-Object System.IO.StreamWriter($stream, $utf8)
+      $writer.AutoFlush = $true
+      $req = $reader.ReadLine() | ConvertFrom-Json
+      if ($req.token -eq $token) {
+        $runs++
+        Send-NuroFrame $writer @{ s = 'start' }
+        Invoke-NuroRequest $req $writer
+      }
+    } catch {
+    } finally {
+      $client.Close()
+      $idle.Restart()
+    }
+  }
+} finally {
+  $listener.Stop()
+  Remove-Item -LiteralPath $statePath -Force -ErrorAction SilentlyContinue
+}
+"""
+
+
+def _pool_settings() -> Dict[str, Any]:
+    from .config import ps_pool_settings
+
+    try:
+        settings = ps_pool_settings()
+    except Exception as exc:
+        debug(f"ps_pool config unavailable: {exc}")
+        settings = ps_pool_settings({})
+    env = os.environ.get("NURO_PS_POOL", "").strip()
+    if env:
+        settings["enabled"] = env not in ("0", "false", "False", "no", "NO")
+    return settings
+
+
+def _read_pool_state(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8-sig"))
+    except Exception:
+        return None
+    if not isinstance(data, dict) or not data.get("port") or not data.get("token"):
+        return None
+    return data
+
+
+def _connect_pool_worker(state: Dict[str, Any]) -> Optional[socket.socket]:
+    import socket
+
+    try:
+        return socket.create_connection(("127.0.0.1", int(state["port"])), timeout=2)
+    except (OSError, ValueError):
+        return None
+
+
+def _spawn_pool_worker(state_path: Path, settings: Dict[str, Any]) -> None:
+    script = (
+        _POOL_SERVER_PS.replace("__STATE_PATH__", _ps_quote(str(state_path)))
+        .replace("__MAX_RUNS__", str(max(1, int(settings["max_runs"]))))
+        .replace("__IDLE_SECONDS__", str(max(1, int(settings["idle_seconds"]))))
+    )
+    import base64
+
+    encoded = base64.b64encode(script.encode("utf-16-le")).decode("ascii")
+    # The worker itself never gets -ExecutionPolicy Bypass: that would leak into
+    # every runspace. Bypass is applied per request for unsafe-dev-mode buckets.
+    cmd = _build_ps_shell() + ["-NoProfile", "-NonInteractive", "-EncodedCommand", encoded]
+    kwargs: Dict[str, Any] = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    debug(f"Starting PowerShell pool worker: state={state_path}")
+    subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        env=_ps_env_with_venv(),
+        **kwargs,
+    )
+
+
+def _pool_connect(slot: int, settings: Dict[str, Any]) -> Optional[Tuple[socket.socket, Dict[str, Any]]]:
+    """Connect to the worker of a locked slot, starting one when none is alive."""
+    state_path = run_dir() / f"pshost-{slot}.json"
+    state = _read_pool_state(state_path)
+    if state:
+        sock = _connect_pool_worker(state)
+        if sock:
+            return sock, state
+        debug(f"PowerShell pool worker unreachable; respawning slot={slot}")
+        try:
+            state_path.unlink()
+        except OSError:
+            pass
+    _spawn_pool_worker(state_path, settings)
+    deadline = time.monotonic() + _POOL_STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        state = _read_pool_state(state_path)
+        if state:
+            sock = _connect_pool_worker(state)
+            if sock:
+                return sock, state
+        time.sleep(0.05)
+    debug(f"PowerShell pool worker did not start in time: slot={slot}")
+    return None
+
+
+class _PoolWorkerLost(Exception):
+    """The worker failed after accepting a request: the script may have run."""
+
+
+def _pool_exchange(sock: socket.socket, request: Dict[str, Any], context: str) -> Optional[int]:
+    """Send one request and relay frames; None means the worker never accepted it.
+
+    Once the worker has sent "start" the script may have side effects, so any
+    failure from then on raises _PoolWorkerLost: the request must not be sent
+    to another worker or process.
+    """
+    started = False
+    try:
+        with sock:
+            sock.settimeout(None)
+            sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            captured_lines: List[str] = []
+            with sock.makefile("r", encoding="utf-8", errors="replace") as stream:
+                for raw in stream:
+                    try:
+                        frame = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if not isinstance(frame, dict):
+                        continue
+                    if "exit" in frame:
+                        rc = int(frame.get("exit") or 0)
+                        if rc != 0:
+                            _log_ps_failure(context=context, rc=rc, lines=captured_lines, transcript=None)
+                        debug(f"PowerShell pool request exited with code: {rc}")
+                        return rc
+                    kind = frame.get("s")
+                    if kind == "start":
+                        started = True
+                        continue
+                    text = str(frame.get("d") or "")
+                    captured_lines.extend(text.splitlines())
+                    if kind == "err":
+                        sys.stderr.write(text + "\n")
+                        sys.stderr.flush()
+                    else:
+                        print(text, flush=True)
+    except Exception as exc:
+        if started:
+            raise _PoolWorkerLost(f"{type(exc).__name__}: {exc}") from exc
+        if isinstance(exc, OSError):
+            debug(f"PowerShell pool request not accepted: {exc}")
+            return None
+        raise
+    if not started:
+        return None
+    raise _PoolWorkerLost("connection closed mid-request")
+
+
+# Console input that a pool runspace (which has no host UI) cannot serve
+_CONSOLE_INPUT_RE = re.compile(
+    r"Read-Host|Get-Credential|PromptFor(?:Choice|Credential)|ReadKey|UI\.ReadLine|\[Console\]::(?:In|Read)|\$input\b",
+    re.IGNORECASE,
+)
+
+
+def _needs_console_input(target: Path) -> bool:
+    """True when stdin is piped into nuro or the script may prompt the user.
+
+    Scanning the source is deliberately loose: a false positive only costs
+    the warm pool, a miss would break the script.
+    """
+    import stat
+
+    try:
+        mode = os.fstat(sys.stdin.fileno()).st_mode
+        if stat.S_ISFIFO(mode) or stat.S_ISREG(mode):
+            return True
+    except (AttributeError, OSError, ValueError):
+        pass
+    try:
+        text = target.read_text(encoding="utf-8-sig", errors="replace")
+    except OSError:
+        return False
+    return bool(_CONSOLE_INPUT_RE.search(text))
+
+
+def _mark_pool_slot_dead(slot: int) -> None:
+    """Forget a slot's worker so the next request starts a fresh one."""
+    state_path = run_dir() / f"pshost-{slot}.json"
+    state = _read_pool_state(state_path)
+    try:
+        state_path.unlink()
+    except OSError:
+        pass
+    if state and state.get("pid"):
+        import signal
+
+        try:
+            os.kill(int(state["pid"]), signal.SIGTERM)
+        except (OSError, ValueError):
+            pass
+
+
+def _pool_run(inner: str, ignore_execution_policy: bool, context: str) -> Optional[int]:
+    """Run a script body on a warm pool worker.
+
+    Returns the exit code, or None when the pool is disabled or unavailable and
+    the caller should fall back to a fresh PowerShell process.
+    """
+    settings = _pool_settings()
+    if not settings.get("enabled"):
+        return None
+    script = (
+        f"$LASTEXITCODE=0; $code=0; "
+        f"try {{ {inner} }} catch {{ $code=1; Write-Error $_ }}; "
+        f"$global:__nuro_code=$code"
+    )
+    request = {
+        "script": script,
+        "bypass": bool(ignore_execution_policy),
+        "cwd": os.getcwd(),
+        "env": _ps_env_with_venv(),
+    }
+    for slot in range(max(1, int(settings.get("size") or 1))):
+        fd = try_lock(run_dir() / f"pshost-{slot}.lock")
+        if fd is None:
+            continue
+        try:
+            conn = _pool_connect(slot, settings)
+            if not conn:
+                continue
+            sock, state = conn
+            request["token"] = state["token"]
+            debug(f"Dispatching to PowerShell pool: slot={slot} pid={state.get('pid')} {context}")
+            try:
+                rc = _pool_exchange(sock, request, context)
+            except _PoolWorkerLost as exc:
+                # the script may already have run: never dispatch it a second time
+                warning(f"PowerShell pool worker lost mid-request: slot={slot} error={exc}")
+                _mark_pool_slot_dead(slot)
+                _log_ps_failure(context=context, rc=1, lines=[str(exc)], transcript=None)
+                return 1
+            if rc is not None:
+                return rc
+        except Exception as exc:
+            warning(f"PowerShell pool unavailable: slot={slot} error={exc}")
+        finally:
+            unlock(fd)
+    debug("PowerShell pool busy or unavailable; falling back to a new process")
+    return None
+
+
 def run_ps_file(file: Path, args: Iterable[str]) -> int:
     shell = _build_ps_shell()
     qpath = _ps_quote(str(file))
@@ -143,7 +552,7 @@ def run_ps_file(file: Path, args: Iterable[str]) -> int:
             env=_ps_env_with_venv(),
         )
     except Exception as e:
-        debug(f"Failed to start PowerShell: {e}")
+        error(f"Failed to start PowerShell: {e}")
         raise
 
     captured_lines: List[str] = []
@@ -174,21 +583,25 @@ def run_ps_file(file: Path, args: Iterable[str]) -> int:
             transcript=ts_path,
         )
     debug(f"PowerShell exited with code: {rc}")
+    _finish_transcript(ts_path, rc)
     return rc
 
 
 def run_usage_for_ps1(target: Path, cmd_name: str, ignore_execution_policy: bool = False) -> int:
     """Run NuroUsage_<name> by dot-sourcing the target without creating a wrapper file."""
-    shell = _build_ps_shell(ignore_execution_policy)
     qtarget = _ps_quote(str(target))
-    ensure_tree()
-    ts_path = logs_dir() / f"ps-transcript-{uuid4().hex}.log"
-    qts = _ps_quote(str(ts_path))
     usage_fn = f"NuroUsage_{cmd_name}"
     inner = (
         f". {qtarget}; "
         f"if (Get-Command {usage_fn} -ErrorAction SilentlyContinue) {{ & {usage_fn} }} else {{ Write-Output 'usage unavailable' }}"
     )
+    pooled = _pool_run(inner, ignore_execution_policy, f"run_usage_for_ps1 cmd={cmd_name}")
+    if pooled is not None:
+        return pooled
+    shell = _build_ps_shell(ignore_execution_policy)
+    ensure_tree()
+    ts_path = logs_dir() / f"ps-transcript-{uuid4().hex}.log"
+    qts = _ps_quote(str(ts_path))
     ps_cmd = (
         f"$ts={qts}; try {{ Start-Transcript -Path $ts -Force | Out-Null }} catch {{}}; "
         f"$LASTEXITCODE=0; $code=0; "
@@ -208,7 +621,7 @@ def run_usage_for_ps1(target: Path, cmd_name: str, ignore_execution_policy: bool
             env=_ps_env_with_venv(),
         )
     except Exception as e:
-        debug(f"Failed to start PowerShell: {e}")
+        error(f"Failed to start PowerShell: {e}")
         raise
     captured_lines: List[str] = []
     captured_any = False
@@ -236,7 +649,110 @@ def run_usage_for_ps1(target: Path, cmd_name: str, ignore_execution_policy: bool
             transcript=ts_path,
         )
     debug(f"PowerShell exited with code: {rc}")
+    _finish_transcript(ts_path, rc)
     return rc
+
+
+def _classify_usage_failure(detail: str, ps_major: Optional[int]) -> str:
+    """Return 'ps5' when a usage failure looks like PowerShell 5 syntax trouble."""
+    lowered = detail.lower()
+    if ps_major is not None and ps_major <= 5:
+        ps5_markers = (
+            "parsererror",
+            "unexpected token",
+            "valuefromremainingarguments",
+            "the token '??'",
+        )
+        if any(marker in lowered for marker in ps5_markers):
+            return "ps5"
+    return "generic"
+
+
+_BATCH_MARKER = "@@NURO@@"
+_BATCH_VERSION_MARKER = "@@NURO-PS@@"
+
+
+def run_usage_batch_capture(
+    items: Iterable[Tuple[Path, str]],
+    ignore_execution_policy: bool = False,
+) -> Dict[str, UsageCaptureResult]:
+    """Capture NuroUsage_<name> for many PS1 files in a single PowerShell session.
+
+    Each file is dot-sourced inside its own script block so functions do not leak
+    between commands. Results are emitted as marker-prefixed JSON lines. A script
+    that calls exit (or crashes the session) ends the batch, so commands missing
+    from the output are left out of the result; capture those one by one.
+    """
+    pairs = [(Path(p), str(n)) for p, n in items]
+    if not pairs:
+        return {}
+    shell = _build_ps_shell(ignore_execution_policy)
+    entries = ", ".join(
+        f"@{{ n = {_ps_quote(n)}; p = {_ps_quote(str(p))} }}" for p, n in pairs
+    )
+    ps_cmd = (
+        f"$__nuro_items = @({entries}); "
+        f"Write-Output ('{_BATCH_VERSION_MARKER}' + $PSVersionTable.PSVersion.Major); "
+        "foreach ($__nuro_item in $__nuro_items) { "
+        "try { "
+        "$__nuro_text = & { param($__nuro_p, $__nuro_fn) . $__nuro_p; "
+        "if (Get-Command $__nuro_fn -ErrorAction SilentlyContinue) { & $__nuro_fn } else { 'usage unavailable' } "
+        "} $__nuro_item.p ('NuroUsage_' + $__nuro_item.n) *>&1 | Out-String; "
+        "$__nuro_res = @{ name = $__nuro_item.n; ok = $true; text = ([string]$__nuro_text).Trim() } "
+        "} catch { $__nuro_res = @{ name = $__nuro_item.n; ok = $false; text = ($_ | Out-String).Trim() } }; "
+        f"Write-Output ('{_BATCH_MARKER}' + ($__nuro_res | ConvertTo-Json -Compress)) "
+        "}"
+    )
+    results: Dict[str, UsageCaptureResult] = {}
+    cmd = shell + ["-NoProfile", "-Command", ps_cmd]
+    debug(f"Invoking PowerShell (batch capture): commands={[n for _, n in pairs]}")
+    try:
+        proc = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            env=_ps_env_with_venv(),
+        )
+        output = proc.stdout or ""
+    except Exception as e:
+        detail = str(e)
+        warning(f"run_usage_batch_capture failed: {detail}")
+        return {n: UsageCaptureResult("", "generic", detail) for _, n in pairs}
+
+    ps_major: Optional[int] = None
+    for line in output.splitlines():
+        line = line.strip()
+        if line.startswith(_BATCH_VERSION_MARKER):
+            try:
+                ps_major = int(line[len(_BATCH_VERSION_MARKER):])
+            except ValueError:
+                pass
+            continue
+        if not line.startswith(_BATCH_MARKER):
+            continue
+        try:
+            rec = json.loads(line[len(_BATCH_MARKER):])
+        except ValueError as exc:
+            debug(f"Batch usage record unreadable: {exc}")
+            continue
+        if not isinstance(rec, dict):
+            continue
+        name = str(rec.get("name") or "")
+        text = str(rec.get("text") or "")
+        if rec.get("ok"):
+            results[name] = UsageCaptureResult(text, None, None)
+        else:
+            detail = text or "usage capture failed with no output"
+            debug(f"Usage capture failed: cmd={name} ps_version={ps_major} detail={detail}")
+            results[name] = UsageCaptureResult("", _classify_usage_failure(detail, ps_major), detail)
+
+    missing = [n for _, n in pairs if n not in results]
+    if missing:
+        debug(f"Batch capture ended early (exit code {proc.returncode}): no result for {missing}")
+    return results
 
 
 def run_usage_for_ps1_capture(
@@ -277,35 +793,20 @@ def run_usage_for_ps1_capture(
         debug(
             f"Usage capture failed: cmd={cmd_name} ps_version={ps_major} detail={detail}"
         )
-        is_ps5_issue = False
-        lowered = detail.lower()
-        if ps_major is not None and ps_major <= 5:
-            ps5_markers = (
-                "parsererror",
-                "unexpected token",
-                "valuefromremainingarguments",
-                "the token '??'",
-            )
-            if any(marker in lowered for marker in ps5_markers):
-                is_ps5_issue = True
-
-        kind = "ps5" if is_ps5_issue else "generic"
-        return UsageCaptureResult("", kind, detail)
+        return UsageCaptureResult("", _classify_usage_failure(detail, ps_major), detail)
     except Exception as e:
         detail = str(e)
-        debug(f"run_usage_for_ps1_capture failed: {detail}")
+        warning(f"run_usage_for_ps1_capture failed: {detail}")
         return UsageCaptureResult("", "generic", detail)
 
 def run_cmd_for_ps1(target: Path, cmd_name: str, args: Iterable[str], ignore_execution_policy: bool = False) -> int:
     """Run NuroCmd_<name> by dot-sourcing the target without creating a wrapper file.
 
     CLI args are forwarded via PowerShell's automatic $args and splatted to the function.
+    When the PowerShell host pool is enabled the call is served by a warm worker,
+    unless the script may read console input.
     """
-    shell = _build_ps_shell(ignore_execution_policy)
     qtarget = _ps_quote(str(target))
-    ensure_tree()
-    ts_path = logs_dir() / f"ps-transcript-{uuid4().hex}.log"
-    qts = _ps_quote(str(ts_path))
     invoke_fn = f"NuroCmd_{cmd_name}"
     arg_list = list(args)
     qitems = ", ".join(_ps_quote(str(a)) for a in arg_list)
@@ -314,6 +815,16 @@ def run_cmd_for_ps1(target: Path, cmd_name: str, args: Iterable[str], ignore_exe
         f". {qtarget}; "
         f"if (Get-Command {invoke_fn} -ErrorAction SilentlyContinue) {{ & {invoke_fn} @NURO_ARGS }} else {{ Write-Error 'command entry not found' -ErrorAction Continue }}"
     )
+    if _needs_console_input(target):
+        debug(f"Script reads console input; not using the PowerShell pool: {target}")
+    else:
+        pooled = _pool_run(inner, ignore_execution_policy, f"run_cmd_for_ps1 cmd={cmd_name}")
+        if pooled is not None:
+            return pooled
+    shell = _build_ps_shell(ignore_execution_policy)
+    ensure_tree()
+    ts_path = logs_dir() / f"ps-transcript-{uuid4().hex}.log"
+    qts = _ps_quote(str(ts_path))
     ps_cmd = (
         f"$ts={qts}; try {{ Start-Transcript -Path $ts -Force | Out-Null }} catch {{}}; "
         f"$LASTEXITCODE=0; $code=0; "
@@ -333,7 +844,7 @@ def run_cmd_for_ps1(target: Path, cmd_name: str, args: Iterable[str], ignore_exe
             env=_ps_env_with_venv(),
         )
     except Exception as e:
-        debug(f"Failed to start PowerShell: {e}")
+        error(f"Failed to start PowerShell: {e}")
         raise
     captured_lines: List[str] = []
     captured_any = False
@@ -360,4 +871,5 @@ def run_cmd_for_ps1(target: Path, cmd_name: str, args: Iterable[str], ignore_exe
             transcript=ts_path,
         )
     debug(f"PowerShell exited with code: {rc}")
+    _finish_transcript(ts_path, rc)
     return rc
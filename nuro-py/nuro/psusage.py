@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Static reading of NuroUsage_<cmd> functions in .ps1 commands. Most usage
+# functions just emit a string literal; for those the text is taken from the
+# source directly and no PowerShell process is needed. Anything that would
+# need evaluation (variables, subexpressions, command calls) makes the
+# extractor give up so the caller falls back to running the function.
+
+_STR = "str"
+_WORD = "word"
+_NL = "nl"
+_DYNAMIC = "dyn"
+
+_PUNCT = "{}();,"
+_WORD_END = set(" \t\r\n'\"{}();,|&<>#`‘’“”")
+_VAR_START = re.compile(r"[A-Za-z0-9_:?^${(]")
+_BACKTICK = {"0": "\0", "a": "\a", "b": "\b", "e": "\x1b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+
+Token = Tuple[str, str]
+
+
+class _Dynamic(Exception):
+    """The source needs evaluation (expandable string with variables, ...)."""
+
+
+def _expand_dq(body: str) -> str:
+    # contents of "..." or @"..."@ without variables: only escapes to resolve
+    out: List[str] = []
+    i = 0
+    while i < len(body):
+        ch = body[i]
+        if ch == "`" and i + 1 < len(body):
+            nxt = body[i + 1]
+            if nxt == "u" and body.startswith("{", i + 2):
+                end = body.find("}", i + 3)
+                if end < 0:
+                    raise _Dynamic()
+                out.append(chr(int(body[i + 3 : end], 16)))
+                i = end + 1
+                continue
+            out.append(_BACKTICK.get(nxt, nxt))
+            i += 2
+            continue
+        if ch == "$" and i + 1 < len(body) and _VAR_START.match(body[i + 1]):
+            raise _Dynamic()
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _tokenize(src: str) -> List[Token]:
+    """Split PowerShell source into the few token kinds the extractor needs.
+
+    Expandable strings that reference variables become _DYNAMIC tokens, they
+    are only an error when they appear inside the usage function.
+    """
+    toks: List[Token] = []
+    i, n = 0, len(src)
+    while i < n:
+        ch = src[i]
+        if ch in " \t\r":
+            i += 1
+        elif ch == "`" and src.startswith("\n", i + 1):
+            i += 2  # line continuation
+        elif ch == "\n":
+            toks.append((_NL, ch))
+            i += 1
+        elif src.startswith("<#", i):
+            end = src.find("#>", i + 2)
+            i = n if end < 0 else end + 2
+        elif ch == "#":
+            end = src.find("\n", i)
+            i = n if end < 0 else end
+        elif src.startswith("@'", i) or src.startswith('@"', i):
+            quote = src[i + 1]
+            start = src.find("\n", i + 2)
+            if start < 0 or src[i + 2 : start].strip():
+                # not a here-string header; treat '@' like any other word
+                toks.append((_WORD, "@"))
+                i += 1
+                continue
+            m = re.compile(r"\r?\n" + quote + "@").search(src, start)
+            end = n if m is None else m.start()
+            body = src[start + 1 : end]
+            if body.endswith("\r"):
+                body = body[:-1]
+            i = n if m is None else m.end()
+            if quote == "'":
+                toks.append((_STR, body))
+            else:
+                try:
+                    toks.append((_STR, _expand_dq(body)))
+                except _Dynamic:
+                    toks.append((_DYNAMIC, body))
+        elif ch in "'‘’":
+            buf: List[str] = []
+            i += 1
+            while i < n:
+                c = src[i]
+                if c in "'‘’":
+                    if i + 1 < n and src[i + 1] in "'‘’":
+                        buf.append(c)
+                        i += 2
+                        continue
+                    i += 1
+                    break
+                buf.append(c)
+                i += 1
+            toks.append((_STR, "".join(buf)))
+        elif ch in '"“”':
+            j = i + 1
+            while j < n:
+                c = src[j]
+                if c == "`":
+                    j += 2
+                    continue
+                if c in '"“”':
+                    if j + 1 < n and src[j + 1] in '"“”':
+                        j += 2
+                        continue
+                    break
+                j += 1
+            body = re.sub(r'["“”]{2}', '"', src[i + 1 : j])
+            i = j + 1
+            try:
+                toks.append((_STR, _expand_dq(body)))
+            except (_Dynamic, ValueError):
+                toks.append((_DYNAMIC, body))
+        elif ch in _PUNCT:
+            toks.append((ch, ch))
+            i += 1
+        else:
+            j = i + 1
+            while j < n and src[j] not in _WORD_END:
+                j += 1
+            toks.append((_WORD, src[i:j]))
+            i = j
+    return toks
+
+
+def _function_body(toks: List[Token], fn: str) -> Optional[List[Token]]:
+    """Tokens between the braces of `function <fn>`; None unless defined exactly once."""
+    want = fn.lower()
+    found: Optional[List[Token]] = None
+    i = 0
+    while i < len(toks):
+        kind, text = toks[i]
+        if not (kind == _WORD and text.lower() == "function" and i + 1 < len(toks)):
+            i += 1
+            continue
+        name = toks[i + 1][1].lower()
+        # scope modifiers (global:, script:) do not change the name
+        if toks[i + 1][0] != _WORD or name.split(":")[-1] != want:
+            i += 1
+            continue
+        j = i + 2
+        while j < len(toks) and toks[j][0] == _NL:
+            j += 1
+        if j >= len(toks) or toks[j][0] != "{":
+            return None  # parameter list or something unexpected
+        depth, k = 0, j
+        while k < len(toks):
+            if toks[k][0] == "{":
+                depth += 1
+            elif toks[k][0] == "}":
+                depth -= 1
+                if depth == 0:
+                    break
+            k += 1
+        if depth != 0 or found is not None:
+            return None
+        found = toks[j + 1 : k]
+        i = k + 1
+    return found
+
+
+def _literal_output(body: List[Token]) -> Optional[List[str]]:
+    """Strings a function body writes to the pipeline, if it only emits literals."""
+    out: List[str] = []
+    i = 0
+    while i < len(body):
+        kind, text = body[i]
+        if kind in (_NL, ";"):
+            i += 1
+            continue
+        stop = False
+        if kind == _WORD and text.lower() in ("return", "write-output", "echo"):
+            stop = text.lower() == "return"
+            i += 1
+        values: List[str] = []
+        while True:
+            if i >= len(body) or body[i][0] != _STR:
+                if stop and not values and (i >= len(body) or body[i][0] in (_NL, ";")):
+                    return out  # bare return
+                return None
+            values.append(body[i][1])
+            i += 1
+            if i < len(body) and body[i][0] == ",":
+                i += 1
+                while i < len(body) and body[i][0] == _NL:
+                    i += 1
+                continue
+            break
+        if i < len(body) and body[i][0] not in (_NL, ";"):
+            return None
+        out.extend(values)
+        if stop:
+            return out
+    return out
+
+
+def extract_static_usage(source: str, cmd: str) -> Optional[str]:
+    """Usage text of NuroUsage_<cmd> when its body is made only of string literals.
+
+    Mirrors what `& NuroUsage_<cmd> | Out-String` followed by Trim() yields.
+    Returns None when the function is missing, defined more than once or
+    computes its output; callers then run it in PowerShell.
+    """
+    if source.startswith("﻿"):
+        source = source[1:]
+    body = _function_body(_tokenize(source), f"NuroUsage_{cmd}")
+    if body is None:
+        return None
+    values = _literal_output(body)
+    if values is None:
+        return None
+    return "\n".join(v.replace("\r\n", "\n") for v in values).strip()
+
+
+def static_usage_for_ps1(path: Path, cmd: str) -> Optional[str]:
+    try:
+        source = path.read_text(encoding="utf-8-sig", errors="replace")
+    except OSError:
+        return None
+    return extract_static_usage(source, cmd)
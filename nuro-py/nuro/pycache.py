@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import importlib.util
+import marshal
+from pathlib import Path
+from types import CodeType
+
+from .debuglog import debug
+from .fsutil import atomic_write_bytes
+
+# Bytecode for cached .py commands, stored the standard way next to the script
+# (<dir>/__pycache__/<cmd>.<tag>.pyc) as a checked-hash pyc (PEP 552): it is
+# valid exactly while the source hash matches, whatever the file mtimes say.
+
+_FLAG_CHECKED_HASH = 0b11
+
+
+def cache_path(path: Path) -> Path:
+    return Path(importlib.util.cache_from_source(str(path)))
+
+
+def _compile_and_store(path: Path, source: bytes, source_hash: bytes) -> CodeType:
+    code = compile(source, str(path), "exec", dont_inherit=True)
+    data = importlib.util.MAGIC_NUMBER + _FLAG_CHECKED_HASH.to_bytes(4, "little") + source_hash + marshal.dumps(code)
+    pyc = cache_path(path)
+    try:
+        pyc.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(pyc, data)
+    except OSError as exc:
+        debug(f"Failed to write bytecode for {path}: {exc}")
+    return code
+
+
+def load_code(path: Path) -> CodeType:
+    """Return the code object for path, from its pyc when the source hash matches.
+
+    A missing or stale pyc is rebuilt; SyntaxError propagates like a normal run.
+    """
+    source = path.read_bytes()
+    source_hash = importlib.util.source_hash(source)
+    try:
+        data = cache_path(path).read_bytes()
+    except OSError:
+        data = b""
+    if (
+        len(data) > 16
+        and data[:4] == importlib.util.MAGIC_NUMBER
+        and int.from_bytes(data[4:8], "little") & 0b1
+        and data[8:16] == source_hash
+    ):
+        try:
+            return marshal.loads(data[16:])
+        except (EOFError, ValueError, TypeError):
+            pass
+    debug(f"Compiling bytecode for {path}")
+    return _compile_and_store(path, source, source_hash)
+
+
+def compile_cached(path: Path) -> bool:
+    """Make sure a freshly fetched script has a current pyc; False on errors."""
+    try:
+        load_code(path)
+        return True
+    except (OSError, SyntaxError, ValueError) as exc:
+        debug(f"Bytecode compile skipped for {path}: {exc}")
+        return False
+
+
+def invalidate(path: Path) -> None:
+    try:
+        cache_path(path).unlink()
+    except OSError:
+        pass
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from .paths import buckets_path, ensure_tree, nuro_home
 from .config import load_app_config, official_bucket_base
+from .fsutil import atomic_write_text
+from . import resolution
 
 
 def _normalize_ref(ref: Optional[str]) -> str:
@@ -93,7 +94,7 @@ def load_registry() -> Dict[str, Any]:
     p = buckets_path()
     if not p.exists():
         obj = _default_registry()
-        p.write_text(json.dumps(obj, indent=2, ensure_ascii=False), encoding="utf-8")
+        atomic_write_text(p, json.dumps(obj, indent=2, ensure_ascii=False))
         return obj
     try:
         raw = p.read_text(encoding="utf-8")
@@ -102,7 +103,7 @@ def load_registry() -> Dict[str, Any]:
     except Exception:
         # fallback to default and overwrite broken file
         obj = _default_registry()
-        p.write_text(json.dumps(obj, indent=2, ensure_ascii=False), encoding="utf-8")
+        atomic_write_text(p, json.dumps(obj, indent=2, ensure_ascii=False))
         return obj
 
 
@@ -110,7 +111,8 @@ def save_registry(obj: Dict[str, Any]) -> None:
     ensure_tree()
     p = buckets_path()
     normalized = _normalize_registry(obj)
-    p.write_text(json.dumps(normalized, indent=2, ensure_ascii=False), encoding="utf-8")
+    atomic_write_text(p, json.dumps(normalized, indent=2, ensure_ascii=False))
+    resolution.invalidate()
 
 
 
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+
+from .debuglog import debug
+from .fsutil import atomic_write_text
+from .paths import buckets_path, cache_dir
+
+
+# Persisted map from the name typed on the CLI ("cmd" or "bucket:cmd") to the
+# cached script that run_command resolved for it. The whole index is dropped
+# whenever buckets.json changes (tracked by its mtime), so a warm lookup costs
+# one read of the index plus a stat of buckets.json and of the target.
+
+
+class Resolution(NamedTuple):
+    path: Path
+    ext: str
+    bucket: Optional[str]
+    unsafe: bool
+    max_age: Optional[float] = None
+
+
+def _index_path() -> Path:
+    return cache_dir() / "resolve-index.json"
+
+
+def _registry_mtime() -> Optional[int]:
+    try:
+        return buckets_path().stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load() -> Dict[str, Any]:
+    try:
+        data = json.loads(_index_path().read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save(data: Dict[str, Any]) -> None:
+    p = _index_path()
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(p, json.dumps(data, ensure_ascii=False))
+    except Exception as exc:
+        debug(f"Failed to write resolution index: {exc}")
+
+
+def _entries_for_current_registry() -> Dict[str, Any]:
+    data = _load()
+    entries = data.get("entries")
+    if data.get("registry_mtime") != _registry_mtime() or not isinstance(entries, dict):
+        return {}
+    return entries
+
+
+def lookup(name: str) -> Optional[Resolution]:
+    data = _load()
+    entry = (data.get("entries") or {}).get(name) if isinstance(data.get("entries"), dict) else None
+    if not isinstance(entry, dict):
+        return None
+    if data.get("registry_mtime") != _registry_mtime():
+        debug("Resolution index stale (buckets.json changed)")
+        return None
+    path = Path(str(entry.get("path") or ""))
+    if not path.is_file():
+        return None
+    max_age = entry.get("max_age")
+    return Resolution(
+        path,
+        str(entry.get("ext") or ""),
+        entry.get("bucket"),
+        bool(entry.get("unsafe")),
+        float(max_age) if isinstance(max_age, (int, float)) else None,
+    )
+
+
+def record(name: str, path: Path, ext: str, bucket: Optional[Dict[str, Any]]) -> None:
+    from .revalidate import bucket_max_age
+
+    entries = _entries_for_current_registry()
+    entries[name] = {
+        "path": str(path),
+        "ext": ext,
+        "bucket": bucket.get("name") if isinstance(bucket, dict) else None,
+        "unsafe": bool(isinstance(bucket, dict) and bucket.get("unsafe-dev-mode")),
+        "max_age": bucket_max_age(bucket),
+    }
+    _save({"registry_mtime": _registry_mtime(), "entries": entries})
+
+
+def forget(cmd: str) -> None:
+    """Drop every entry for cmd (plain and bucket-qualified) after its cache changed."""
+    entries = _entries_for_current_registry()
+    keep = {k: v for k, v in entries.items() if k.split(":", 1)[-1] != cmd}
+    if len(keep) != len(entries):
+        _save({"registry_mtime": _registry_mtime(), "entries": keep})
+
+
+def invalidate() -> None:
+    try:
+        _index_path().unlink()
+    except OSError:
+        pass
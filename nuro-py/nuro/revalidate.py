@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .debuglog import debug, info, warning
+from .fsutil import lock_path, try_lock, unlock
+
+# Stale-while-revalidate for buckets that track a branch. A bucket entry may
+# set "max-age" (seconds): a cached script older than that still runs at
+# once, and a detached `python -m nuro.revalidate` brings it up to date for
+# the next call. The foreground only reads the script's fetch sidecar; the
+# fetch machinery is loaded by the background process alone.
+
+
+def bucket_max_age(bucket: Optional[Dict[str, Any]]) -> Optional[float]:
+    """The bucket's max-age in seconds; None when unset or when it is pinned.
+
+    Caches of buckets pinned to a commit never change (see nuro.pincache).
+    """
+    if not isinstance(bucket, dict) or bucket.get("max-age") is None:
+        return None
+    from .pincache import immutable_sha
+
+    if immutable_sha(bucket) is not None:
+        return None
+    try:
+        return max(0.0, float(bucket["max-age"]))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
+def _meta_path(path: Path) -> Path:
+    return path.with_name(path.name + ".meta.json")
+
+
+def _read_meta(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(_meta_path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def is_stale(path: Path, max_age: float) -> bool:
+    """True when path was last checked (or last attempted) over max_age seconds ago.
+
+    Scripts without fetch metadata (local buckets) are never stale.
+    """
+    meta = _read_meta(path)
+    if not meta or not meta.get("url"):
+        return False
+    try:
+        last = max(float(meta.get("checked_at") or 0), float(meta.get("attempted_at") or 0))
+    except (TypeError, ValueError):
+        last = 0.0
+    return time.time() - last > max_age
+
+
+def _lock_key(path: Path) -> str:
+    return f"revalidate:{path}"
+
+
+def schedule_if_stale(path: Path, bucket_name: Optional[str], max_age: Optional[float]) -> bool:
+    """Start a background revalidation of path when it is past max_age.
+
+    Returns True when a worker was started. Never blocks on the network; a
+    revalidation already in progress for the same file is not duplicated.
+    """
+    if max_age is None or not is_stale(path, max_age):
+        return False
+    fd = try_lock(lock_path(_lock_key(path)))
+    if fd is None:
+        debug(f"Revalidation already running for {path}")
+        return False
+    unlock(fd)
+    env = dict(os.environ)
+    # the worker must import this very package, installed or not
+    pkg_root = str(Path(__file__).resolve().parents[1])
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (pkg_root, env.get("PYTHONPATH", "")) if p)
+    kwargs: Dict[str, Any] = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    info(f"Cached script past max-age; revalidating in background: {path}")
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", "nuro.revalidate", str(path), bucket_name or ""],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            env=env,
+            **kwargs,
+        )
+    except OSError as exc:
+        warning(f"Could not start background revalidation for {path}: {exc}")
+        return False
+    return True
+
+
+def revalidate(path: Path, bucket_name: str) -> Optional[bool]:
+    """Revalidate one cached script (the background worker's job).
+
+    Returns whether it changed, None when another worker holds it or it has
+    no fetch metadata. A changed script gets a fresh pyc and loses its cached
+    usage text; a script removed upstream is dropped from the resolution index.
+    """
+    from . import pycache, resolution
+    from .buckets import _write_fetch_meta, read_fetch_meta, revalidate_cached
+    from .paths import cache_dir
+
+    fd = try_lock(lock_path(_lock_key(path)))
+    if fd is None:
+        return None
+    try:
+        meta = read_fetch_meta(path)
+        if meta is None:
+            return None
+        # throttle retries while the source is unreachable
+        meta["attempted_at"] = time.time()
+        _write_fetch_meta(path, meta)
+        try:
+            changed = revalidate_cached(path)
+        except Exception as exc:
+            warning(f"Background revalidation failed for {path}: {exc}")
+            return False
+        debug(f"Background revalidation of {path}: {'updated' if changed else 'not modified'}")
+        if changed:
+            cmd = path.stem
+            if path.suffix == ".py":
+                if path.exists():
+                    pycache.compile_cached(path)
+                else:
+                    pycache.invalidate(path)
+            if bucket_name:
+                try:
+                    (cache_dir() / "usage" / bucket_name / f"{cmd}.txt").unlink()
+                except OSError:
+                    pass
+            if not path.exists():
+                resolution.forget(cmd)
+        return bool(changed)
+    finally:
+        unlock(fd)
+
+
+def main(args: List[str]) -> int:
+    if not args:
+        sys.stderr.write("usage: python -m nuro.revalidate <cached script> [bucket]\n")
+        return 2
+    result = revalidate(Path(args[0]), args[1] if len(args) > 1 else "")
+    return 0 if result is not False else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -3,18 +3,23 @@ from __future__ import annotations
 import os
 from pathlib import Path
 import sys
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
 import subprocess
-import ast
-import re
-from importlib import metadata as _im
 import json
-from .debuglog import debug
+import time
+from .debuglog import debug, flush as flush_log, info, warning
 from .paths import ensure_tree, cmds_cache_base, cache_dir
 from .registry import load_registry
-from .buckets import resolve_cmd_source_with_meta, fetch_to
 from .pshost import run_ps_file, run_usage_for_ps1, run_cmd_for_ps1
+from . import resolution
+
+if TYPE_CHECKING:
+    # imported lazily at runtime: the warm path must not load concurrent.futures
+    from concurrent.futures import Future
+
+# nuro.buckets (urllib/http), ast and importlib.metadata are imported where they
+# are used so a cached command run does not load the fetch machinery.
 
 
 def ensure_nuro_tree() -> None:
@@ -82,7 +87,7 @@ def _local_paths_for_ext(
 
 
 def _bucket_resolution_order(cmd: str, reg: Dict, bucket_hint: Optional[str]) -> List[Dict]:
-    # determine fetch order: bucket_hint -> pin -> priority
+    # determine fetch order: bucket_hint -> pin -> priority, each bucket once
     order: List[Dict] = []  # bucket dicts in resolution order
     buckets_by_name = {b["name"]: b for b in reg.get("buckets", [])}
     if bucket_hint and bucket_hint in buckets_by_name:
@@ -97,167 +102,438 @@ def _bucket_resolution_order(cmd: str, reg: Dict, bucket_hint: Optional[str]) ->
     for b in sorted_buckets:
         if (bucket_hint and b["name"] == bucket_hint) or (pinned and b["name"] == pinned):
             # already included
-            pass
+            continue
         order.append(b)
     return order
 
+
+# Read timeout of a single HEAD probe
+_PROBE_TIMEOUT = 5.0
+# Longest wait for one candidate's answer (its manifest or listing lookup included)
+_PROBE_WAIT = 60.0
+
+
+def _probe_workers() -> int:
+    try:
+        from .config import load_app_config
+
+        return max(1, int(load_app_config().get("refresh_workers") or 8))
+    except Exception:
+        return 8
+
+
+def _start_probes(jobs: List[Tuple[Future, Tuple]], workers: int, stop) -> None:
+    """Run _probe_candidate(*args) for each (future, args) job, in order, at most workers at once.
+
+    A feeder thread takes a slot before it starts each probe thread, so no
+    more than workers probes exist at a time. A probe that does not rule its
+    candidate out sets stop: everything after it has lower priority, so the
+    feeder cancels the remaining futures instead of starting them (the caller
+    sets stop too once it is done). Daemon threads because a losing probe
+    still in flight must not keep a one-shot nuro alive at exit.
+    """
+    import threading
+
+    slots = threading.BoundedSemaphore(workers)
+
+    def probe(fut, args) -> None:
+        try:
+            result = _probe_candidate(*args)
+        except BaseException as exc:
+            fut.set_exception(exc)
+        else:
+            if result[0] is not False:
+                stop.set()
+            fut.set_result(result)
+        finally:
+            slots.release()
+
+    def feed() -> None:
+        for i, (fut, args) in enumerate(jobs):
+            slots.acquire()
+            if stop.is_set():
+                slots.release()
+                for rest, _ in jobs[i:]:
+                    rest.cancel()
+                return
+            if not fut.set_running_or_notify_cancel():
+                slots.release()
+                continue
+            threading.Thread(target=probe, args=(fut, args), name="nuro-probe", daemon=True).start()
+
+    threading.Thread(target=feed, name="nuro-probe-feed", daemon=True).start()
+
+
+def _probe_candidate(
+    b: Dict, cmd: str, ext: str, bucket_lock
+) -> Tuple[Optional[bool], Optional[Dict[str, str]]]:
+    """Whether bucket b has cmd.ext, and the source to fetch it from.
+
+    (True, src): it exists. (False, src): the host answered 404.
+    (None, src): unknown, a GET has to tell. (False, None): not there
+    without a definite answer worth remembering (manifest, listing, local
+    bucket, unreachable host).
+    """
+    from .buckets import list_bucket_commands, probe_source, resolve_cmd_source_with_meta
+    from .manifest import entry_source, manifest_entries
+
+    # the manifest and GitHub listing are shared by a bucket's extensions: fetch them once
+    with bucket_lock:
+        listed = manifest_entries(b, cmd)
+        if listed is not None:
+            entry = next((e for e in listed if e.ext == ext), None)
+            return (True, entry_source(b, entry)) if entry else (False, None)
+        try:
+            known = list_bucket_commands(b)
+        except Exception as exc:
+            debug(f"Listing unavailable for bucket={b.get('name')}: {exc}")
+            known = None
+        if known is not None and (cmd.lower(), ext) not in {(c.lower(), e) for c, e in known}:
+            # a listing (GitHub contents or local cmds/) is authoritative
+            return False, None
+        src = resolve_cmd_source_with_meta(b, cmd, ext=ext)
+    if src.get("kind") == "local":
+        return (True, src) if Path(src["path"]).exists() else (False, None)
+    try:
+        return probe_source(src, timeout=_PROBE_TIMEOUT), src
+    except OSError as exc:
+        debug(f"Probe failed bucket={b.get('name')} cmd={cmd} ext={ext}: {exc}")
+        return False, None
+
+
 def _try_fetch_any(
     cmd: str, reg: Dict, bucket_hint: Optional[str]
 ) -> Optional[Tuple[Path, str, Optional[Dict]]]:
+    """Fetch cmd from the first bucket (hint -> pin -> priority) that has it.
+
+    The (bucket, ext) candidates are probed concurrently, in resolution
+    order, up to refresh_workers at a time: manifest or listing lookup, and
+    a HEAD request only for hosts that cannot be listed. A miss costs about
+    one round trip instead of one per candidate. Answers are taken strictly
+    in resolution order. The highest-priority hit wins even when a lower one
+    answers first, and once any probe hits, no lower-priority probe is
+    started.
+    """
+    import threading
+    from concurrent.futures import CancelledError, Future, TimeoutError as FutureTimeout
+
+    from .buckets import HttpError, fetch_source
+    from .fsutil import file_lock
+    from .negcache import NegativeCache
+    from . import pincache
+
     exts = ["ps1", "py", "sh"]
-    for b in _bucket_resolution_order(cmd, reg, bucket_hint):
-        bname = str(b.get("name", ""))
-        debug(f"Trying bucket '{bname}' for cmd={cmd}")
-        for ext in exts:
-            dest = cmds_cache_base() / bname / f"{cmd}.{ext}"
-            if dest.exists():
+    missing = NegativeCache()
+    plan: List[Tuple[Dict, str, Path, Optional[Future], Tuple]] = []
+    jobs: List[Tuple[Future, Tuple]] = []
+    stop = threading.Event()
+    try:
+        for b in _bucket_resolution_order(cmd, reg, bucket_hint):
+            bname = str(b.get("name", ""))
+            bucket_lock = threading.Lock()
+            for ext in exts:
+                dest = cmds_cache_base() / bname / f"{cmd}.{ext}"
+                if dest.exists():
+                    plan.append((b, ext, dest, None, ()))
+                    continue
+                if missing.is_missing(b, cmd, ext):
+                    debug(f"Negative cache hit: bucket={bname} cmd={cmd} ext={ext}")
+                    continue
+                args = (b, cmd, ext, bucket_lock)
+                job: Future = Future()
+                plan.append((b, ext, dest, job, args))
+                jobs.append((job, args))
+        # a cached file at the top of the order wins without asking anyone
+        if jobs and plan[0][3] is not None:
+            debug(f"Probing {len(jobs)} candidates for cmd={cmd}")
+            _start_probes(jobs, _probe_workers(), stop)
+
+        for b, ext, dest, fut, args in plan:
+            bname = str(b.get("name", ""))
+            if fut is None:
                 debug(f"Fetch fallback found cached file: {dest}")
+                # the file showed up (sync, another process): a stale "missing" no longer holds
+                missing.discard(b, cmd, ext)
                 return dest, ext, b
-            src = resolve_cmd_source_with_meta(b, cmd, ext=ext)
-            debug(f"Attempting fetch: bucket={bname} cmd={cmd} ext={ext} dest={dest} src={src}")
-            if src.get("kind") == "local":
-                local_path = Path(src["path"])  # may be absolute
-                if local_path.exists():
-                    dest.parent.mkdir(parents=True, exist_ok=True)
-                    try:
-                        data = local_path.read_bytes()
-                        dest.write_bytes(data)
-                        debug(f"Copied local command from {local_path} -> {dest}")
-                        return dest, ext, b
-                    except Exception as copy_err:
-                        debug(f"Failed to copy local command from {local_path}: {copy_err}")
-                        continue
-            else:
+            try:
+                try:
+                    found, src = fut.result(timeout=_PROBE_WAIT)
+                except CancelledError:
+                    # skipped after a higher-priority hit whose fetch then failed
+                    found, src = _probe_candidate(*args)
+            except FutureTimeout:
+                debug(f"Probe timed out bucket={bname} cmd={cmd} ext={ext}")
+                continue
+            except Exception as probe_err:
+                debug(f"Probe error bucket={bname} cmd={cmd} ext={ext}: {probe_err}")
+                continue
+            if found is False:
+                if src is not None:
+                    missing.add(b, cmd, ext)
+                continue
+            assert src is not None
+            # Single flight across processes: one fetches, the others wait and reuse its file
+            with file_lock(str(cmds_cache_base() / bname / cmd)) as waited:
+                if waited:
+                    debug(f"Waited for concurrent fetch: bucket={bname} cmd={cmd}")
+                if dest.exists():
+                    missing.discard(b, cmd, ext)
+                    return dest, ext, b
+                debug(f"Attempting fetch: bucket={bname} cmd={cmd} ext={ext} dest={dest} src={src}")
                 try:
-                    dest.parent.mkdir(parents=True, exist_ok=True)
-                    fetch_to(dest, src["url"])
-                    debug(f"Fetched remote command for cmd={cmd} ext={ext} bucket={bname} -> {dest}")
+                    fetch_source(src, dest)
+                    missing.discard(b, cmd, ext)
+                    pincache.record(b, [dest])
+                    debug(f"Fetched command for cmd={cmd} ext={ext} bucket={bname} -> {dest}")
+                    if ext == "py":
+                        from . import pycache
+
+                        pycache.compile_cached(dest)
                     return dest, ext, b
                 except Exception as fetch_err:
                     debug(f"Fetch error bucket={bname} cmd={cmd} ext={ext}: {fetch_err}")
+                    # only a definite "not there" is remembered, never a network failure
+                    if isinstance(fetch_err, HttpError) and fetch_err.code == 404:
+                        missing.add(b, cmd, ext)
                     continue
-    return None
+        return None
+    finally:
+        stop.set()
+        for fut, _ in jobs:
+            fut.cancel()
+        missing.save()
+
+
+# Runs a .py command in a child interpreter: main(argv) or main(), exit code from its result.
+# The module body comes from the checked-hash pyc nuro.pycache maintains (the
+# child's own cache tag, so another interpreter version builds its own pyc once).
+_PY_BOOTSTRAP = """\
+import importlib.util as u, inspect, marshal, os, sys
+p = %r
+s = open(p, 'rb').read()
+h = u.source_hash(s)
+c = u.cache_from_source(p)
+try:
+    d = open(c, 'rb').read()
+except OSError:
+    d = b''
+code = None
+if len(d) > 16 and d[:4] == u.MAGIC_NUMBER and d[4] & 1 and d[8:16] == h:
+    try:
+        code = marshal.loads(d[16:])
+    except (EOFError, ValueError, TypeError):
+        pass
+if code is None:
+    code = compile(s, p, 'exec', dont_inherit=True)
+    try:
+        os.makedirs(os.path.dirname(c), exist_ok=True)
+        t = '%%s.%%d.tmp' %% (c, os.getpid())
+        with open(t, 'wb') as w:
+            w.write(u.MAGIC_NUMBER + (3).to_bytes(4, 'little') + h + marshal.dumps(code))
+        os.replace(t, c)
+    except OSError:
+        pass
+sys.argv[0] = p
+ns = {'__name__': '<run_path>', '__file__': p, '__cached__': c, '__doc__': None,
+      '__loader__': None, '__package__': None, '__spec__': None}
+exec(code, ns)
+f = ns.get('main')
+if callable(f):
+    try:
+        sig = inspect.signature(f)
+        rc = f(sys.argv[1:]) if len(sig.parameters) >= 1 else f()
+    except TypeError:
+        rc = f()
+    sys.exit(int(rc or 0))
+sys.exit(0)
+"""
 
 
+def _is_current_interpreter(exe: str) -> bool:
+    """True when exe is the interpreter running nuro."""
+    import shutil
+
+    target = shutil.which(exe) or exe
+    try:
+        return os.path.normcase(os.path.abspath(target)) == os.path.normcase(os.path.abspath(sys.executable))
+    except (OSError, ValueError):
+        return False
+
+
+def _can_run_inprocess(exe: str) -> bool:
+    """True when exe is the interpreter running nuro (NURO_PY_SUBPROCESS=1 opts out)."""
+    if os.environ.get("NURO_PY_SUBPROCESS", "").strip() not in ("", "0"):
+        return False
+    return _is_current_interpreter(exe)
+
+
+def _exit_code(code: object) -> int:
+    # Same mapping the interpreter applies to SystemExit
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    try:
+        sys.stderr.write(f"{code}\n")
+    except Exception:
+        pass
+    return 1
+
+
+def _run_py_inprocess(path: Path, args: List[str]) -> int:
+    """Run a .py command like _PY_BOOTSTRAP does, inside this interpreter.
+
+    The module body comes from the command's checked-hash pyc (see
+    nuro.pycache), so an unchanged script is not recompiled on every run.
+    """
+    import builtins
+    import inspect
+    import traceback
+    from . import pycache
+
+    saved_argv, saved_path = sys.argv, list(sys.path)
+    # mirror `python -c`: argv[1:] are the command args, cwd first on sys.path
+    sys.argv = [str(path), *args]
+    sys.path.insert(0, "")
+    try:
+        code = pycache.load_code(path)
+        # same globals runpy.run_path would give the script
+        ns = {
+            "__name__": "<run_path>",
+            "__file__": str(path),
+            "__cached__": str(pycache.cache_path(path)),
+            "__doc__": None,
+            "__loader__": None,
+            "__package__": None,
+            "__spec__": None,
+            "__builtins__": builtins,
+        }
+        exec(code, ns)
+        f = ns.get("main")
+        if not callable(f):
+            return 0
+        try:
+            sig = inspect.signature(f)
+            rc = f(list(args)) if len(sig.parameters) >= 1 else f()
+        except TypeError:
+            rc = f()
+        return int(rc or 0)
+    except SystemExit as exc:
+        return _exit_code(exc.code)
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        try:
+            sys.stdout.flush()
+        except Exception:
+            pass
+
+
+def _dispatch(cmd: str, args: List[str], path: Path, ext: str, bucket: Optional[Dict], help_requested: bool) -> int:
+    bucket_name = bucket.get("name") if isinstance(bucket, dict) else None
+    # commands may run for a long time; get buffered log lines on disk first
+    flush_log()
+    if help_requested:
+        if ext == "ps1":
+            from .psusage import static_usage_for_ps1
+
+            text = static_usage_for_ps1(path, cmd)
+            if text is not None:
+                debug(f"Static usage: cmd={cmd} path={path}")
+                print(text)
+                return 0
+            debug(f"Dispatching PowerShell usage: cmd={cmd} path={path} bucket={bucket_name}")
+            return run_usage_for_ps1(
+                path,
+                cmd,
+                ignore_execution_policy=_bucket_allows_unsafe(bucket),
+            )
+        print(f"nuro {cmd} - no usage available")
+        return 0
+    if ext == "ps1":
+        debug(f"Dispatching PowerShell command: cmd={cmd} args={args} path={path} bucket={bucket_name}")
+        return run_cmd_for_ps1(
+            path,
+            cmd,
+            args,
+            ignore_execution_policy=_bucket_allows_unsafe(bucket),
+        )
+    if ext == "py":
+        ok, site = _script_env(path)
+        if not ok:
+            return 1
+        exe = _python_exe()
+        if site is None and _can_run_inprocess(exe):
+            debug(f"Running Python command in-process: cmd={cmd} path={path}")
+            return _run_py_inprocess(path, args)
+        env = None
+        if site is not None:
+            env = dict(os.environ)
+            env["PYTHONPATH"] = os.pathsep.join(p for p in (str(site), env.get("PYTHONPATH", "")) if p)
+        return subprocess.call([exe, "-c", _PY_BOOTSTRAP % (str(path),), *args], env=env)
+    return subprocess.call(["bash", str(path), *args])
+
 
 def run_command(name: str, args: List[str]) -> int:
-    debug(f"run_command start: name={name} args={args}")
-    reg = load_registry()
+    info(f"run_command start: name={name} args={args}")
     bucket_hint, cmd = _split_bucket_hint(name)
-    debug(f"Resolved command: cmd={cmd} bucket_hint={bucket_hint}")
 
     # help path: nuro <cmd> -h / --help
     help_requested = any(a in ("-h", "--help", "/?") for a in args)
 
+    # Warm path: the resolution index maps the typed name straight to a cached script
+    hit = resolution.lookup(name)
+    if hit:
+        debug(f"Resolution index hit: name={name} path={hit.path} bucket={hit.bucket}")
+        bucket_stub = {"name": hit.bucket, "unsafe-dev-mode": hit.unsafe} if hit.bucket else None
+        if hit.max_age is not None:
+            from .revalidate import schedule_if_stale
+
+            schedule_if_stale(hit.path, hit.bucket, hit.max_age)
+        return _dispatch(cmd, args, hit.path, hit.ext, bucket_stub, help_requested)
+
+    reg = load_registry()
+    debug(f"Resolved command: cmd={cmd} bucket_hint={bucket_hint}")
+    from . import pincache
+    from .revalidate import bucket_max_age, schedule_if_stale
+
+    # a moved pin invalidates that bucket's cache before anything is reused
+    for b in reg.get("buckets", []):
+        pincache.check_bucket(b)
+
     # Search local caches in order: ext priority ps1 -> py -> sh
     for ext in ("ps1", "py", "sh"):
         paths = _local_paths_for_ext(cmd, bucket_hint, reg, ext)
         for p, bucket in paths:
             if p.exists():
                 debug(f"Using cached script: cmd={cmd} ext={ext} path={p}")
-                if help_requested:
-                    if ext == "ps1":
-                        debug(
-                            "Dispatching PowerShell usage: "
-                            f"cmd={cmd} path={p} bucket={bucket.get('name') if isinstance(bucket, dict) else None}"
-                        )
-                        return run_usage_for_ps1(
-                            p,
-                            cmd,
-                            ignore_execution_policy=_bucket_allows_unsafe(bucket),
-                        )
-                    print(f"nuro {cmd} - no usage available")
-                    return 0
-                if ext == "ps1":
-                    debug(
-                        "Dispatching PowerShell command: "
-                        f"cmd={cmd} args={args} path={p} bucket={bucket.get('name') if isinstance(bucket, dict) else None}"
-                    )
-                    return run_cmd_for_ps1(
-                        p,
-                        cmd,
-                        args,
-                        ignore_execution_policy=_bucket_allows_unsafe(bucket),
-                    )
-                if ext == "py":
-                    if not _ensure_script_requirements(p):
-                        return 1
-                    code = (
-                        "import runpy,sys,inspect; ns=runpy.run_path(%r); "
-                        "f=ns.get('main'); "
-                        "\nif callable(f):\n"
-                        "    try:\n"
-                        "        sig=inspect.signature(f)\n"
-                        "        rc=f(sys.argv[1:]) if len(sig.parameters)>=1 else f()\n"
-                        "    except TypeError:\n"
-                        "        rc=f()\n"
-                        "    sys.exit(int(rc or 0))\n"
-                        "else:\n"
-                        "    sys.exit(0)\n"
-                    ) % (str(p),)
-                    exe = _python_exe()
-                    return subprocess.call([exe, "-c", code, *args])
-                return subprocess.call(["bash", str(p), *args])
+                resolution.record(name, p, ext, bucket)
+                # stale-while-revalidate: run what we have, refresh it for the next call
+                schedule_if_stale(p, bucket.get("name") if bucket else None, bucket_max_age(bucket))
+                return _dispatch(cmd, args, p, ext, bucket, help_requested)
 
     # Attempt on-demand fetch for first available ext/bucket
     fetched = _try_fetch_any(cmd, reg, bucket_hint)
     if fetched:
         path, ext, bucket = fetched
         debug(f"Using freshly fetched script: cmd={cmd} ext={ext} path={path}")
-        if help_requested:
-            if ext == "ps1":
-                debug(
-                    "Dispatching fetched PowerShell usage: "
-                    f"cmd={cmd} path={path} bucket={bucket.get('name') if isinstance(bucket, dict) else None}"
-                )
-                return run_usage_for_ps1(
-                    path,
-                    cmd,
-                    ignore_execution_policy=_bucket_allows_unsafe(bucket),
-                )
-            print(f"nuro {cmd} - no usage available")
-            return 0
-        if ext == "ps1":
-            debug(
-                "Dispatching fetched PowerShell command: "
-                f"cmd={cmd} args={args} path={path} bucket={bucket.get('name') if isinstance(bucket, dict) else None}"
-            )
-            return run_cmd_for_ps1(
-                path,
-                cmd,
-                args,
-                ignore_execution_policy=_bucket_allows_unsafe(bucket),
-            )
-        if ext == "py":
-            if not _ensure_script_requirements(path):
-                return 1
-            code = (
-                "import runpy,sys,inspect; ns=runpy.run_path(%r); "
-                "f=ns.get('main'); "
-                "\nif callable(f):\n"
-                "    try:\n"
-                "        sig=inspect.signature(f)\n"
-                "        rc=f(sys.argv[1:]) if len(sig.parameters)>=1 else f()\n"
-                "    except TypeError:\n"
-                "        rc=f()\n"
-                "    sys.exit(int(rc or 0))\n"
-                "else:\n"
-                "    sys.exit(0)\n"
-            ) % (str(path),)
-            exe = _python_exe()
-            return subprocess.call([exe, "-c", code, *args])
-        return subprocess.call(["bash", str(path), *args])
-
-    debug(f"Command '{cmd}' not found after checking all buckets (bucket_hint={bucket_hint})")
+        # a new cache file may change how other names for cmd resolve
+        resolution.forget(cmd)
+        resolution.record(name, path, ext, bucket)
+        return _dispatch(cmd, args, path, ext, bucket, help_requested)
+
+    warning(f"Command '{cmd}' not found after checking all buckets (bucket_hint={bucket_hint})")
     raise RuntimeError(f"command '{cmd}' not found in any bucket")
 
 
 # ---------------- dependency handling for python scripts -----------------
 
-_REQ_NAME_RE = re.compile(r"^[A-Za-z0-9_.-]+")
-
-
 def _extract_requirements_from_file(path: Path) -> List[str]:
+    import ast
+
     try:
         src = path.read_text(encoding="utf-8", errors="replace")
         node = ast.parse(src, filename=str(path))
@@ -276,58 +552,208 @@ def _extract_requirements_from_file(path: Path) -> List[str]:
         return []
 
 
-def _pkg_name_from_spec(spec: str) -> str:
-    # take leading token up to bracket or comparator
-    s = spec.strip()
-    s = s.split("[", 1)[0]
-    m = _REQ_NAME_RE.match(s)
-    return m.group(0) if m else s
+# name -> version of every installed distribution, taken once per run
+_DIST_SNAPSHOT: Optional[Dict[str, str]] = None
+
+
+def _installed_distributions(refresh: bool = False) -> Dict[str, str]:
+    global _DIST_SNAPSHOT
+    if _DIST_SNAPSHOT is None or refresh:
+        from importlib import metadata as _im
+        from .pep440 import canonicalize_name
+
+        snapshot: Dict[str, str] = {}
+        for dist in _im.distributions():
+            try:
+                name = dist.metadata["Name"]
+            except Exception:
+                continue
+            if name:
+                # first hit wins, matching import precedence on sys.path
+                snapshot.setdefault(canonicalize_name(name), dist.version)
+        _DIST_SNAPSHOT = snapshot
+    return _DIST_SNAPSHOT
 
 
 def _is_req_satisfied(spec: str) -> bool:
-    name = _pkg_name_from_spec(spec)
+    """Check a PEP 508 requirement against the installed distributions.
+
+    Extras are not expanded and environment markers are not evaluated: the
+    base distribution must be installed at a matching version.
+    """
+    from .pep440 import canonicalize_name, parse_requirement, specifier_contains
+
     try:
-        ver = _im.version(name)
-    except Exception:
+        req = parse_requirement(spec)
+    except ValueError:
+        debug(f"Unparseable requirement, treating as missing: {spec}")
+        return False
+    version = _installed_distributions().get(canonicalize_name(req.name))
+    if version is None:
+        return False
+    if req.url:
+        # direct references cannot be compared; any installed version will do
+        return True
+    try:
+        return specifier_contains(req.specifier, version)
+    except ValueError as exc:
+        debug(f"Invalid specifier in {spec!r}: {exc}")
         return False
-    # if exact pin specified, verify equality; for other operators, force install
-    if "==" in spec:
-        want = spec.split("==", 1)[1].strip()
-        return ver == want
-    # no version constraint -> any installed version is fine
-    ops = [">=", "<=", ">", "<", "!=", "~=", "==="]
-    if any(op in spec for op in ops):
+
+
+def _normalize_requirements(reqs: List[str]) -> List[str]:
+    """Canonical, sorted, de-duplicated form of a __requires__ list."""
+    from .pep440 import canonicalize_name, parse_requirement
+
+    out = set()
+    for spec in reqs:
+        try:
+            r = parse_requirement(spec)
+        except ValueError:
+            out.add(spec.strip())
+            continue
+        text = canonicalize_name(r.name)
+        if r.extras:
+            text += "[" + ",".join(sorted(e.lower() for e in r.extras)) + "]"
+        if r.url:
+            text += " @ " + r.url
+        else:
+            text += ",".join(sorted(c.replace(" ", "") for c in r.specifier.split(",") if c.strip()))
+        if r.marker:
+            text += "; " + r.marker
+        out.add(text)
+    return sorted(out)
+
+
+def _env_key(specs: List[str], exe: str) -> str:
+    """Hash of the normalized requirement set and the interpreter that runs it."""
+    import hashlib
+    import shutil
+
+    resolved = shutil.which(exe) or exe
+    try:
+        real = os.path.realpath(resolved)
+        st = os.stat(real)
+        ident = f"{resolved}:{real}:{st.st_size}:{st.st_mtime_ns}"
+    except OSError:
+        ident = resolved
+    payload = ident + "\n" + "\n".join(specs)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _env_marker(env: Path) -> Path:
+    return env / "env.json"
+
+
+def _build_env(env: Path, specs: List[str], exe: str) -> bool:
+    """Install specs into env/site with one pip run, reusing the shared wheelhouse.
+
+    `pip wheel` fills ~/.nuro/wheels (wheels already there are not rebuilt or
+    downloaded again), then `pip install --target` installs offline from it.
+    """
+    import shutil
+    from .fsutil import atomic_write_text
+    from .paths import wheelhouse_dir
+
+    wheels = wheelhouse_dir()
+    wheels.mkdir(parents=True, exist_ok=True)
+    env.mkdir(parents=True, exist_ok=True)
+    site = env / "site"
+    tmp_site = env / f"site.{os.getpid()}.tmp"
+    pip = [exe, "-m", "pip", "--disable-pip-version-check", "-q"]
+    links = ["--find-links", str(wheels)]
+    debug(f"Building Python env {env.name}: {specs}")
+    # Suppress pip's stdout/stderr; rely on debug() for reporting
+    quiet = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    rc = subprocess.call([*pip, "wheel", "--wheel-dir", str(wheels), *links, *specs], **quiet)
+    if rc == 0:
+        rc = subprocess.call([*pip, "install", "--no-index", *links, "--target", str(tmp_site), *specs], **quiet)
+    if rc != 0:
+        warning(f"Failed to build Python env {env.name} (rc={rc}): {specs}")
+        shutil.rmtree(tmp_site, ignore_errors=True)
         return False
+    shutil.rmtree(site, ignore_errors=True)
+    tmp_site.mkdir(parents=True, exist_ok=True)
+    os.replace(tmp_site, site)
+    atomic_write_text(
+        _env_marker(env),
+        json.dumps({"requires": specs, "python": exe, "created_at": time.time()}, indent=2, ensure_ascii=False),
+    )
     return True
 
 
-def _ensure_script_requirements(path: Path) -> bool:
+def _gc_envs(keep: Path) -> None:
+    """Drop least recently used environments beyond py_envs.max_envs / max_age_days."""
+    import shutil
+    from .config import py_env_settings
+    from .fsutil import lock_path, try_lock, unlock
+    from .paths import envs_dir
+
+    try:
+        settings = py_env_settings()
+    except Exception:
+        return
+    envs = []
+    for d in envs_dir().iterdir():
+        try:
+            envs.append((_env_marker(d).stat().st_mtime, d))
+        except OSError:
+            continue
+    envs.sort(reverse=True)
+    cutoff = time.time() - settings["max_age_days"] * 86400
+    for i, (last_used, d) in enumerate(envs):
+        if d == keep:
+            continue
+        if i >= max(1, settings["max_envs"]) or (settings["max_age_days"] and last_used < cutoff):
+            # an env being used or built right now holds its lock: leave it alone
+            fd = try_lock(lock_path(str(d)))
+            if fd is None:
+                continue
+            try:
+                debug(f"Removing unused Python env {d.name}")
+                shutil.rmtree(d, ignore_errors=True)
+            finally:
+                unlock(fd)
+
+
+def _script_env(path: Path) -> Tuple[bool, Optional[Path]]:
+    """Make a .py command's __requires__ importable; returns (ok, site dir).
+
+    Requirements already met by the interpreter need nothing. That check
+    reads nuro's own installed distributions, so it is only made when the
+    script runs under nuro's interpreter. Otherwise the script gets an
+    isolated environment (~/.nuro/envs/<hash>/site, added to PYTHONPATH) keyed
+    by its normalized requirement set and interpreter, so scripts with
+    conflicting pins never reinstall each other's packages. Packages are only
+    ever installed there, never into an interpreter's site-packages, which is
+    why no ~/.nuro/venv is required to install dependencies.
+    """
     reqs = _extract_requirements_from_file(path)
     if not reqs:
-        return True
+        return True, None
     debug(f"Checking script requirements for {path}")
+    from .fsutil import file_lock
+    from .paths import envs_dir
+
+    exe = _python_exe()
+    specs = _normalize_requirements(reqs)
+    env = envs_dir() / _env_key(specs, exe)
+    marker = _env_marker(env)
+    if marker.exists():
+        # the lock keeps _gc_envs of another process from removing it meanwhile
+        with file_lock(str(env)):
+            if marker.exists():
+                debug(f"Using Python env {env.name} for {path.name}")
+                os.utime(marker)
+                return True, env / "site"
+
+    if not _is_current_interpreter(exe):
+        debug(f"Script runs under {exe}, not {sys.executable}; using an isolated env")
+        return _build_script_env(env, specs, exe, reqs)
+
     cache = _load_reqs_cache()
     changed = False
-    # Determine if a nuro-managed venv exists; if not, we do not modify system/user site-packages
-    have_venv = _is_venv_python(_python_exe())
-    # If any requirement is missing and no venv, inform and return without attempting installs
     missing_specs: List[str] = []
-    for spec in reqs:
-        if cache.get(spec) is True:
-            continue
-        if not _is_req_satisfied(spec):
-            missing_specs.append(spec)
-    if missing_specs and not have_venv:
-        msg = (
-            "nuro: Python dependency install requires ~/.nuro/venv. "
-            "Please provision it (e.g., run bootstrap/get.nuro.ps1)."
-        )
-        try:
-            sys.stderr.write(msg + "\n")
-        except Exception:
-            print(msg)
-        debug("Dependency install skipped: ~/.nuro/venv not found")
-        return False
     for spec in reqs:
         if cache.get(spec) is True:
             debug(f"Requirement cached as satisfied: {spec}")
@@ -336,43 +762,34 @@ def _ensure_script_requirements(path: Path) -> bool:
             debug(f"Requirement already satisfied: {spec}")
             cache[spec] = True
             changed = True
-            continue
-        debug(f"Installing requirement: {spec}")
-        try:
-            # try python -m pip / pip3 / pip in order
-            def _try(cmd: list[str]) -> int:
-                # Suppress pip's stdout/stderr; rely on debug() for reporting
-                return subprocess.call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-
-            exe = _python_exe()
-            # Require installs to go into nuro-managed venv
-            base = [exe, "-m", "pip", "install"]
-            cmds = [
-                base + [spec],
-                ["pip3", "install", spec],
-                ["pip", "install", spec],
-            ]
-            rc = 1
-            for c in cmds:
-                rc = _try(c)
-                if rc == 0:
-                    break
-            if rc == 0:
-                cache[spec] = True
-                changed = True
-                debug(f"Installed requirement: {spec}")
-                _print_green(f"Installed dependency: {spec}")
-            else:
-                cache[spec] = False
-                changed = True
-                debug(f"Failed to install requirement (rc={rc}): {spec}")
-        except Exception as e:
-            cache[spec] = False
-            changed = True
-            debug(f"Exception during pip install for {spec}: {e}")
+        else:
+            missing_specs.append(spec)
     if changed:
         _save_reqs_cache(cache)
-    return True
+    if not missing_specs:
+        return True, None
+    return _build_script_env(env, specs, exe, missing_specs)
+
+
+def _build_script_env(env: Path, specs: List[str], exe: str, missing_specs: List[str]) -> Tuple[bool, Optional[Path]]:
+    from .fsutil import file_lock
+
+    marker = _env_marker(env)
+    # Concurrent runs of scripts with the same requirement set build it once
+    with file_lock(str(env)):
+        if marker.exists():
+            os.utime(marker)
+            return True, env / "site"
+        if not _build_env(env, specs, exe):
+            sys.stderr.write(f"nuro: failed to install Python dependencies: {', '.join(missing_specs)}\n")
+            return False, None
+    _print_green(f"Installed dependency: {', '.join(specs)}")
+    _gc_envs(keep=env)
+    return True, env / "site"
+
+
+def _ensure_script_requirements(path: Path) -> bool:
+    return _script_env(path)[0]
 
 
 def _python_exe() -> str:
@@ -390,16 +807,6 @@ def _python_exe() -> str:
     return "python3"
 
 
-def _is_venv_python(exe: str) -> bool:
-    try:
-        exe_path = Path(exe)
-        return (
-            (".nuro" in exe_path.as_posix() and "venv" in exe_path.as_posix())
-            or bool(os.environ.get("VIRTUAL_ENV"))
-        )
-    except Exception:
-        return False
-
 def _reqs_cache_path() -> Path:
     return cache_dir() / "py-reqs.json"
 
@@ -419,8 +826,10 @@ def _load_reqs_cache() -> Dict[str, bool]:
 def _save_reqs_cache(d: Dict[str, bool]) -> None:
     try:
         p = _reqs_cache_path()
+        from .fsutil import atomic_write_text
+
         p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(json.dumps(d, indent=2, ensure_ascii=False), encoding="utf-8")
+        atomic_write_text(p, json.dumps(d, indent=2, ensure_ascii=False))
     except Exception:
         pass
 
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import negcache, pincache, pycache, resolution
+from .buckets import (
+    fetch_bucket_archive,
+    fetch_source,
+    list_bucket_commands,
+    pinned_archive_source,
+    read_fetch_meta,
+    resolve_cmd_source_with_meta,
+)
+from .debuglog import debug, info, warning
+from .manifest import entry_source, manifest_entries
+from .paths import cache_dir, cmds_cache_base, ensure_tree
+from .registry import load_registry
+
+# `nuro sync [bucket...]` downloads every script of the selected buckets into
+# the command cache up front, so later runs resolve without network I/O.
+
+
+_SYNC_USAGE = """USAGE:
+  nuro sync [bucket...] [--usage] [--deps] [--jobs N] [--no-archive]
+
+  Download every cmds/*.ps1|py|sh of the given buckets (default: all) into
+  ~/.nuro/cache/cmds/<bucket>/. Buckets pinned with sha1-hash are fetched as
+  one tarball of that commit.
+
+OPTIONS:
+  --usage     Also capture the one-line usage of .ps1 commands
+  --deps      Also install __requires__ dependencies of .py commands
+  --jobs N    Parallel downloads (default: refresh_workers)
+  --no-archive  Fetch pinned buckets file by file as well
+"""
+
+
+def _sync_one(bucket: Dict, cmd: str, ext: str, dest: Path) -> bool:
+    """Bring dest up to date; returns True when it was (re)written.
+
+    A bucket manifest names the file and its sha256, like in runner; the
+    GitHub listing is consulted only for buckets without one.
+    """
+    entry = next((e for e in manifest_entries(bucket, cmd) or [] if e.ext == ext), None)
+    if entry is not None:
+        src = entry_source(bucket, entry)
+    else:
+        src = resolve_cmd_source_with_meta(bucket, cmd, ext=ext)
+    if src.get("kind") == "local" and dest.exists():
+        if Path(src["path"]).read_bytes() == dest.read_bytes():
+            return False
+    elif src.get("kind") == "remote" and src.get("sha256") and dest.exists():
+        if hashlib.sha256(dest.read_bytes()).hexdigest() == src["sha256"]:
+            return False
+    elif src.get("kind") == "remote" and src.get("sha") and dest.exists():
+        meta = read_fetch_meta(dest) or {}
+        if meta.get("sha") == src["sha"]:
+            return False
+    return fetch_source(src, dest)
+
+
+def _warm_usage(bucket: Dict, names: List[str]) -> None:
+    from .usage import _collect_usage_texts
+
+    bname = str(bucket.get("name", ""))
+    ucache_dir = cache_dir() / "usage" / bname
+    ucache_dir.mkdir(parents=True, exist_ok=True)
+    _collect_usage_texts(names, bucket, cmds_cache_base() / bname, ucache_dir, refresh=False)
+
+
+def _install_deps(paths: List[Path]) -> int:
+    from .runner import _ensure_script_requirements
+
+    failed = 0
+    for p in paths:
+        if not _ensure_script_requirements(p):
+            failed += 1
+    return failed
+
+
+def _sync_files(bucket: Dict, entries: List[Tuple[str, str]], jobs: int) -> Tuple[List[Tuple[str, str]], int, int]:
+    """Fetch entries one request per file; returns (synced, updated, failed)."""
+    bname = str(bucket.get("name", ""))
+    info(f"sync: bucket={bname} commands={len(entries)} jobs={jobs}")
+
+    def _job(entry: Tuple[str, str]) -> bool:
+        cmd, ext = entry
+        return _sync_one(bucket, cmd, ext, cmds_cache_base() / bname / f"{cmd}.{ext}")
+
+    updated = failed = 0
+    synced: List[Tuple[str, str]] = []
+    if not entries:
+        return synced, updated, failed
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(entries)))) as pool:
+        futures = [(e, pool.submit(_job, e)) for e in entries]
+        for (cmd, ext), fut in futures:
+            try:
+                changed = fut.result()
+            except Exception as exc:
+                failed += 1
+                warning(f"sync: fetch failed for {bname}:{cmd}.{ext}: {exc}")
+                sys.stderr.write(f"nuro: sync failed for {bname}:{cmd}.{ext}: {exc}\n")
+                continue
+            updated += int(bool(changed))
+            synced.append((cmd, ext))
+    return synced, updated, failed
+
+
+def sync_buckets(
+    names: Optional[List[str]] = None,
+    usage: bool = False,
+    deps: bool = False,
+    jobs: Optional[int] = None,
+    archive: bool = True,
+) -> int:
+    """Prefetch all commands of the named buckets (all when empty); returns an exit code."""
+    ensure_tree()
+    reg = load_registry()
+    buckets = [b for b in reg.get("buckets", []) if isinstance(b, dict)]
+    if names:
+        by_name = {str(b.get("name", "")): b for b in buckets}
+        unknown = [n for n in names if n not in by_name]
+        if unknown:
+            sys.stderr.write(f"nuro: unknown bucket: {', '.join(unknown)}\n")
+            return 1
+        buckets = [by_name[n] for n in names]
+    if jobs is None:
+        from .usage import _refresh_workers
+
+        jobs = _refresh_workers()
+
+    rc = 0
+    missing = negcache.NegativeCache()
+    for b in buckets:
+        bname = str(b.get("name", ""))
+        pincache.check_bucket(b)
+        synced: Optional[List[Tuple[str, str]]] = None
+        cached = False
+        if pincache.is_complete(b):
+            # an immutable cache that already holds the whole commit: no network, no hashing
+            files = (pincache.read_marker(bname) or {}).get("files", {})
+            if all((cmds_cache_base() / bname / f).exists() for f in files):
+                synced = [(stem, ext) for stem, _, ext in sorted(f.rpartition(".") for f in files)]
+                cached = True
+                print(f"{bname}: {len(synced)} commands (pinned {b.get('sha1-hash')}, already cached)")
+        if synced is None and archive and pinned_archive_source(b) is not None:
+            try:
+                synced = fetch_bucket_archive(b, cmds_cache_base() / bname)
+                pincache.record(b, [cmds_cache_base() / bname / f"{c}.{e}" for c, e in synced], complete=True)
+                print(f"{bname}: {len(synced)} commands (from archive {b.get('sha1-hash')})")
+            except Exception as exc:
+                synced = None
+                warning(f"sync: archive fetch failed for bucket {bname}, falling back to files: {exc}")
+        if synced is None:
+            try:
+                entries = list_bucket_commands(b)
+            except Exception as exc:
+                warning(f"sync: listing failed for bucket {bname}: {exc}")
+                sys.stderr.write(f"nuro: sync failed for {bname}: {exc}\n")
+                rc = 1
+                continue
+            if entries is None:
+                print(f"{bname}: skipped (bucket cannot be listed)")
+                continue
+            synced, updated, failed = _sync_files(b, entries, jobs)
+            try:
+                pincache.record(b, [cmds_cache_base() / bname / f"{c}.{e}" for c, e in synced], complete=not failed)
+            except ValueError as exc:
+                sys.stderr.write(f"nuro: sync failed for {bname}: {exc}\n")
+                failed += 1
+                synced = [(c, e) for c, e in synced if (cmds_cache_base() / bname / f"{c}.{e}").exists()]
+            print(f"{bname}: {len(synced)} commands ({updated} updated, {len(synced) - updated} up to date)")
+            if failed:
+                rc = 1
+
+        for cmd, ext in synced:
+            missing.discard(b, cmd, ext)
+            if ext == "py" and not cached:
+                pycache.compile_cached(cmds_cache_base() / bname / f"{cmd}.py")
+
+        if usage:
+            ps1_names = [cmd for cmd, ext in synced if ext == "ps1"]
+            if ps1_names:
+                debug(f"sync: warming usage for {len(ps1_names)} commands in {bname}")
+                _warm_usage(b, ps1_names)
+        if deps:
+            py_paths = [cmds_cache_base() / bname / f"{cmd}.py" for cmd, ext in synced if ext == "py"]
+            if py_paths and _install_deps(py_paths):
+                rc = 1
+
+    # cache contents changed wholesale; let run_command re-resolve once
+    resolution.invalidate()
+    missing.save()
+    negcache.clear(keep_immutable=True)
+    return rc
+
+
+def main(args: List[str]) -> int:
+    names: List[str] = []
+    usage = deps = False
+    archive = True
+    jobs: Optional[int] = None
+    it = iter(args)
+    for a in it:
+        if a in ("-h", "--help", "/?"):
+            print(_SYNC_USAGE, end="")
+            return 0
+        if a == "--usage":
+            usage = True
+        elif a == "--deps":
+            deps = True
+        elif a == "--no-archive":
+            archive = False
+        elif a == "--jobs" or a.startswith("--jobs="):
+            value = a.split("=", 1)[1] if "=" in a else next(it, "")
+            try:
+                jobs = max(1, int(value))
+            except ValueError:
+                sys.stderr.write(f"nuro: invalid --jobs value: {value!r}\n")
+                return 2
+        elif a.startswith("-"):
+            sys.stderr.write(f"nuro: unknown sync option: {a}\n")
+            return 2
+        else:
+            names.append(a)
+    return sync_buckets(names, usage=usage, deps=deps, jobs=jobs, archive=archive)
@@ -0,0 +1,21 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+def test_benchmark_suite_smoke(tmp_path):
+    """ベンチマークが密閉環境で動きJSONを書き出す"""
+    root = Path(__file__).resolve().parents[2]
+    out = tmp_path / "bench.json"
+    subprocess.run(
+        [sys.executable, str(root / "benchmarks" / "bench_cli.py"), "-n", "1", "-o", str(out), "version", "fetch_on_demand"],
+        check=True,
+        capture_output=True,
+        cwd=str(tmp_path),
+    )
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert report["meta"]["python"]
+    assert report["scenarios"]["version"]["wall_ms"]["median"] > 0
+    fetch = report["scenarios"]["fetch_on_demand"]
+    assert "skipped" in fetch or fetch["http_requests_per_run"] >= 1
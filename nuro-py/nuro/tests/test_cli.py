@@ -79,3 +79,61 @@ def test_main_invokes_marker_for_commands(isolated_home, monkeypatch):
     assert exit_code == 0
     assert called["apply"] == 1
     assert called["run"] == ("time", ["--utc"])
+
+
+# Modules that only the fetch / listing paths may load
+_HEAVY_MODULES = {
+    "urllib.request",
+    "http.client",
+    "ssl",
+    "email",
+    "ast",
+    "importlib.metadata",
+    "unicodedata",
+    "concurrent.futures",
+    "socket",
+    "nuro.buckets",
+    "nuro.usage",
+}
+
+
+def _imported_modules(code):
+    """python -X importtime で読み込まれたモジュール名の集合を返す"""
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    root = Path(__file__).resolve().parents[2]
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(root) + os.pathsep + env.get("PYTHONPATH", "")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=str(root),
+        env=env,
+        check=True,
+    )
+    names = set()
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and line.count("|") == 2:
+            name = line.rsplit("|", 1)[1].strip()
+            if name != "package":
+                names.add(name)
+    return names
+
+
+@pytest.mark.parametrize(
+    "code,budget",
+    [
+        ("import nuro.cli; nuro.cli.main(['--version'])", 5),
+        ("import nuro.runner", 90),
+    ],
+)
+def test_cold_start_import_budget(code, budget):
+    """起動時に読み込むモジュールが予算を超えない"""
+    baseline = _imported_modules("pass")
+    added = _imported_modules(code) - baseline
+    assert not (added & _HEAVY_MODULES), sorted(added & _HEAVY_MODULES)
+    assert len(added) <= budget, sorted(added)
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from nuro import debuglog
+from nuro.config import _config_path, load_app_config
+
+
+@pytest.fixture()
+def isolated_log(tmp_path, monkeypatch):
+    """一時ホームでログ状態を初期化する"""
+    debuglog._close()
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    monkeypatch.delenv("NURO_DEBUG", raising=False)
+    monkeypatch.delenv("NURO_LOG_LEVEL", raising=False)
+    monkeypatch.setattr(debuglog, "_enabled", None)
+    monkeypatch.setattr(debuglog, "_threshold", None)
+    yield debuglog._log_path()
+    debuglog._close()
+
+
+def test_lines_below_threshold_are_dropped(isolated_log):
+    """既定ではDEBUG行は書き込まれず、INFO以上はバッファ後に書き込まれる"""
+    debuglog.debug("noisy detail")
+    debuglog.info("run started")
+    assert not isolated_log.exists()
+
+    debuglog.flush()
+    text = isolated_log.read_text(encoding="utf-8")
+    assert "INFO: run started" in text
+    assert "noisy detail" not in text
+
+
+def test_error_flushes_immediately(isolated_log, monkeypatch):
+    """ERRORはすぐにファイルへ書き出される"""
+    monkeypatch.setenv("NURO_LOG_LEVEL", "debug")
+    debuglog.debug("detail")
+    debuglog.error("boom")
+    text = isolated_log.read_text(encoding="utf-8")
+    assert "DEBUG: detail" in text
+    assert "ERROR: boom" in text
+
+
+def test_debug_log_rotates_when_over_size(isolated_log):
+    """上限サイズを超えたログはローテーションされる"""
+    cfg = load_app_config()
+    cfg["logs"] = {"max_bytes": 100, "backups": 2}
+    _config_path().write_text(json.dumps(cfg), encoding="utf-8")
+    isolated_log.parent.mkdir(parents=True, exist_ok=True)
+    isolated_log.write_text("x" * 200, encoding="utf-8")
+
+    debuglog.info("fresh line")
+    debuglog.flush()
+
+    rotated = isolated_log.with_name("nuro-debug.log.1")
+    assert rotated.read_text(encoding="utf-8") == "x" * 200
+    assert "fresh line" in isolated_log.read_text(encoding="utf-8")
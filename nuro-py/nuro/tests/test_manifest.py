@@ -0,0 +1,119 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from nuro import buckets, manifest, runner, usage
+from nuro.manifest import build_manifest, render_manifest
+
+REPO_CMDS = Path(__file__).resolve().parents[3] / "cmds"
+
+
+@pytest.fixture()
+def isolated_home(tmp_path, monkeypatch):
+    """一時ホームディレクトリを設定する"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    manifest.forget()
+    yield tmp_path
+    manifest.forget()
+
+
+@pytest.fixture()
+def bucket_server():
+    """cmds/ 以下のファイルを返すGitHub以外のHTTPサーバー"""
+    files = {}
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            requests.append(self.path)
+            body = files.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield files, requests, f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def _publish(files, scripts):
+    commands = []
+    for filename, body in scripts.items():
+        files[f"/b/cmds/{filename}"] = body
+        stem, _, ext = filename.rpartition(".")
+        commands.append(
+            {"name": stem, "ext": ext, "size": len(body), "sha256": hashlib.sha256(body).hexdigest(), "usage": None}
+        )
+    files["/b/cmds/index.json"] = json.dumps({"version": 1, "commands": commands}).encode()
+
+
+def test_repo_index_is_up_to_date():
+    """cmds/index.json がコミット済みのスクリプトと一致している（tools/update_index.py で再生成）"""
+    assert (REPO_CMDS / "index.json").read_text(encoding="utf-8") == render_manifest(build_manifest(REPO_CMDS))
+
+
+def test_manifest_lists_and_resolves_raw_bucket(isolated_home, bucket_server):
+    """raw:: バケットでもマニフェスト1回の取得で一覧と拡張子の解決ができる"""
+    files, requests, base = bucket_server
+    _publish(files, {"hello.py": b"print('hi')\n", "tool.sh": b"echo tool\n"})
+    bucket = {"name": "web", "uri": f"raw::{base}/b", "priority": 10}
+
+    assert buckets.list_bucket_commands(bucket) == [("hello", "py"), ("tool", "sh")]
+    hit = runner._try_fetch_any("hello", {"buckets": [bucket]}, None)
+    assert hit is not None and hit[1] == "py"
+    # hello.ps1 の試行も別バケットへの問い合わせもない
+    assert requests == ["/b/cmds/index.json", "/b/cmds/hello.py"]
+    assert runner._try_fetch_any("missing", {"buckets": [bucket]}, None) is None
+    assert len(requests) == 2
+
+    # 別プロセスでもTTL内ならディスク上のマニフェストを使う
+    manifest.forget()
+    assert buckets.list_bucket_commands(bucket) == [("hello", "py"), ("tool", "sh")]
+    assert len(requests) == 2
+
+
+def test_manifest_sha256_mismatch_is_rejected(isolated_home, bucket_server):
+    """マニフェストのsha256と異なる内容は保存されない"""
+    files, _, base = bucket_server
+    _publish(files, {"hello.sh": b"echo hi\n"})
+    files["/b/cmds/hello.sh"] = b"echo tampered\n"
+    bucket = {"name": "web", "uri": f"raw::{base}/b", "priority": 10}
+
+    assert runner._try_fetch_any("hello", {"buckets": [bucket]}, None) is None
+    assert not (isolated_home / ".nuro" / "cache" / "cmds" / "web" / "hello.sh").exists()
+
+
+def test_usage_lines_come_from_manifest(isolated_home, monkeypatch, tmp_path):
+    """マニフェストに使用例があればスクリプトの取得もPowerShellも不要"""
+    cmds = tmp_path / "bucket" / "cmds"
+    cmds.mkdir(parents=True)
+    (cmds / "alpha.ps1").write_text("function NuroUsage_alpha { 'nuro alpha <x>' }", encoding="utf-8")
+    manifest.write_manifest(cmds)
+    (cmds / "alpha.ps1").unlink()
+    monkeypatch.setattr(usage, "run_usage_batch_capture", lambda *a, **k: pytest.fail("pwsh used"))
+    ucache = tmp_path / "ucache"
+    ucache.mkdir()
+
+    bucket = {"name": "loc", "uri": f"local::{cmds.parent}"}
+    texts = usage._collect_usage_texts(["alpha"], bucket, tmp_path / "ps1", ucache, False)
+
+    assert texts == {"alpha": "nuro alpha <x>"}
+    assert (ucache / "alpha.txt").read_text(encoding="utf-8") == "nuro alpha <x>"
@@ -0,0 +1,32 @@
+import pytest
+
+from nuro.pep440 import Version, parse_requirement, specifier_contains
+
+
+@pytest.mark.parametrize(
+    "spec, version, expected",
+    [
+        (">=7.4", "7.4.2", True),
+        (">=7.4", "7.3", False),
+        ("~=2.2", "2.9", True),
+        ("~=2.2", "3.0", False),
+        ("==1.1.*", "1.1.5", True),
+        ("!=1.0", "1.0.0", False),
+        ("<2.0", "2.0rc1", False),
+        (">1.0", "1.0.post1", False),
+        ("==1.0", "1.0+local", True),
+        (">=1.0,<2", "1.5", True),
+        (">=1.0", "1.0.dev1", False),
+    ],
+)
+def test_specifier_contains(spec, version, expected):
+    """PEP 440の比較演算子を評価する"""
+    assert specifier_contains(spec, version) is expected
+
+
+def test_version_ordering_and_requirement_parsing():
+    """バージョンの並び順と要件文字列の分解"""
+    ordered = ["1.0.dev1", "1.0a1", "1.0rc1", "1.0", "1.0+abc", "1.0.post1"]
+    assert sorted(ordered, key=Version) == ordered
+    req = parse_requirement("qrcode[pil]>=7.4")
+    assert (req.name, req.extras, req.specifier) == ("qrcode", ["pil"], ">=7.4")
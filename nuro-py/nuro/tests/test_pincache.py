@@ -0,0 +1,75 @@
+import pytest
+
+from nuro import buckets, pincache, runner, usage
+from nuro.paths import cache_dir, cmds_cache_base
+from nuro.registry import load_registry, save_registry
+
+SHA = "c" * 40
+
+
+@pytest.fixture()
+def isolated_home(tmp_path, monkeypatch):
+    """一時ホームディレクトリを設定する"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    pincache.forget()
+    yield tmp_path
+    pincache.forget()
+
+
+@pytest.fixture()
+def pinned_bucket(isolated_home, monkeypatch):
+    """sha固定のGitHubバケットを登録し、取得はメモリ上の内容で代用する"""
+    bucket = {"name": "pinned", "uri": "github::o/r@main", "sha1-hash": SHA, "priority": 10}
+    reg = load_registry()
+    reg["buckets"] = [bucket]
+    save_registry(reg)
+    remote = {"hello.sh": b"echo hello\n"}
+
+    def fake_fetch(src, dest, timeout=None):
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(remote[dest.name])
+        return True
+
+    monkeypatch.setattr(buckets, "fetch_source", fake_fetch)
+    monkeypatch.setattr(buckets, "resolve_cmd_source_with_meta", lambda b, c, ext="ps1": {"kind": "remote", "url": "x"})
+    monkeypatch.setattr("nuro.manifest.load_bucket_manifest", lambda b: None)
+    monkeypatch.setattr(runner.subprocess, "call", lambda cmd, **k: 0)
+    return bucket, remote
+
+
+def test_pinned_cache_is_recorded_and_never_revalidated(pinned_bucket, monkeypatch):
+    """固定バケットの取得はハッシュを記録し、--refreshでも再検証されない"""
+    bucket, remote = pinned_bucket
+    assert runner.run_command("hello", []) == 0
+    dest = cmds_cache_base() / "pinned" / "hello.sh"
+    marker = pincache.read_marker("pinned")
+    assert marker["sha"] == SHA and "hello.sh" in marker["files"]
+
+    monkeypatch.setattr(usage, "revalidate_cached", lambda p: pytest.fail("revalidated"))
+    usage._revalidate_script_cache()
+    assert dest.exists()
+
+    # 同じコミットなのに内容が変われば保存しない
+    dest.unlink()
+    remote["hello.sh"] = b"echo tampered\n"
+    assert runner._try_fetch_any("hello", load_registry(), None) is None
+    assert not dest.exists()
+
+
+def test_moving_the_pin_drops_the_cache(pinned_bucket):
+    """sha1-hashが変わるとそのバケットのキャッシュと使用例を破棄する"""
+    bucket, _ = pinned_bucket
+    assert runner.run_command("hello", []) == 0
+    ucache = cache_dir() / "usage" / "pinned"
+    ucache.mkdir(parents=True)
+    (ucache / "hello.txt").write_text("old", encoding="utf-8")
+
+    reg = load_registry()
+    reg["buckets"][0]["sha1-hash"] = "d" * 40
+    save_registry(reg)
+    pincache.check_bucket(load_registry()["buckets"][0])
+
+    assert not (cmds_cache_base() / "pinned" / "hello.sh").exists()
+    assert not ucache.exists()
+    assert pincache.read_marker("pinned")["sha"] == "d" * 40
@@ -0,0 +1,168 @@
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from nuro import pshost
+from nuro.paths import logs_dir, run_dir
+
+
+@pytest.fixture()
+def isolated_home(tmp_path, monkeypatch):
+    """一時ホームディレクトリを設定する"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    return tmp_path
+
+
+def _start_fake_worker(frames, received):
+    """プールワーカーのプロトコルを話すダミーサーバーを起動する"""
+    srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    srv.bind(("127.0.0.1", 0))
+    srv.listen(1)
+
+    def serve():
+        conn, _ = srv.accept()
+        with conn, conn.makefile("rw", encoding="utf-8") as f:
+            received.append(json.loads(f.readline()))
+            for frame in frames:
+                f.write(json.dumps(frame) + "\n")
+            f.flush()
+        srv.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return srv.getsockname()[1]
+
+
+def test_run_cmd_uses_pool_worker(isolated_home, monkeypatch, capsys):
+    """プール有効時はウォームなワーカーでNuroCmdを実行する"""
+    monkeypatch.setenv("NURO_PS_POOL", "1")
+    received = []
+    port = _start_fake_worker(
+        [{"s": "start"}, {"s": "out", "d": "hello"}, {"s": "err", "d": "oops"}, {"exit": 3}],
+        received,
+    )
+    state = run_dir() / "pshost-0.json"
+    state.parent.mkdir(parents=True, exist_ok=True)
+    state.write_text(json.dumps({"pid": 1, "port": port, "token": "tkn"}), encoding="utf-8")
+
+    def no_spawn(*a, **k):
+        raise AssertionError("worker should not be spawned")
+
+    monkeypatch.setattr(pshost, "_spawn_pool_worker", no_spawn)
+
+    rc = pshost.run_cmd_for_ps1(Path("x.ps1"), "demo", ["a b"], ignore_execution_policy=True)
+
+    assert rc == 3
+    out = capsys.readouterr()
+    assert "hello" in out.out
+    assert "oops" in out.err
+    req = received[0]
+    assert req["token"] == "tkn"
+    assert req["bypass"] is True
+    assert "NuroCmd_demo" in req["script"]
+    assert "'a b'" in req["script"]
+
+
+def test_worker_lost_after_start_is_not_redispatched(isolated_home, monkeypatch):
+    """開始後にワーカーが落ちた要求は別スロットへ再送せず失敗として返す"""
+    monkeypatch.setenv("NURO_PS_POOL", "1")
+    lost, spare = [], []
+    ports = [_start_fake_worker([{"s": "start"}], lost), _start_fake_worker([{"s": "start"}, {"exit": 0}], spare)]
+    run_dir().mkdir(parents=True, exist_ok=True)
+    for slot, port in enumerate(ports):
+        state = {"pid": 4242 + slot, "port": port, "token": "tkn"}
+        (run_dir() / f"pshost-{slot}.json").write_text(json.dumps(state), encoding="utf-8")
+    killed = []
+    monkeypatch.setattr(pshost.os, "kill", lambda pid, sig: killed.append(pid))
+    monkeypatch.setattr(pshost, "_spawn_pool_worker", lambda *a, **k: pytest.fail("worker spawned"))
+
+    assert pshost._pool_run("Write-Output 1", False, "test") == 1
+    assert len(lost) == 1 and spare == []
+    assert killed == [4242]
+    assert not (run_dir() / "pshost-0.json").exists()
+
+
+def test_pool_disabled_by_default(isolated_home, monkeypatch):
+    """既定ではプールを使わずNoneを返す"""
+    monkeypatch.delenv("NURO_PS_POOL", raising=False)
+    assert pshost._pool_run("Write-Output 1", False, "test") is None
+
+
+def test_transcripts_removed_on_success_and_pruned(isolated_home, monkeypatch):
+    """成功時のトランスクリプトは削除し、失敗時は保持数まで残す"""
+    logs_dir().mkdir(parents=True, exist_ok=True)
+    ok = logs_dir() / "ps-transcript-ok.log"
+    ok.write_text("ok", encoding="utf-8")
+    pshost._finish_transcript(ok, 0)
+    assert not ok.exists()
+
+    monkeypatch.setattr(
+        "nuro.config.log_settings",
+        lambda cfg=None: {"transcript_keep_days": 7, "max_transcripts": 2, "max_bytes": 0, "backups": 0},
+    )
+    for i in range(4):
+        p = logs_dir() / f"ps-transcript-{i}.log"
+        p.write_text("fail", encoding="utf-8")
+        os.utime(p, (time.time() - 100 + i, time.time() - 100 + i))
+    pshost._finish_transcript(logs_dir() / "ps-transcript-3.log", 1)
+    left = sorted(p.name for p in logs_dir().glob("ps-transcript-*.log"))
+    assert left == ["ps-transcript-2.log", "ps-transcript-3.log"]
+
+    # 成功した実行でも古いトランスクリプトを整理する
+    old = logs_dir() / "ps-transcript-old.log"
+    old.write_text("fail", encoding="utf-8")
+    os.utime(old, (time.time() - 30 * 86400, time.time() - 30 * 86400))
+    ok.write_text("ok", encoding="utf-8")
+    pshost._finish_transcript(ok, 0)
+    assert not old.exists()
+
+
+def test_console_input_bypasses_pool(isolated_home, monkeypatch):
+    """入力を読むスクリプトや標準入力がパイプの場合はプールを使わない"""
+    prompt = isolated_home / "ask.ps1"
+    prompt.write_text("function NuroCmd_ask { $name = Read-Host 'name'; $name }\n", encoding="utf-8")
+    plain = isolated_home / "plain.ps1"
+    plain.write_text("function NuroCmd_plain { 'hi' }\n", encoding="utf-8")
+    assert pshost._needs_console_input(prompt)
+    assert not pshost._needs_console_input(plain)
+
+    r, w = os.pipe()
+    try:
+        with os.fdopen(r, "r") as piped:
+            monkeypatch.setattr(pshost.sys, "stdin", piped)
+            assert pshost._needs_console_input(plain)
+    finally:
+        os.close(w)
+
+
+@pytest.mark.skipif(shutil.which("pwsh") is None, reason="pwsh not installed")
+def test_real_pool_worker_round_trip(isolated_home, monkeypatch, capsys):
+    """実際のpwshワーカーで出力・exit N・ワーカーの再利用を確認する"""
+    monkeypatch.setenv("NURO_PS_POOL", "1")
+    # 標準入力がパイプでも(pytest -s など)プールを使う
+    monkeypatch.setattr(pshost.sys, "stdin", None)
+    script = isolated_home / "demo.ps1"
+    script.write_text(
+        "function NuroCmd_demo { Write-Output \"hi $($args[0])\"; if ($args[0] -eq 'fail') { exit 7 } }\n",
+        encoding="utf-8",
+    )
+    try:
+        assert pshost.run_cmd_for_ps1(script, "demo", ["there"]) == 0
+        assert "hi there" in capsys.readouterr().out
+        pid = json.loads((run_dir() / "pshost-0.json").read_text(encoding="utf-8-sig"))["pid"]
+
+        assert pshost.run_cmd_for_ps1(script, "demo", ["fail"]) == 7
+        assert "hi fail" in capsys.readouterr().out
+        assert json.loads((run_dir() / "pshost-0.json").read_text(encoding="utf-8-sig"))["pid"] == pid
+    finally:
+        for state in run_dir().glob("pshost-*.json"):
+            try:
+                os.kill(int(json.loads(state.read_text(encoding="utf-8-sig"))["pid"]), 9)
+            except (OSError, ValueError, KeyError):
+                pass
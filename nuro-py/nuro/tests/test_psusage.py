@@ -0,0 +1,24 @@
+from nuro.psusage import extract_static_usage
+
+
+def test_literal_forms():
+    """単一・二重引用符、ヒア文字列、複数行の出力を読み取れる"""
+    assert extract_static_usage("function NuroUsage_a { 'it''s' }", "a") == "it's"
+    assert extract_static_usage('function NuroUsage_a { "tab`there" }', "a") == "tab\there"
+    src = "function NuroUsage_a {\n  @'\nline1\n  $literal\n'@\n}"
+    assert extract_static_usage(src, "a") == "line1\n  $literal"
+    src = "function script:NuroUsage_A\n{\n  'one',\n  'two'; return 'three'\n  'never'\n}"
+    assert extract_static_usage(src, "a") == "one\ntwo\nthree"
+    assert extract_static_usage("function NuroUsage_a { Write-Output 'x' }", "a") == "x"
+
+
+def test_dynamic_or_missing_falls_back():
+    """評価が必要な本体や見つからない関数ではNoneを返す"""
+    assert extract_static_usage('function NuroUsage_a { "v$ver" }', "a") is None
+    assert extract_static_usage("function NuroUsage_a { Get-Help a }", "a") is None
+    assert extract_static_usage("function NuroUsage_a { 'x' + $y }", "a") is None
+    assert extract_static_usage("function NuroUsage_b { 'x' }", "a") is None
+    twice = "function NuroUsage_a { 'x' }\nfunction NuroUsage_a { 'y' }"
+    assert extract_static_usage(twice, "a") is None
+    # 文字列やコメント内の波括弧は本体の範囲に影響しない
+    assert extract_static_usage("function NuroUsage_a { '}' # }\n}", "a") == "}"
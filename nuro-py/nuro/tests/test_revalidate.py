@@ -0,0 +1,84 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from nuro import buckets, revalidate, runner
+from nuro.paths import cache_dir, cmds_cache_base
+from nuro.registry import load_registry, save_registry
+
+
+@pytest.fixture()
+def isolated_home(tmp_path, monkeypatch):
+    """一時ホームディレクトリを設定する"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    return tmp_path
+
+
+def _cache_script(bucket_name, checked_at):
+    dest = cmds_cache_base() / bucket_name / "hello.sh"
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_bytes(b"echo hi\n")
+    meta = {"url": "https://example.invalid/cmds/hello.sh", "fetched_at": checked_at, "checked_at": checked_at}
+    dest.with_name("hello.sh.meta.json").write_text(json.dumps(meta), encoding="utf-8")
+    return dest
+
+
+def test_stale_script_runs_and_revalidates_in_background(isolated_home, monkeypatch):
+    """max-ageを過ぎたスクリプトは即実行され、検証はバックグラウンドに回る"""
+    reg = load_registry()
+    reg["buckets"] = [{"name": "web", "uri": "github::o/r@main", "priority": 10, "max-age": 60}]
+    save_registry(reg)
+    dest = _cache_script("web", time.time() - 3600)
+    spawned = []
+    monkeypatch.setattr(revalidate.subprocess, "Popen", lambda cmd, **k: spawned.append(cmd))
+    monkeypatch.setattr(runner.subprocess, "call", lambda cmd, **k: 0)
+
+    assert runner.run_command("hello", []) == 0
+    assert spawned and spawned[0][1:] == ["-m", "nuro.revalidate", str(dest), "web"]
+
+    # 解決インデックス経由の実行でも同じ
+    assert runner.run_command("hello", []) == 0
+    assert len(spawned) == 2
+
+    # max-age以内ならネットワークにも子プロセスにも触れない
+    _cache_script("web", time.time())
+    assert runner.run_command("hello", []) == 0
+    assert len(spawned) == 2
+
+
+def test_background_worker_updates_cache(isolated_home):
+    """バックグラウンド側は条件付き取得で更新し、古い使用例を捨てる"""
+    state = {"body": b"echo v1\n"}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(state["body"])))
+            self.end_headers()
+            self.wfile.write(state["body"])
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        dest = cmds_cache_base() / "web" / "hello.sh"
+        buckets.fetch_to(dest, f"http://127.0.0.1:{srv.server_address[1]}/cmds/hello.sh")
+        ucache = cache_dir() / "usage" / "web" / "hello.txt"
+        ucache.parent.mkdir(parents=True)
+        ucache.write_text("old usage", encoding="utf-8")
+        state["body"] = b"echo v2\n"
+
+        assert revalidate.main([str(dest), "web"]) == 0
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+    assert dest.read_bytes() == b"echo v2\n"
+    assert not ucache.exists()
+    assert not revalidate.is_stale(dest, 60)
@@ -0,0 +1,456 @@
+import pytest
+
+from nuro import runner, resolution
+from nuro.registry import load_registry, save_registry
+
+
+@pytest.fixture()
+def isolated_home(tmp_path, monkeypatch):
+    """一時ホームディレクトリを設定する"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture()
+def local_bucket(isolated_home):
+    """hello.sh を持つローカルバケットを登録する"""
+    src = isolated_home / "bucket"
+    (src / "cmds").mkdir(parents=True)
+    (src / "cmds" / "hello.sh").write_text("echo hello\n", encoding="utf-8")
+    reg = load_registry()
+    reg["buckets"] = [{"name": "loc", "uri": f"local::{src}", "priority": 10}]
+    save_registry(reg)
+    return src
+
+
+def test_resolution_index_skips_registry_on_warm_run(local_bucket, monkeypatch):
+    """2回目以降は解決インデックスから直接スクリプトを実行する"""
+    calls = []
+    monkeypatch.setattr(runner.subprocess, "call", lambda cmd: calls.append(cmd) or 0)
+
+    assert runner.run_command("hello", []) == 0
+    hit = resolution.lookup("hello")
+    assert hit is not None and hit.bucket == "loc" and hit.ext == "sh"
+
+    def no_registry():
+        raise AssertionError("registry should not be loaded on warm path")
+
+    monkeypatch.setattr(runner, "load_registry", no_registry)
+    assert runner.run_command("hello", ["x"]) == 0
+    assert calls[-1][-1] == "x"
+    assert calls[-1][1] == str(hit.path)
+
+
+def test_resolution_index_invalidated_by_registry_save(local_bucket, monkeypatch):
+    """buckets.json を保存するとインデックスは無効になる"""
+    monkeypatch.setattr(runner.subprocess, "call", lambda cmd: 0)
+    runner.run_command("hello", [])
+    assert resolution.lookup("hello") is not None
+
+    save_registry(load_registry())
+    assert resolution.lookup("hello") is None
+
+
+def test_concurrent_fetch_is_single_flight(isolated_home, monkeypatch):
+    """同じコマンドを同時に取得しても実際のダウンロードは1回だけ"""
+    import threading
+    import time
+
+    from nuro import buckets, manifest
+    from nuro.fsutil import atomic_write_bytes
+
+    reg = load_registry()
+    reg["buckets"] = [{"name": "web", "uri": "raw::https://example.invalid/base", "priority": 10}]
+    save_registry(reg)
+    calls = []
+
+    def fake_fetch(src, dest, timeout=None):
+        calls.append(dest)
+        time.sleep(0.2)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(dest, b"echo hi\n")
+        return True
+
+    monkeypatch.setattr(buckets, "fetch_source", fake_fetch)
+    monkeypatch.setattr(buckets, "probe_source", lambda src, timeout=None: True)
+    monkeypatch.setattr(manifest, "load_bucket_manifest", lambda b: None)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(runner._try_fetch_any("hi", load_registry(), None)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r is not None and r[0] == calls[0] for r in results)
+
+
+def test_requirements_installed_into_isolated_env(isolated_home, monkeypatch):
+    """不足要件は要件セットごとの環境に1回のpip実行で入れ、次回は再利用する"""
+    script = isolated_home / "tool.py"
+    script.write_text('__requires__ = ["pytest>=1.0", "nuro-missing-a>=2", "Nuro_Missing_B ~= 1.0"]\n', encoding="utf-8")
+    calls = []
+
+    def fake_call(cmd, **kw):
+        calls.append(cmd)
+        if "--target" in cmd:
+            target = cmd[cmd.index("--target") + 1]
+            (isolated_home / target).mkdir(parents=True, exist_ok=True)
+        return 0
+
+    monkeypatch.setattr(runner.subprocess, "call", fake_call)
+
+    ok, site = runner._script_env(script)
+    assert ok and site is not None and site.parent.parent.name == "envs"
+    assert [c[3:5] for c in calls] == [["--disable-pip-version-check", "-q"]] * 2
+    assert calls[0][5] == "wheel" and calls[1][5] == "install"
+    assert calls[1][-3:] == ["nuro-missing-a>=2", "nuro-missing-b~=1.0", "pytest>=1.0"]
+
+    assert runner._script_env(script) == (True, site)
+    assert len(calls) == 2
+
+    other = isolated_home / "other.py"
+    other.write_text('__requires__ = ["nuro-missing-a==1.0"]\n', encoding="utf-8")
+    _, other_site = runner._script_env(other)
+    assert other_site != site
+
+
+def test_requirements_checked_only_against_running_interpreter(isolated_home, monkeypatch):
+    """別のインタプリタで動くスクリプトはnuro側のインストール状況を信用しない"""
+    import os
+    import sys
+    import time
+
+    from nuro.fsutil import file_lock
+
+    script = isolated_home / "tool.py"
+    script.write_text('__requires__ = ["pytest>=1.0"]\n', encoding="utf-8")
+    calls = []
+
+    def fake_call(cmd, **kw):
+        calls.append(cmd)
+        if "--target" in cmd:
+            (isolated_home / cmd[cmd.index("--target") + 1]).mkdir(parents=True, exist_ok=True)
+        return 0
+
+    monkeypatch.setattr(runner.subprocess, "call", fake_call)
+    monkeypatch.setattr(runner, "_python_exe", lambda: sys.executable)
+    assert runner._script_env(script) == (True, None)
+    assert calls == []
+
+    monkeypatch.setattr(runner, "_python_exe", lambda: str(isolated_home / "other" / "python"))
+    ok, site = runner._script_env(script)
+    assert ok and site is not None and len(calls) == 2
+
+    # 使用中(ロック中)の環境はGCで消さない
+    monkeypatch.setattr(
+        "nuro.config.py_env_settings", lambda cfg=None: {"max_envs": 1, "max_age_days": 0}
+    )
+    newer = site.parent.parent / "newer"
+    newer.mkdir()
+    (newer / "env.json").write_text("{}", encoding="utf-8")
+    os.utime(site.parent / "env.json", (time.time() - 60, time.time() - 60))
+    with file_lock(str(site.parent)):
+        runner._gc_envs(keep=newer)
+    assert site.exists()
+    runner._gc_envs(keep=newer)
+    assert not site.exists()
+
+
+def test_python_command_runs_in_process(isolated_home, monkeypatch, capsys):
+    """同じインタプリタならサブプロセスを使わずmain(argv)を呼び、SystemExitを終了コードにする"""
+    import sys
+
+    monkeypatch.setattr(runner, "_python_exe", lambda: sys.executable)
+    monkeypatch.setattr(runner.subprocess, "call", lambda *a, **k: pytest.fail("subprocess used"))
+    script = isolated_home / "hello.py"
+    script.write_text("def main(argv):\n    print('args', argv)\n    return 3\n", encoding="utf-8")
+    assert runner._dispatch("hello", ["a", "b"], script, "py", None, False) == 3
+    assert "args ['a', 'b']" in capsys.readouterr().out
+
+    script.write_text("import sys\nsys.exit(5)\n", encoding="utf-8")
+    assert runner._dispatch("hello", [], script, "py", None, False) == 5
+    assert sys.argv[0] != str(script)
+
+    monkeypatch.setenv("NURO_PY_SUBPROCESS", "1")
+    calls = []
+    monkeypatch.setattr(runner.subprocess, "call", lambda cmd, **k: calls.append(cmd) or 0)
+    assert runner._dispatch("hello", [], script, "py", None, False) == 0
+    assert calls and calls[0][0] == sys.executable
+
+
+def test_inprocess_run_uses_hash_checked_bytecode(isolated_home, monkeypatch):
+    """キャッシュ済みpycを使い、ソースが変わればハッシュ不一致で作り直す"""
+    import sys
+
+    from nuro import pycache
+
+    monkeypatch.setattr(runner, "_python_exe", lambda: sys.executable)
+    script = isolated_home / "calc.py"
+    script.write_text("def main(argv):\n    return 4\n", encoding="utf-8")
+    assert pycache.compile_cached(script)
+    pyc = pycache.cache_path(script)
+    assert pyc.parent.name == "__pycache__"
+
+    compiled = []
+    real_compile = pycache._compile_and_store
+    monkeypatch.setattr(pycache, "_compile_and_store", lambda *a: compiled.append(a[0]) or real_compile(*a))
+    assert runner._dispatch("calc", [], script, "py", None, False) == 4
+    assert compiled == []
+
+    script.write_text("def main(argv):\n    return 6\n", encoding="utf-8")
+    assert runner._dispatch("calc", [], script, "py", None, False) == 6
+    assert compiled == [script]
+
+
+def test_subprocess_run_uses_hash_checked_bytecode(isolated_home, monkeypatch):
+    """子プロセス実行でもハッシュの一致するpycを読み、ソースが変われば作り直す"""
+    import importlib.util
+    import marshal
+    import sys
+
+    from nuro import pycache
+
+    monkeypatch.setattr(runner, "_python_exe", lambda: sys.executable)
+    monkeypatch.setenv("NURO_PY_SUBPROCESS", "1")
+    script = isolated_home / "calc.py"
+    script.write_text("import sys\ndef main(argv):\n    return int(argv[0])\n", encoding="utf-8")
+    assert pycache.compile_cached(script)
+    pyc = pycache.cache_path(script)
+    # same source hash, different body: only a pyc-loading run returns 9
+    data = pyc.read_bytes()
+    pyc.write_bytes(data[:16] + marshal.dumps(compile("def main(argv):\n    return 9\n", str(script), "exec")))
+    assert runner._dispatch("calc", ["3"], script, "py", None, False) == 9
+
+    script.write_text("def main(argv):\n    return int(argv[0]) + 1\n", encoding="utf-8")
+    assert runner._dispatch("calc", ["3"], script, "py", None, False) == 4
+    assert pyc.read_bytes()[8:16] == importlib.util.source_hash(script.read_bytes())
+
+
+def test_not_found_answers_are_cached(isolated_home, monkeypatch):
+    """存在しないコマンド・拡張子への404は記録され、次回は問い合わせない"""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from nuro import negcache
+
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            requests.append(self.path)
+            body = b"print('hi')\n" if self.path == "/b/cmds/hello.py" else None
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Length", str(len(body or b"")))
+            self.end_headers()
+            self.wfile.write(body or b"")
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    reg = {"buckets": [{"name": "web", "uri": f"raw::http://127.0.0.1:{srv.server_address[1]}/b", "priority": 10}]}
+    try:
+        assert runner._try_fetch_any("helo", reg, None) is None
+        assert runner._try_fetch_any("hello", reg, None)[1] == "py"
+        probes = [r for r in requests if not r.endswith("index.json")]
+        assert probes == ["/b/cmds/helo.ps1", "/b/cmds/helo.py", "/b/cmds/helo.sh", "/b/cmds/hello.ps1", "/b/cmds/hello.py"]
+
+        # 2回目は.ps1も打ち間違いも通信せずに済む
+        (isolated_home / ".nuro" / "cache" / "cmds" / "web" / "hello.py").unlink()
+        assert runner._try_fetch_any("helo", reg, None) is None
+        assert runner._try_fetch_any("hello", reg, None)[1] == "py"
+        assert [r for r in requests if not r.endswith("index.json")] == probes + ["/b/cmds/hello.py"]
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+    # TTLが切れれば再確認するが、コミット固定のバケットの記録は消えない
+    monkeypatch.setattr(negcache, "_ttl", lambda: 0.0)
+    pinned = {"name": "p", "uri": "github::o/r@main", "sha1-hash": "e" * 40}
+    cache = negcache.NegativeCache()
+    cache.add(reg["buckets"][0], "gone", "ps1")
+    cache.add(pinned, "gone", "ps1")
+    cache.save()
+    negcache.clear(keep_immutable=True)
+    cache = negcache.NegativeCache()
+    assert not cache.is_missing(reg["buckets"][0], "gone", "ps1")
+    assert cache.is_missing(pinned, "gone", "ps1")
+
+
+def test_negative_cache_merges_concurrent_saves(isolated_home):
+    """別プロセスが先に保存した記録を上書きで失わない"""
+    from nuro import negcache
+
+    bucket = {"name": "web", "uri": "raw::https://example.invalid/b"}
+    first, second = negcache.NegativeCache(), negcache.NegativeCache()
+    first.add(bucket, "a", "ps1")
+    second.add(bucket, "b", "ps1")
+    first.save()
+    second.save()
+    cache = negcache.NegativeCache()
+    assert cache.is_missing(bucket, "a", "ps1") and cache.is_missing(bucket, "b", "ps1")
+
+    cache.discard(bucket, "a", "ps1")
+    cache.save()
+    cache = negcache.NegativeCache()
+    assert not cache.is_missing(bucket, "a", "ps1") and cache.is_missing(bucket, "b", "ps1")
+
+
+def test_candidates_probed_in_parallel_and_priority_wins(isolated_home, monkeypatch):
+    """候補はまとめて並列に確認し、先に応答した低優先度より高優先度のヒットを選ぶ"""
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from nuro import manifest
+
+    monkeypatch.setattr(manifest, "load_bucket_manifest", lambda b: None)
+    files = {"/slow/cmds/tool.py": b"print('slow')\n", "/fast/cmds/tool.ps1": b"Write-Output fast\n"}
+    requests = []
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _answer(self, with_body):
+            requests.append((self.command, self.path))
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            if self.path.startswith("/slow/"):
+                time.sleep(0.3)
+            with lock:
+                state["active"] -= 1
+            body = files.get(self.path)
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Length", str(len(body or b"")))
+            self.end_headers()
+            if with_body:
+                self.wfile.write(body or b"")
+
+        def do_HEAD(self):
+            self._answer(False)
+
+        def do_GET(self):
+            self._answer(True)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"raw::http://127.0.0.1:{srv.server_address[1]}"
+    reg = {
+        "buckets": [
+            {"name": "fast", "uri": f"{base}/fast", "priority": 1},
+            {"name": "slow", "uri": f"{base}/slow", "priority": 10},
+        ],
+        "pins": {"tool": "slow"},
+    }
+    try:
+        assert [b["name"] for b in runner._bucket_resolution_order("tool", reg, "slow")] == ["slow", "fast"]
+        assert [b["name"] for b in runner._bucket_resolution_order("tool", reg, "fast")] == ["fast", "slow"]
+
+        path, ext, bucket = runner._try_fetch_any("tool", reg, None)
+        assert (bucket["name"], ext) == ("slow", "py")
+        assert path.read_bytes() == files["/slow/cmds/tool.py"]
+        assert state["peak"] > 1
+        assert [r for r in requests if r[0] == "GET"] == [("GET", "/slow/cmds/tool.py")]
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+
+def test_github_listing_miss_needs_no_probe(isolated_home, monkeypatch):
+    """GitHubの一覧にないファイルはHEADで確認せず不在とみなす"""
+    from nuro import buckets, manifest
+    from nuro.fsutil import atomic_write_bytes
+
+    listing = [{"name": "hello.py", "type": "file", "sha": "a" * 40, "download_url": "https://example.invalid/hello.py"}]
+    heads, fetched = [], []
+
+    def fake_fetch(src, dest, timeout=None):
+        fetched.append(src["url"])
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(dest, b"print('hi')\n")
+        return True
+
+    monkeypatch.setattr(buckets, "_list_github_cmds", lambda owner, repo, ref: listing)
+    monkeypatch.setattr(buckets.HttpSession, "head", lambda self, url, *a, **k: heads.append(url))
+    monkeypatch.setattr(buckets, "fetch_source", fake_fetch)
+    monkeypatch.setattr(manifest, "load_bucket_manifest", lambda b: None)
+    reg = {"buckets": [{"name": "gh", "uri": "github::o/r@main", "priority": 10}]}
+
+    assert runner._try_fetch_any("nope", reg, None) is None
+    path, ext, bucket = runner._try_fetch_any("hello", reg, None)
+    assert ext == "py" and fetched == ["https://example.invalid/hello.py"]
+    assert heads == []
+
+
+def test_found_command_clears_negative_entry(isolated_home):
+    """後から取得できたコマンドの「見つからない」記録は消す"""
+    from nuro import negcache
+
+    bucket = {"name": "web", "uri": "raw::https://example.invalid/b", "priority": 10}
+    cache = negcache.NegativeCache()
+    cache.add(bucket, "hello", "ps1")
+    cache.save()
+    # e.g. nuro sync fetched it in the meantime
+    dest = isolated_home / ".nuro" / "cache" / "cmds" / "web" / "hello.ps1"
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_text("Write-Output hi\n", encoding="utf-8")
+    assert runner._try_fetch_any("hello", {"buckets": [bucket]}, None)[0] == dest
+    assert not negcache.NegativeCache().is_missing(bucket, "hello", "ps1")
+
+
+def test_no_lower_priority_probe_after_a_hit(isolated_home, monkeypatch):
+    """ヒットした候補より後の確認は始めず、取得に失敗したときだけその場で確認する"""
+    import threading
+    import time
+
+    from nuro import buckets
+    from nuro.fsutil import atomic_write_bytes
+
+    reg = {"buckets": [{"name": f"b{i}", "uri": f"raw::https://example.invalid/{i}", "priority": 10 - i} for i in range(3)]}
+    probed = []
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_probe(b, cmd, ext, bucket_lock):
+        with lock:
+            probed.append((b["name"], ext, threading.current_thread() is threading.main_thread()))
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.01)
+        with lock:
+            state["active"] -= 1
+        if (b["name"], ext) in (("b0", "py"), ("b1", "sh")):
+            return True, {"kind": "url", "url": f"https://example.invalid/{b['name']}/{cmd}.{ext}"}
+        return False, None
+
+    def fake_fetch(src, dest, timeout=None):
+        if "/b0/" in src["url"]:
+            raise OSError("connection reset")
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(dest, b"echo hi\n")
+        return True
+
+    monkeypatch.setattr(runner, "_probe_candidate", fake_probe)
+    monkeypatch.setattr(runner, "_probe_workers", lambda: 1)
+    monkeypatch.setattr(buckets, "fetch_source", fake_fetch)
+
+    path, ext, bucket = runner._try_fetch_any("tool", reg, None)
+    assert (bucket["name"], ext) == ("b1", "sh")
+    assert state["peak"] == 1
+    # b0.py hit: nothing after it was started; once its fetch failed the rest was probed in place
+    assert [p[:2] for p in probed if not p[2]] == [("b0", "ps1"), ("b0", "py")]
+    assert [p[:2] for p in probed if p[2]] == [("b0", "sh"), ("b1", "ps1"), ("b1", "py"), ("b1", "sh")]
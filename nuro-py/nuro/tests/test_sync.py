@@ -0,0 +1,193 @@
+import io
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from nuro import buckets, cli, manifest, resolution
+from nuro.paths import cmds_cache_base, objects_dir
+from nuro.registry import load_registry, save_registry
+
+
+@pytest.fixture()
+def isolated_home(tmp_path, monkeypatch):
+    """一時ホームディレクトリを設定する"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture()
+def local_bucket(isolated_home):
+    """ps1/py/sh と無関係なファイルを持つローカルバケットを登録する"""
+    src = isolated_home / "bucket"
+    (src / "cmds").mkdir(parents=True)
+    (src / "cmds" / "a.ps1").write_text("function NuroCmd_a {}\n", encoding="utf-8")
+    (src / "cmds" / "b.py").write_text("def main(argv):\n    return 0\n", encoding="utf-8")
+    (src / "cmds" / "c.sh").write_text("echo c\n", encoding="utf-8")
+    (src / "cmds" / "README.md").write_text("x\n", encoding="utf-8")
+    reg = load_registry()
+    reg["buckets"] = [{"name": "loc", "uri": f"local::{src}", "priority": 10}]
+    save_registry(reg)
+    return src
+
+
+def test_sync_prefetches_every_script(local_bucket, capsys):
+    """syncでバケットの全スクリプトをキャッシュし、2回目は更新しない"""
+    assert cli.main(["sync"]) == 0
+    cached = sorted(p.name for p in (cmds_cache_base() / "loc").iterdir() if p.is_file())
+    assert cached == ["a.ps1", "b.py", "c.sh"]
+    assert list((cmds_cache_base() / "loc" / "__pycache__").glob("b.*.pyc"))
+    assert "3 commands (3 updated" in capsys.readouterr().out
+
+    assert cli.main(["sync", "loc"]) == 0
+    assert "(0 updated, 3 up to date)" in capsys.readouterr().out
+    assert resolution.lookup("c") is None
+
+
+def test_sync_rejects_unknown_bucket(local_bucket, capsys):
+    """存在しないバケット名はエラーになる"""
+    assert cli.main(["sync", "nope"]) == 1
+    assert "unknown bucket: nope" in capsys.readouterr().err
+
+
+def test_list_bucket_commands_from_github_listing(isolated_home, monkeypatch):
+    """GitHubバケットは一覧APIからスクリプトだけを列挙する"""
+    listing = [
+        {"name": "a.ps1", "type": "file"},
+        {"name": "b.py", "type": "file"},
+        {"name": "notes.txt", "type": "file"},
+        {"name": "sub", "type": "dir"},
+    ]
+    monkeypatch.setattr(buckets, "_list_github_cmds", lambda owner, repo, ref: listing)
+    monkeypatch.setattr(manifest, "load_bucket_manifest", lambda b: None)
+    found = buckets.list_bucket_commands({"name": "g", "uri": "github::o/r@main"})
+    assert found == [("a", "ps1"), ("b", "py")]
+    assert buckets.list_bucket_commands({"name": "r", "uri": "raw::https://example.invalid/x"}) is None
+
+
+def _tarball(files):
+    """メモリ上にtar.gzを作る"""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def test_sync_pinned_bucket_from_one_archive(isolated_home, monkeypatch, capsys):
+    """sha固定のGitHubバケットはtarball 1回の取得でcmds/*だけを展開する"""
+    sha = "b" * 40
+    archive = _tarball(
+        {
+            f"r-{sha}/cmds/hello.ps1": b"function NuroCmd_hello {}\n",
+            f"r-{sha}/cmds/tool.py": b"def main(argv):\n    return 0\n",
+            f"r-{sha}/cmds/nested/skip.ps1": b"x",
+            f"r-{sha}/README.md": b"readme",
+        }
+    )
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            requests.append(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-gzip")
+            self.send_header("Content-Length", str(len(archive)))
+            self.end_headers()
+            self.wfile.write(archive)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    monkeypatch.setattr(buckets, "_github_archive_base", lambda: f"http://127.0.0.1:{srv.server_address[1]}")
+
+    def no_listing(*a):
+        raise AssertionError("listing should not be needed")
+
+    monkeypatch.setattr(buckets, "_list_github_cmds", no_listing)
+    reg = load_registry()
+    reg["buckets"] = [{"name": "pinned", "uri": "github::o/r@main", "sha1-hash": sha, "priority": 10}]
+    save_registry(reg)
+    try:
+        assert cli.main(["sync", "pinned"]) == 0
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+    assert requests == [f"/o/r/tar.gz/{sha}"]
+    cached = cmds_cache_base() / "pinned"
+    scripts = [p.name for p in cached.glob("*.*") if not p.name.endswith(".meta.json") and not p.name.startswith(".")]
+    assert sorted(scripts) == ["hello.ps1", "tool.py"]
+    assert (cached / "hello.ps1").read_bytes() == b"function NuroCmd_hello {}\n"
+    meta = buckets.read_fetch_meta(cached / "hello.ps1")
+    assert (objects_dir() / meta["sha"]).exists()
+
+    assert "2 commands (from archive" in capsys.readouterr().out
+
+    # 2回目は不変キャッシュの記録だけで完了し、通信しない
+    assert cli.main(["sync", "pinned"]) == 0
+    assert requests == [f"/o/r/tar.gz/{sha}"]
+    assert "already cached" in capsys.readouterr().out
+
+
+def test_sync_uses_bucket_manifest(isolated_home, monkeypatch, capsys):
+    """マニフェストのあるバケットは一覧APIを使わず、sha256を検証して取得する"""
+    import hashlib
+    import json
+
+    files = {"/b/cmds/hello.ps1": b"function NuroCmd_hello {}\n", "/b/cmds/tool.py": b"tampered\n"}
+    index = {
+        "version": 1,
+        "commands": [
+            {"name": "hello", "ext": "ps1", "size": 26, "sha256": hashlib.sha256(files["/b/cmds/hello.ps1"]).hexdigest()},
+            {"name": "tool", "ext": "py", "size": 9, "sha256": "0" * 64},
+        ],
+    }
+    files["/b/cmds/index.json"] = json.dumps(index).encode("utf-8")
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            requests.append(self.path)
+            body = files.get(self.path)
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Length", str(len(body or b"")))
+            self.end_headers()
+            self.wfile.write(body or b"")
+
+        def log_message(self, *args):
+            pass
+
+    def no_listing(*a):
+        raise AssertionError("listing should not be needed")
+
+    monkeypatch.setattr(buckets, "_list_github_cmds", no_listing)
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    reg = load_registry()
+    reg["buckets"] = [{"name": "web", "uri": f"raw::http://127.0.0.1:{srv.server_address[1]}/b", "priority": 10}]
+    save_registry(reg)
+    try:
+        assert cli.main(["sync", "web"]) == 1
+        assert "sync failed for web:tool.py" in capsys.readouterr().err
+        cached = cmds_cache_base() / "web"
+        assert (cached / "hello.ps1").read_bytes() == files["/b/cmds/hello.ps1"]
+        assert not (cached / "tool.py").exists()
+
+        # 2回目はsha256が一致するhello.ps1を再取得しない
+        del requests[:]
+        cli.main(["sync", "web"])
+        assert "/b/cmds/hello.ps1" not in requests
+    finally:
+        srv.shutdown()
+        srv.server_close()
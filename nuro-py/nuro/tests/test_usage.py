@@ -0,0 +1,141 @@
+import pytest
+
+from nuro import usage
+from nuro.paths import cache_dir, cmds_cache_base
+from nuro.pshost import UsageCaptureResult
+
+
+@pytest.fixture()
+def isolated_home(tmp_path, monkeypatch):
+    """一時ホームディレクトリを設定する"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    return tmp_path
+
+
+def test_cold_usage_cache_uses_single_batch(isolated_home, monkeypatch, capsys):
+    """使用例キャッシュが空でもPowerShell呼び出しは1回にまとめられる"""
+    ps1_dir = cmds_cache_base() / "official"
+    ps1_dir.mkdir(parents=True)
+    for n in ("alpha", "beta"):
+        # 変数を含むので静的には読めない
+        (ps1_dir / f"{n}.ps1").write_text(f"function NuroUsage_{n} {{ \"nuro $name\" }}", encoding="utf-8")
+
+    calls = []
+
+    def fake_batch(items, ignore_execution_policy=False):
+        items = list(items)
+        calls.append(items)
+        return {
+            "alpha": UsageCaptureResult("nuro alpha <x>", None, None),
+            "beta": UsageCaptureResult("", "ps5", "ParserError"),
+        }
+
+    monkeypatch.setattr(usage, "run_usage_batch_capture", fake_batch)
+    monkeypatch.setattr(usage, "load_bucket_manifest", lambda b: None)
+
+    usage.print_root_usage()
+
+    assert len(calls) == 1
+    assert sorted(n for _, n in calls[0]) == ["alpha", "beta"]
+    ucache = cache_dir() / "usage" / "official"
+    assert (ucache / "alpha.txt").read_text(encoding="utf-8") == "nuro alpha <x>"
+    assert (ucache / "beta.txt").read_text(encoding="utf-8") == "PowerShell 5では表示できません"
+    out = capsys.readouterr().out
+    assert "nuro alpha <x>" in out
+
+    # 2回目はキャッシュのみで描画される
+    usage.print_root_usage()
+    assert len(calls) == 1
+
+
+def test_refresh_reports_failures_without_stalling(isolated_home, monkeypatch, capsys):
+    """更新時に一部のコマンドが失敗しても他のコマンドは処理される"""
+    ps1_dir = cmds_cache_base() / "official"
+    ps1_dir.mkdir(parents=True)
+    ucache = cache_dir() / "usage" / "official"
+    ucache.mkdir(parents=True)
+    monkeypatch.setenv("NURO_REFRESH_WORKERS", "4")
+
+    def fake_resolve(bucket, name, ext="ps1"):
+        return {"kind": "remote", "url": f"https://example.invalid/{name}.ps1"}
+
+    def fake_fetch(src, path, timeout=60):
+        if "broken" in src["url"]:
+            raise OSError("HTTP 500")
+        path.write_text("function NuroUsage_x { 'x' }", encoding="utf-8")
+
+    def fake_batch(items, ignore_execution_policy=False):
+        return {n: UsageCaptureResult(f"nuro {n}", None, None) for _, n in items}
+
+    monkeypatch.setattr(usage, "resolve_cmd_source_with_meta", fake_resolve)
+    monkeypatch.setattr(usage, "fetch_source", fake_fetch)
+    monkeypatch.setattr(usage, "run_usage_batch_capture", fake_batch)
+
+    names = ["a", "broken", "c"]
+    texts = usage._collect_usage_texts(names, {"name": "official"}, ps1_dir, ucache, True)
+
+    assert texts["a"] == "nuro a"
+    assert texts["c"] == "nuro c"
+    assert texts["broken"] == ""
+    assert (ucache / "c.txt").read_text(encoding="utf-8") == "nuro c"
+    assert not (ucache / "broken.txt").exists()
+    assert "refresh failed for broken" in capsys.readouterr().err
+
+
+def test_literal_usage_needs_no_powershell(isolated_home, monkeypatch):
+    """リテラルだけの使用例はPowerShellを起動せずに読み取られる"""
+    ps1_dir = cmds_cache_base() / "official"
+    ps1_dir.mkdir(parents=True)
+    (ps1_dir / "get.ps1").write_text(
+        "\ufeffparam([string]$Url)\n"
+        "function NuroUsage_Get {\n  # コメント\n  'nuro get -Url <https://...>'\n}\n"
+        "if ($env:NURO_DEBUG -eq '1') { echo \"debug get\" }\n",
+        encoding="utf-8",
+    )
+    (ps1_dir / "dyn.ps1").write_text('function NuroUsage_dyn { "nuro $(Get-Date)" }', encoding="utf-8")
+    ucache = cache_dir() / "usage" / "official"
+    ucache.mkdir(parents=True)
+    calls = []
+
+    def fake_batch(items, ignore_execution_policy=False):
+        items = list(items)
+        calls.append(items)
+        return {n: UsageCaptureResult(f"nuro {n} (pwsh)", None, None) for _, n in items}
+
+    monkeypatch.setattr(usage, "run_usage_batch_capture", fake_batch)
+
+    texts = usage._collect_usage_texts(["get", "dyn"], {"name": "official"}, ps1_dir, ucache, False)
+
+    assert texts["get"] == "nuro get -Url <https://...>"
+    assert (ucache / "get.txt").read_text(encoding="utf-8") == "nuro get -Url <https://...>"
+    assert [n for _, n in calls[0]] == ["dyn"]
+    assert texts["dyn"] == "nuro dyn (pwsh)"
+
+
+def test_items_missing_from_batch_are_captured_alone(isolated_home, monkeypatch):
+    """途中でexitしたスクリプト以降のコマンドは失敗として保存せず個別に取得する"""
+    ps1_dir = cmds_cache_base() / "official"
+    ps1_dir.mkdir(parents=True)
+    for n in ("alpha", "beta", "gamma"):
+        (ps1_dir / f"{n}.ps1").write_text(f"function NuroUsage_{n} {{ \"nuro $name\" }}", encoding="utf-8")
+    singles = []
+
+    def fake_batch(items, ignore_execution_policy=False):
+        # alpha の後でセッションが終了した
+        return {"alpha": UsageCaptureResult("nuro alpha", None, None)}
+
+    def fake_single(target, name, ignore_execution_policy=False):
+        singles.append(name)
+        return UsageCaptureResult(f"nuro {name} alone", None, None)
+
+    monkeypatch.setattr(usage, "run_usage_batch_capture", fake_batch)
+    monkeypatch.setattr(usage, "run_usage_for_ps1_capture", fake_single)
+    monkeypatch.setattr(usage, "load_bucket_manifest", lambda b: None)
+
+    usage.print_root_usage()
+
+    assert sorted(singles) == ["beta", "gamma"]
+    ucache = cache_dir() / "usage" / "official"
+    assert (ucache / "beta.txt").read_text(encoding="utf-8") == "nuro beta alone"
+    assert (ucache / "gamma.txt").read_text(encoding="utf-8") == "nuro gamma alone"
@@ -1,18 +1,29 @@
 from __future__ import annotations
 
-import json
 import os
-import urllib.request
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 
-from .paths import ps1_dir, cache_dir
-from .debuglog import debug
+from .paths import ps1_dir, cache_dir, cmds_cache_base, github_cache_dir, manifest_cache_dir, objects_dir
+from .debuglog import debug, warning
+from .fsutil import atomic_write_text
 from . import __version__
 from .registry import load_registry
+from . import negcache, pincache, pycache, resolution
 from .config import official_bucket_base, load_app_config
-from .pshost import run_usage_for_ps1_capture
-from .buckets import resolve_cmd_source_with_meta, fetch_to
+from .pshost import UsageCaptureResult, run_usage_batch_capture, run_usage_for_ps1_capture
+from .psusage import static_usage_for_ps1
+from .manifest import clear_manifest_cache, entry_source, load_bucket_manifest
+from .buckets import (
+    clear_listing_cache,
+    fetch_source,
+    list_github_cmds,
+    read_fetch_meta,
+    resolve_cmd_source_with_meta,
+    revalidate_cached,
+)
 from .paths import logs_dir, ensure_tree
 from urllib.parse import urlparse
 import shutil
@@ -43,14 +54,31 @@ def _parse_owner_repo_ref_from_base(base: str) -> Tuple[str, str, str] | None:
     return owner, repo, ref
 
 
+def _official_bucket() -> Dict[str, Any]:
+    """The registry's official bucket, or one synthesized from config.json."""
+    for b in load_registry().get("buckets", []):
+        if b.get("name") == "official":
+            return b
+    base = official_bucket_base(load_app_config())
+    return {
+        "name": "official",
+        "uri": f"raw::{base}",
+        "priority": 100,
+        "trusted": True,
+    }
+
+
 def _list_remote_commands() -> List[str]:
-    """List commands from the official bucket via GitHub API if possible.
+    """List commands of the official bucket from its manifest or GitHub.
 
-    We parse owner/repo from the configured raw base URL and query
-    the GitHub contents API for the "cmds" folder. If parsing fails,
-    we return an empty list.
+    A published cmds/index.json is preferred. Otherwise we parse owner/repo
+    from the configured raw base URL and read the "cmds" folder through the
+    shared GitHub listing cache. If both fail, we return an empty list.
     """
     try:
+        entries = load_bucket_manifest(_official_bucket())
+        if entries is not None:
+            return sorted(e.name for e in entries if e.ext == "ps1")
         cfg = load_app_config()
         base = official_bucket_base(cfg)
         parsed = _parse_owner_repo_ref_from_base(base)
@@ -65,11 +93,7 @@ def _list_remote_commands() -> List[str]:
                 if sha:
                     ref = sha
                 break
-        api_url = f"https://api.github.com/repos/{owner}/{repo}/contents/cmds?ref={ref}"
-        debug(f"GitHub API URL (list commands): {api_url}")
-        req = urllib.request.Request(api_url, headers={"User-Agent": "nuro"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        data = list_github_cmds(owner, repo, ref)
         names: List[str] = []
         for item in data:
             name = item.get("name", "")
@@ -83,21 +107,245 @@ def _list_remote_commands() -> List[str]:
  # Python-implemented commands are no longer enumerated or displayed here.
 
 
+_USAGE_UNAVAILABLE = "ヘルプを取得できませんでした。"
+_USAGE_PS5 = "PowerShell 5では表示できません"
+
+
+def _usage_text_from_result(name: str, result: UsageCaptureResult) -> str:
+    if result.error_kind:
+        if result.error_detail:
+            warning(f"Usage capture error for {name}: {result.error_detail}")
+        return _USAGE_PS5 if result.error_kind == "ps5" else _USAGE_UNAVAILABLE
+    return result.text
+
+
+_DEFAULT_REFRESH_WORKERS = 8
+# Commands per PowerShell batch before another session is started in parallel
+_USAGE_BATCH_MIN = 8
+
+
+def _refresh_workers() -> int:
+    env = os.environ.get("NURO_REFRESH_WORKERS", "").strip()
+    try:
+        if env:
+            return max(1, int(env))
+        return max(1, int(load_app_config().get("refresh_workers") or _DEFAULT_REFRESH_WORKERS))
+    except (TypeError, ValueError):
+        return _DEFAULT_REFRESH_WORKERS
+
+
+def _write_usage_cache(ucache_dir: Path, name: str, text: str) -> None:
+    try:
+        atomic_write_text(ucache_dir / f"{name}.txt", text)
+    except Exception:
+        pass
+
+
+def _revalidate_script_cache() -> None:
+    """Bring cached scripts up to date with conditional requests.
+
+    Scripts fetched over HTTP are revalidated in parallel (a 304 costs no body
+    transfer); copies without fetch metadata are dropped and re-resolved on
+    demand. Caches of buckets pinned to a commit are left alone.
+    """
+    base = cmds_cache_base()
+    if not base.exists():
+        return
+    # caches of buckets pinned to a commit cannot change
+    immutable = {str(b.get("name", "")) for b in load_registry().get("buckets", []) if pincache.is_current(b)}
+    remote: List[Path] = []
+    for p in base.rglob("*"):
+        # dot-files are in-flight atomic writes of another process
+        if not p.is_file() or p.name.endswith(".meta.json") or p.name.startswith("."):
+            continue
+        if p.parent.name == "__pycache__":
+            continue
+        if p.relative_to(base).parts[0] in immutable and p.parent != base:
+            continue
+        if read_fetch_meta(p):
+            remote.append(p)
+            continue
+        try:
+            p.unlink()
+        except OSError:
+            pass
+        pycache.invalidate(p)
+    if not remote:
+        return
+
+    def _one(p: Path) -> None:
+        try:
+            changed = revalidate_cached(p)
+            debug(f"Revalidated {p}: {'updated' if changed else 'not modified'}")
+            if changed and p.suffix == ".py":
+                if p.exists():
+                    pycache.compile_cached(p)
+                else:
+                    pycache.invalidate(p)
+        except Exception as exc:
+            warning(f"Revalidation failed for {p}: {exc}")
+
+    with ThreadPoolExecutor(max_workers=min(_refresh_workers(), len(remote))) as pool:
+        list(pool.map(_one, remote))
+
+
+def _collect_usage_texts(
+    names: List[str],
+    bucket: Dict[str, Any],
+    ps1_cache_dir: Path,
+    ucache_dir: Path,
+    refresh: bool,
+) -> Dict[str, str]:
+    """Return usage text per command, refreshing misses with bounded parallelism.
+
+    Usage lines published in the bucket manifest are used first. Remaining
+    scripts are fetched concurrently and their usage is read statically when
+    NuroUsage_<cmd> only emits literals; the rest is captured in PowerShell
+    batches that also run concurrently. Each cache file is written as soon as
+    its stage finishes; a failing command is reported on stderr and never
+    holds up the others.
+    """
+    texts: Dict[str, str] = {}
+    failures: Dict[str, str] = {}
+    misses: List[str] = []
+    for n in names:
+        ufile = ucache_dir / f"{n}.txt"
+        # Use cache when not refreshing
+        if not refresh and ufile.exists():
+            try:
+                texts[n] = ufile.read_text(encoding="utf-8", errors="replace")
+                continue
+            except Exception:
+                pass
+        misses.append(n)
+    if not misses:
+        return texts
+
+    listed = {e.name: e for e in load_bucket_manifest(bucket) or [] if e.ext == "ps1"}
+    for n in [m for m in misses if m in listed and listed[m].usage is not None]:
+        texts[n] = str(listed[n].usage)
+        _write_usage_cache(ucache_dir, n, texts[n])
+        misses.remove(n)
+    if not misses:
+        return texts
+
+    workers = _refresh_workers()
+
+    def _prepare(n: str) -> Tuple[Optional[Path], Optional[str]]:
+        # Ensure ps1 cached before capturing usage
+        t = ps1_cache_dir / f"{n}.ps1"
+        if not t.exists():
+            src = entry_source(bucket, listed[n]) if n in listed else resolve_cmd_source_with_meta(bucket, n)
+            if src.get("kind") == "remote":
+                fetch_source(src, t)
+                pincache.record(bucket, [t])
+                resolution.forget(n)
+        if not t.exists():
+            return None, None
+        return t, static_usage_for_ps1(t, n)
+
+    pending: List[Tuple[Path, str]] = []
+    with ThreadPoolExecutor(max_workers=min(workers, len(misses))) as pool:
+        futures = {n: pool.submit(_prepare, n) for n in misses}
+        for n in misses:
+            try:
+                t, static_text = futures[n].result()
+            except Exception as exc:
+                warning(f"Usage preparation failed for {n}: {exc}")
+                failures[n] = f"fetch failed: {exc}"
+                texts[n] = ""
+                continue
+            if t is None:
+                failures[n] = "script not found"
+                texts[n] = _USAGE_UNAVAILABLE
+                _write_usage_cache(ucache_dir, n, texts[n])
+            elif static_text is not None:
+                debug(f"Usage for {n} read statically")
+                texts[n] = static_text
+                _write_usage_cache(ucache_dir, n, static_text)
+            else:
+                pending.append((t, n))
+
+    if pending:
+        nbatches = max(1, min(workers, -(-len(pending) // _USAGE_BATCH_MIN)))
+        batches = [pending[i::nbatches] for i in range(nbatches)]
+        ignore_policy = bool(bucket.get("unsafe-dev-mode"))
+
+        def _capture(batch: List[Tuple[Path, str]]) -> Dict[str, UsageCaptureResult]:
+            results = run_usage_batch_capture(batch, ignore_execution_policy=ignore_policy)
+            for t, n in batch:
+                result = results.get(n)
+                if result is None:
+                    # the batch session ended before this command (a script ran exit):
+                    # capture it alone rather than caching a failure it did not cause
+                    result = run_usage_for_ps1_capture(t, n, ignore_execution_policy=ignore_policy)
+                    results[n] = result
+                if result.error_kind:
+                    failures[n] = result.error_detail or result.error_kind
+                # update cache file (even if empty, to avoid repeated captures)
+                _write_usage_cache(ucache_dir, n, _usage_text_from_result(n, result))
+            return results
+
+        with ThreadPoolExecutor(max_workers=nbatches) as pool:
+            batch_futures = [pool.submit(_capture, b) for b in batches]
+            for batch, fut in zip(batches, batch_futures):
+                try:
+                    results = fut.result()
+                except Exception as exc:
+                    # e.g. PowerShell missing: show nothing and leave the cache untouched
+                    warning(f"Batch usage capture failed: {exc}")
+                    results = {}
+                    for _, n in batch:
+                        failures[n] = f"usage capture failed: {exc}"
+                for _, n in batch:
+                    result = results.get(n)
+                    texts[n] = _usage_text_from_result(n, result) if result else ""
+
+    if refresh:
+        for n in misses:
+            if n in failures:
+                detail = failures[n].splitlines()[0] if failures[n] else "unknown error"
+                sys.stderr.write(f"nuro: refresh failed for {n}: {detail}\n")
+    return texts
+
+
 def print_root_usage(refresh: bool = False) -> None:
     print(f"nuro v{__version__} — minimal runner(Py-CLI)\n")
     print("USAGE:")
     print("  nuro <command> [args...]")
-    print("  nuro <command> -h|--help|/?\n")
+    print("  nuro <command> -h|--help|/?")
+    print("  nuro sync [bucket...] [--usage] [--deps] [--jobs N] [--no-archive]\n")
     print("GLOBAL OPTIONS:")
     print("  --refresh          Refresh command list from GitHub when no args\n")
-    # Optional full refresh: clear ps1 and usage caches first
+    # Optional full refresh: clear usage and other caches, revalidate scripts
     if refresh:
         try:
+            # usage texts of pinned buckets stay valid as long as their pin
+            keep_usage = {
+                str(b.get("name", "")) for b in load_registry().get("buckets", []) if pincache.is_current(b)
+            }
             cache_root = cache_dir()
             if cache_root.exists():
-                shutil.rmtree(cache_root)
+                for entry in cache_root.iterdir():
+                    if entry in (cmds_cache_base(), github_cache_dir(), objects_dir(), manifest_cache_dir()):
+                        continue
+                    if entry.name == "negative-cache.json":
+                        continue
+                    if entry.name == "usage" and entry.is_dir():
+                        for sub in entry.iterdir():
+                            if sub.name not in keep_usage:
+                                shutil.rmtree(sub, ignore_errors=True)
+                    elif entry.is_dir():
+                        shutil.rmtree(entry)
+                    else:
+                        entry.unlink()
         except Exception:
             pass
+        clear_listing_cache(keep_immutable=True)
+        clear_manifest_cache(keep_immutable=True)
+        negcache.clear(keep_immutable=True)
+        _revalidate_script_cache()
+        resolution.invalidate()
 
         # Legacy ps1 cache location (pre-migration); remove if present
         legacy_ps1 = Path(os.path.expanduser("~")) / ".nuro" / "ps1"
@@ -144,75 +392,17 @@ def print_root_usage(refresh: bool = False) -> None:
         ensure_tree()
         ps1_cache_dir = ps1_dir() / bucket_name
         ps1_cache_dir.mkdir(parents=True, exist_ok=True)
-        # Determine official bucket from registry or synthesize default
-        reg = load_registry()
-        official_bucket = None
-        for b in reg.get("buckets", []):
-            if b.get("name") == bucket_name:
-                official_bucket = b
-                break
-        if official_bucket is None:
-            cfg = load_app_config()
-            base = official_bucket_base(cfg)
-            official_bucket = {
-                "name": bucket_name,
-                "uri": f"raw::{base}",
-                "priority": 100,
-                "trusted": True,
-            }
+        official_bucket = _official_bucket()
+        pincache.check_bucket(official_bucket)
         # usage text cache directory
         ucache_dir = cache_dir() / "usage" / bucket_name
         ucache_dir.mkdir(parents=True, exist_ok=True)
 
+        texts = _collect_usage_texts(lines, official_bucket, ps1_cache_dir, ucache_dir, refresh)
         for n in lines:
-            help_line = ""
-            try:
-                ufile = ucache_dir / f"{n}.txt"
-                cached_text: str | None = None
-                # Use cache when not refreshing
-                if not refresh and ufile.exists():
-                    cached_text = ufile.read_text(encoding="utf-8", errors="replace")
-                if cached_text is None:
-                    # Ensure ps1 cached, then capture usage and update cache
-                    # Note: ps1 cache lives under ~/.nuro/cache/cmds/official
-                    t = (ps1_cache_dir / f"{n}.ps1")
-                    if not t.exists():
-                        src = resolve_cmd_source_with_meta(official_bucket, n)
-                        if src.get("kind") == "remote":
-                            fetch_to(t, src["url"], timeout=10)
-                    out = ""
-                    if t.exists():
-                        ignore_policy = bool(official_bucket.get("unsafe-dev-mode"))
-                        result = run_usage_for_ps1_capture(
-                            t,
-                            n,
-                            ignore_execution_policy=ignore_policy,
-                        )
-                        if result.error_kind:
-                            if result.error_kind == "ps5":
-                                cached_text = "PowerShell 5では表示できません"
-                            else:
-                                cached_text = "ヘルプを取得できませんでした。"
-                            if result.error_detail:
-                                debug(
-                                    f"Usage capture error for {n}: {result.error_detail}"
-                                )
-                        else:
-                            cached_text = result.text
-                    else:
-                        cached_text = "ヘルプを取得できませんでした。"
-                    # update cache file (even if empty, to avoid repeated fetches)
-                    try:
-                        ufile.write_text(cached_text, encoding="utf-8")
-                    except Exception:
-                        pass
-                # compute first line for table
-                if cached_text:
-                    help_line = cached_text.splitlines()[0].strip()
-                else:
-                    help_line = ""
-            except Exception:
-                help_line = ""
+            cached_text = texts.get(n) or ""
+            # compute first line for table
+            help_line = cached_text.splitlines()[0].strip() if cached_text else ""
             rows.append([n, bucket_name, help_line])
 
     if rows:
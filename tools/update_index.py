@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""cmds/index.json（バケットのマニフェスト）を再生成する。
+
+cmds/ にコマンドを追加・変更したら実行してコミットする:
+
+    python tools/update_index.py [cmds_dir ...]
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "nuro-py"))
+
+from nuro.manifest import main  # noqa: E402
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:] or [str(ROOT / "cmds")]))